@@ -0,0 +1,167 @@
+from antlr4_generated.CParser import CParser
+from AbstractSyntaxTree import *
+from Listener import Listener
+
+
+# Builds the AST while a PrecedenceCParser parses the program with flat expressions, as a parse listener
+# (Parser.addParseListener), so the parser doesn't have to build a parse tree (buildParseTrees = False) and the tree
+# doesn't have to be walked afterwards. It gets the same events as Listener gets from ParseTreeWalker, but a rule is
+# entered before its children are parsed, so what Listener reads from the children of a context is read from the
+# tokens ahead instead. The context of an operator that follows its left operand is entered after that operand, whose
+# node is then moved into the node of the operator. When a rule is exited, its node gets an ASTPositions with the
+# tokens it needs for diagnostics in the place of the context, so no context is kept after its rule.
+
+def comparisonNode(comparisonType):
+    return lambda ctx: ASTComparisonOperatorNode(ASTComparisonOperatorNode.ComparisonType[comparisonType], ctx)
+
+def logicNode(logicOperatorType):
+    return lambda ctx: ASTLogicOperatorNode(ASTLogicOperatorNode.LogicOperatorType[logicOperatorType], ctx)
+
+def binaryArithmeticNode(arithmeticType):
+    return lambda ctx: ASTBinaryArithmeticOperatorNode(ASTBinaryArithmeticOperatorNode.ArithmeticType[arithmeticType], ctx)
+
+def unaryArithmeticNode(arithmeticType, operatorType):
+    return lambda ctx: ASTUnaryArithmeticOperatorNode(ASTUnaryArithmeticOperatorNode.ArithmeticType[arithmeticType], ASTUnaryOperatorNode.Type[operatorType], ctx)
+
+# the node of every (context, operator) of the expressions, the operator is the first token after the left operand
+# or, for a prefix operator, the first token of the context
+OPERATOR_NODES = {
+    (CParser.Oplevel15Context, ","):  ASTCommaOperatorNode,
+    (CParser.Oplevel14Context, "="):  ASTSimpleAssignmentOperatorNode,
+    (CParser.Oplevel13Context, "?"):  ASTTernaryConditionalOperatorNode,
+    (CParser.Oplevel12Context, "||"): logicNode("disj"),
+    (CParser.Oplevel11Context, "&&"): logicNode("conj"),
+    (CParser.Oplevel7Context,  "=="): comparisonNode("equal"),
+    (CParser.Oplevel7Context,  "!="): comparisonNode("inequal"),
+    (CParser.Oplevel6Context,  "<"):  comparisonNode("lt"),
+    (CParser.Oplevel6Context,  ">"):  comparisonNode("gt"),
+    (CParser.Oplevel6Context,  "<="): comparisonNode("le"),
+    (CParser.Oplevel6Context,  ">="): comparisonNode("ge"),
+    (CParser.Oplevel4Context,  "+"):  binaryArithmeticNode("add"),
+    (CParser.Oplevel4Context,  "-"):  binaryArithmeticNode("sub"),
+    (CParser.Oplevel3Context,  "*"):  binaryArithmeticNode("mul"),
+    (CParser.Oplevel3Context,  "/"):  binaryArithmeticNode("div"),
+    (CParser.Oplevel3Context,  "%"):  binaryArithmeticNode("modulo"),
+    (CParser.Oplevel2Context,  "++"): unaryArithmeticNode("increment", "prefix"),
+    (CParser.Oplevel2Context,  "--"): unaryArithmeticNode("decrement", "prefix"),
+    (CParser.Oplevel2Context,  "+"):  unaryArithmeticNode("plus", "prefix"),
+    (CParser.Oplevel2Context,  "-"):  unaryArithmeticNode("minus", "prefix"),
+    (CParser.Oplevel2Context,  "&"):  ASTAddressOfOperatorNode,
+    (CParser.Oplevel2Context,  "*"):  ASTDereferenceOperatorNode,
+    (CParser.Oplevel2Context,  "!"):  ASTLogicalNotOperatorNode,
+    (CParser.Oplevel1Context,  "++"): unaryArithmeticNode("increment", "postfix"),
+    (CParser.Oplevel1Context,  "--"): unaryArithmeticNode("decrement", "postfix"),
+    (CParser.Oplevel1Context,  "["):  ASTArraySubscriptNode,
+}
+
+# the nodes that point at a child of their context in diagnostics (ASTNode.getChildToken)
+CHILD_TOKEN_NODES = (ASTTernaryConditionalOperatorNode, ASTComparisonOperatorNode, ASTDereferenceOperatorNode, ASTArgumentsNode)
+
+DECLARATOR_CONTEXTS = (CParser.Declarator1Context, CParser.ParamDeclarator1Context)
+
+
+class ASTBuilder(Listener):
+    def __init__(self, tree, tokenStream):
+        super(ASTBuilder, self).__init__(tree)
+        self.tokenStream = tokenStream
+        # (context, first tokens of its children) of the open rules of CHILD_TOKEN_NODES
+        self.childTokens = []
+        # for every open declarator, where the indirections of its pointers and arrays go in those of its node
+        self.declarators = []
+
+    def text(self, ctx):
+        # only asked for the rules of a single token
+        return ctx.start.text
+
+    def keepChildTokens(self, ctx, node, tokens):
+        if isinstance(node, CHILD_TOKEN_NODES):
+            self.childTokens.append((ctx, tokens))
+
+    def enterEveryRule(self, ctx):
+        if self.childTokens and self.childTokens[-1][0] is ctx.parentCtx:
+            tokens = self.childTokens[-1][1]
+            # the context of an operator starts at the same token as its left operand
+            if not tokens or tokens[-1].tokenIndex != ctx.start.tokenIndex:
+                tokens.append(ctx.start)
+
+    def visitTerminal(self, node):
+        if self.childTokens and self.childTokens[-1][0] is node.parentCtx:
+            self.childTokens[-1][1].append(node.symbol)
+
+    def exitEveryRule(self, ctx):
+        tokens = None
+        if self.childTokens and self.childTokens[-1][0] is ctx:
+            tokens = self.childTokens.pop()[1]
+        children = self.currentNode.children
+        if children and children[-1].ctx is ctx:
+            children[-1].ctx = ASTPositions(ctx.start, ctx.stop, tokens, self.tokenStream)
+
+
+
+    def enterStdInclude(self, ctx:CParser.StdIncludeContext):
+        # identifier '.' identifier
+        name = "".join(self.tokenStream.LT(k).text for k in range(1, 4))
+        self.currentNode = self.currentNode.addChildNode(ASTIncludeNode(True, name))
+
+
+
+    def enterFunctionDefinition(self, ctx:CParser.FunctionDefinitionContext):
+        # the identifier is the first one after the declaration specifiers and pointer parts
+        k = 1
+        while self.tokenStream.LA(k) != CParser.IDENTIFIER:
+            k += 1
+        if self.tokenStream.LT(k).text == "main":
+            self.currentNode = self.currentNode.addChildNode(ASTMainFunctionNode(ctx=ctx))
+        else:
+            self.currentNode = self.currentNode.addChildNode(ASTFunctionDefinitionNode(ctx=ctx))
+
+
+
+    def enterArguments(self, ctx:CParser.ArgumentsContext):
+        super(ASTBuilder, self).enterArguments(ctx)
+        self.keepChildTokens(ctx, self.currentNode, [])
+
+
+
+    def enterDeclarator1(self, ctx:CParser.Declarator1Context):
+        # the pointers and arrays of a declarator go before those of the declarator inside of it
+        self.declarators.append(len(self.currentNode.indirections))
+
+    def exitDeclarator1(self, ctx:CParser.Declarator1Context):
+        self.declarators.pop()
+
+    def enterPointerPart(self, ctx:CParser.PointerPartContext):
+        indirection = (False, self.tokenStream.LA(2) == CParser.CONST)
+        if isinstance(ctx.parentCtx, DECLARATOR_CONTEXTS):
+            self.currentNode.indirections.insert(self.declarators[-1], indirection)
+            self.declarators[-1] += 1
+        elif isinstance(self.currentNode, (ASTFunctionDeclarationNode, ASTTypeCastNode)):
+            self.currentNode.indirections.append(indirection)
+
+    def enterArrayPart(self, ctx:CParser.ArrayPartContext):
+        self.currentNode.indirections.insert(self.declarators[-1], (True, False))
+        super(ASTBuilder, self).enterArrayPart(ctx)
+
+
+
+    def enterOperator(self, ctx):
+        operator = self.tokenStream.LT(1)
+        createNode = OPERATOR_NODES.get((type(ctx), operator.text))
+        if createNode is None:
+            self.createdNode.append(False)
+            return
+
+        node = createNode(ctx)
+        if ctx.start.tokenIndex != operator.tokenIndex:
+            # the left operand was parsed before the context was entered
+            operand = self.currentNode.children.pop()
+            self.currentNode = self.currentNode.addChildNode(node)
+            node.addChildNode(operand)
+            self.keepChildTokens(ctx, node, [ctx.start])
+        else:
+            self.currentNode = self.currentNode.addChildNode(node)
+            self.keepChildTokens(ctx, node, [])
+        self.createdNode.append(True)
+
+    enterOplevel15 = enterOplevel14 = enterOplevel13 = enterOplevel12 = enterOplevel11 = enterOperator
+    enterOplevel7 = enterOplevel6 = enterOplevel4 = enterOplevel3 = enterOplevel2 = enterOplevel1 = enterOperator
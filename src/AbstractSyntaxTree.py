@@ -6,6 +6,27 @@ from antlr4.tree.Tree import TerminalNode
 
 offset = "  | "
 
+class ASTPositions(object):
+    # takes the place of the context node of an AST node that was built while parsing (ASTBuilder), the context is
+    # not kept. It has the first and last token of the context and, for the nodes that use getChildToken, the first
+    # token of each child of the context
+    __slots__ = ("start", "stop", "children", "tokenStream")
+
+    def __init__(self, start, stop, children, tokenStream):
+        self.start = start
+        self.stop = stop
+        self.children = children
+        self.tokenStream = tokenStream
+
+    def getFirstToken(self):
+        # an empty context starts at the token after it
+        if self.stop is None or self.stop.tokenIndex < self.start.tokenIndex:
+            return None
+        return self.start
+
+    def getText(self):
+        return self.tokenStream.getText((self.start, self.stop))
+
 class ASTNode(object):
 
     def __init__(self, label="no label", ctx=None, parent=None):
@@ -34,6 +55,8 @@ class ASTNode(object):
         if node is None: node = self.ctx
         if node is None:
             raise Exception(str(type(self)) + "'s ctx was not set")
+        if isinstance(node, ASTPositions):
+            return node.getFirstToken()
         if isinstance(node, TerminalNode):
             return node.getSymbol()
         for child in node.getChildren():
@@ -43,6 +66,11 @@ class ASTNode(object):
 
         return None
 
+    def getChildToken(self, index): # the first token of child index of the context node, a token or a rule
+        if isinstance(self.ctx, ASTPositions):
+            return self.ctx.children[index]
+        return self.getFirstToken(self.ctx.getChild(index))
+
     def getLineAndColumn(self):
         token = None
 
@@ -502,7 +530,9 @@ class ASTFunctionCallNode(ASTExpressionNode):
 
     def getRelevantToken(self):
         if self.errorParameter is not None:
-            return self.getFirstToken(list(list(self.ctx.getChildren())[2].getChildren())[2 * self.errorParameter])
+            for child in self.children:
+                if isinstance(child, ASTArgumentsNode):
+                    return child.getChildToken(2 * self.errorParameter)
         return super(ASTFunctionCallNode, self).getRelevantToken()
 
     def out(self, level):
@@ -596,7 +626,7 @@ class ASTTernaryConditionalOperatorNode(ASTTernaryOperatorNode):
             visitor.exitExpression(self)
 
     def getRelevantToken(self):
-        return self.getFirstToken(list(self.ctx.getChildren())[self.errorOperand * 2])
+        return self.getChildToken(self.errorOperand * 2)
 
     def getType(self):
         return self.children[1].getType().toRvalue()
@@ -685,7 +715,7 @@ class ASTComparisonOperatorNode(ASTBinaryOperatorNode):
             visitor.exitExpression(self)
 
     def getRelevantToken(self):
-        return list(self.ctx.getChildren())[1].getSymbol()
+        return self.getChildToken(1)
 
     def getType(self):
         return TypeInfo(rvalue=True, baseType="int").toRvalue()
@@ -759,7 +789,7 @@ class ASTDereferenceOperatorNode(ASTUnaryOperatorNode):
         return ttype
 
     def getRelevantToken(self):
-        return self.getFirstToken(list(self.ctx.getChildren())[1])
+        return self.getChildToken(1)
 
 class ASTLogicalNotOperatorNode(ASTUnaryOperatorNode):
     def __init__(self, ctx=None):
@@ -0,0 +1,121 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+
+CACHE_FORMAT_VERSION = 1
+
+compilerHashValue = None
+
+customIncludePattern = re.compile(rb'#include\s*"([^"]*)"')
+
+
+def compilerHash():
+    # hash of every python file the compiler is made of, so a changed compiler never reuses old results
+    global compilerHashValue
+
+    if compilerHashValue is None:
+        srcDir = os.path.dirname(os.path.abspath(__file__))
+        filenames  = glob.glob(os.path.join(srcDir, "*.py"))
+        filenames += glob.glob(os.path.join(srcDir, "antlr4", "**", "*.py"), recursive=True)
+        filenames += glob.glob(os.path.join(srcDir, "antlr4_generated", "*.py"))
+
+        sha = hashlib.sha256()
+        for filename in sorted(filenames):
+            sha.update(os.path.relpath(filename, srcDir).encode("utf-8"))
+            with open(filename, "rb") as myfile:
+                sha.update(myfile.read())
+        compilerHashValue = sha.hexdigest()
+
+    return compilerHashValue
+
+
+class CompilationCache:
+    def __init__(self, cacheDir, maxSize=100 * 1024 * 1024):
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self.totalSize = None # computed on the first insertion
+        os.makedirs(cacheDir, exist_ok=True)
+
+    def key(self, filename, flags):
+        sha = hashlib.sha256()
+        sha.update(str(CACHE_FORMAT_VERSION).encode("utf-8"))
+        sha.update(compilerHash().encode("utf-8"))
+        # the filename is part of the key because it is part of the error messages
+        sha.update(json.dumps([filename, flags], sort_keys=True).encode("utf-8"))
+
+        with open(filename, "rb") as myfile:
+            source = myfile.read()
+        sha.update(source)
+
+        # custom includes are found textually, so a hit does not require lexing the file
+        for include in customIncludePattern.findall(source):
+            includePath = os.path.join(os.path.dirname(filename), include.decode("utf-8", "replace"))
+            sha.update(include)
+            if os.path.isfile(includePath):
+                with open(includePath, "rb") as myfile:
+                    sha.update(myfile.read())
+
+        return sha.hexdigest()
+
+    def entryPath(self, key):
+        return os.path.join(self.cacheDir, key + ".json")
+
+    def get(self, key):
+        path = self.entryPath(key)
+        try:
+            with open(path, "r") as myfile:
+                entry = json.load(myfile)
+        except (OSError, ValueError):
+            return None
+
+        # mark the entry as recently used, the least recently used entries are evicted first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry
+
+    def put(self, key, entry):
+        data = json.dumps(entry)
+
+        # write to a temporary file first so other processes never read a half written entry
+        fd, tmpPath = tempfile.mkstemp(dir=self.cacheDir, suffix=".tmp")
+        with os.fdopen(fd, "w") as myfile:
+            myfile.write(data)
+        os.replace(tmpPath, self.entryPath(key))
+
+        if self.totalSize is None:
+            self.totalSize = sum(size for (path, size, mtime) in self.entries())
+        else:
+            self.totalSize += len(data)
+
+        if self.totalSize > self.maxSize:
+            self.evict()
+
+    def entries(self):
+        entries = []
+        for path in glob.glob(os.path.join(self.cacheDir, "*.json")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue # removed by another process
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.entries(), key=lambda entry : entry[2])
+        self.totalSize = sum(size for (path, size, mtime) in entries)
+
+        for (path, size, mtime) in entries:
+            if self.totalSize <= self.maxSize:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.totalSize -= size
@@ -1,4 +1,6 @@
+from antlr4.error.ErrorListener import ErrorListener
 import linecache
+import sys
 
 
 class Error:
@@ -10,8 +12,14 @@ class Error:
 
 
 class ErrorHandler:
-    def __init__(self, srcFilename):
+    def __init__(self, srcFilename, source=None, sourceFile=None):
         self.srcFilename = srcFilename
+        # the lines shown in the messages come from source if it is given, or from sourceFile (an open text file
+        # with the source), otherwise from the file srcFilename
+        self.sourceLines = source.split("\n") if source is not None else None
+        self.sourceFile = sourceFile
+        # the number of lines of sourceFile that have been read
+        self.sourceFileLines = 0
         self.errors = []
 
     def addError(self, message, lineNumber, column):
@@ -34,7 +42,7 @@ class ErrorHandler:
             column = error.column
             msg += "{filename}:{line}:{column}: {isError}: {error}\n".format(filename=self.srcFilename, line=error.lineNumber, column=column + 1, error=error.message, isError=("error" if not error.isWarning else "warning"))
 
-            line = linecache.getline(self.srcFilename, error.lineNumber)[:-1]
+            line = self.getLine(error.lineNumber)
 
             msg += " " + line + "\n"
             msg += " " + "".join([" " if c != "\t" else "\t" for c in line[:column]]) + "^\n"
@@ -43,6 +51,29 @@ class ErrorHandler:
 
         return msg
 
+    def getLine(self, lineNumber):
+        if self.sourceFile is not None:
+            return self.getFileLine(lineNumber)
+        if self.sourceLines is None:
+            return linecache.getline(self.srcFilename, lineNumber)[:-1]
+        if 1 <= lineNumber <= len(self.sourceLines):
+            return self.sourceLines[lineNumber - 1].rstrip("\r")
+        return ""
+
+    def getFileLine(self, lineNumber):
+        # the errors are printed in the order of their lines, so sourceFile is only read from the start again
+        # for a line before the last one that was read
+        if lineNumber <= self.sourceFileLines or self.sourceFileLines == 0:
+            self.sourceFile.seek(0)
+            self.sourceFileLines = 0
+        line = ""
+        while self.sourceFileLines < lineNumber:
+            line = self.sourceFile.readline()
+            if not line:
+                return ""
+            self.sourceFileLines += 1
+        return line.rstrip("\n").rstrip("\r")
+
     def errorsToString(self):
         # sort errors according to lineNumber
         self.errors.sort(key=lambda x : (x.lineNumber, x.column))
@@ -63,3 +94,18 @@ class ErrorHandler:
 
         for i in range(len(self.errors)):
             self.printError(i)
+
+
+class SyntaxErrorListener(ErrorListener):
+    def __init__(self, srcFilename):
+        super(SyntaxErrorListener, self).__init__()
+        self.srcFilename = srcFilename
+        # when this is a list the messages are collected in it instead of being printed
+        self.messages = None
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        message = "{filename}:{line}:{column}: syntax error: {error}".format(filename=self.srcFilename, line=line, column=column + 1, error=msg)
+        if self.messages is not None:
+            self.messages.append(message + "\n")
+        else:
+            print(message, file=sys.stderr)
@@ -0,0 +1,149 @@
+from antlr4.Token import Token, CommonToken
+from antlr4.error.Errors import LexerNoViableAltException
+from antlr4_generated.CLexer import CLexer
+import re
+
+
+# The tokens of C.g4 as one regular expression. The alternatives are ordered so that the first one that matches is
+# also the longest match, which is how the antlr lexer chooses between its rules. Keywords are matched as identifiers
+# and looked up afterwards, the quoted tokens of the grammar ('#include', '==', ';', ...) are found in LITERALS.
+# The skipped rules (WS, COMMENT and MULTICOMMENT) are matched together, so a run of whitespace and comments between
+# two tokens is passed over with a single match.
+TOKEN_PATTERN = r"""
+    (?P<SKIPPED>(?:[ \t\r\n]+|//[^\r\n]*|/\*.*?\*/)+)
+  | (?P<FLOAT>[0-9]+\.[0-9]+(?:[eE][+-]?[0-9]+)?|[0-9]+[eE][+-]?[0-9]+)
+  | (?P<INTEGER>[0-9]+)
+  | (?P<IDENTIFIER>[a-zA-Z_][a-zA-Z0-9_\\]*)
+  | (?P<CHARACTER>'(?:\\.|.)')
+  | (?P<STRING>"(?:\\.|[^\\"\r\n])*")
+  | (?P<LITERAL>\#include|\|\||&&|==|!=|<=|>=|\+\+|--|[,=?:<>+\-*/%&!\[\]();.{}])
+"""
+
+# the longest input that could still have become a token when TOKEN_PATTERN does not match, antlr reports it together
+# with the character after it as a token recognition error and continues after that character
+ERROR_PATTERN = r"""\#(?:i(?:n(?:c(?:l(?:u(?:d)?)?)?)?)?)?|\||'(?:\\.|.)?|"(?:\\.|[^\\"\r\n])*\\?"""
+
+MULTILINE = {"SKIPPED", "CHARACTER", "STRING"}
+
+
+def tokenTables(encode):
+    # maps the text of every keyword and quoted token to its type, and every other rule name to its type
+    literals = {}
+    for tokenType, name in enumerate(CLexer.literalNames):
+        if name.startswith("'"):
+            literals[encode(name[1:-1])] = tokenType
+    ruleTypes = {name : getattr(CLexer, name) for name in CLexer.ruleNames}
+    return literals, ruleTypes
+
+
+class FastCLexer(CLexer):
+    # a drop-in replacement for CLexer that matches whole tokens with a regular expression instead of running the
+    # lexer ATN one character at a time, it produces the same tokens, lines, columns and error messages
+
+    textPattern  = re.compile(TOKEN_PATTERN, re.VERBOSE | re.DOTALL)
+    bytesPattern = re.compile(TOKEN_PATTERN.encode("ascii"), re.VERBOSE | re.DOTALL)
+    textErrorPattern  = re.compile(ERROR_PATTERN, re.DOTALL)
+    bytesErrorPattern = re.compile(ERROR_PATTERN.encode("ascii"), re.DOTALL)
+    textTables  = tokenTables(lambda text : text)
+    bytesTables = tokenTables(lambda text : text.encode("ascii"))
+
+    def __init__(self, input=None):
+        super().__init__(input)
+        self._data = None
+
+    def reset(self):
+        super().reset()
+        self._data = None
+
+    def load(self):
+        # a memory mapped ascii file is matched as bytes, every other input as a string
+        data = self._input.data
+        if isinstance(data, memoryview):
+            self._data = data
+            self._newline = b"\n"
+            self._pattern = self.bytesPattern
+            self._errorPattern = self.bytesErrorPattern
+            self._literals, self._ruleTypes = self.bytesTables
+        else:
+            self._data = self._input.strdata
+            self._newline = "\n"
+            self._pattern = self.textPattern
+            self._errorPattern = self.textErrorPattern
+            self._literals, self._ruleTypes = self.textTables
+        self._pos = self._input.index
+        self._line = self._interp.line
+        self._column = self._interp.column
+
+    def nextToken(self):
+        tokenType, channel, start, stop, line, column = self.nextTokenFields()
+        token = CommonToken(self._tokenFactorySourcePair, tokenType, channel, start, stop)
+        token.line = line
+        token.column = column
+        self._token = token
+        return token
+
+    def nextTokenFields(self):
+        # the (type, channel, start, stop, line, column) of the next token, without creating a token object
+        if self._data is None:
+            self.load()
+
+        data = self._data
+        size = len(data)
+
+        while True:
+            start = self._pos
+            line = self._line
+            column = self._column
+
+            if start >= size:
+                self._hitEOF = True
+                return (Token.EOF, Token.DEFAULT_CHANNEL, start, start - 1, line, column)
+
+            match = self._pattern.match(data, start)
+            if match is None:
+                self.tokenRecognitionError(start)
+                continue
+
+            end = match.end()
+            kind = match.lastgroup
+            self.advance(match.group() if kind in MULTILINE else None, end)
+
+            if kind == "SKIPPED":
+                continue
+
+            if kind == "LITERAL":
+                tokenType = self._literals[match.group()]
+            elif kind == "IDENTIFIER":
+                tokenType = self._literals.get(match.group(), CLexer.IDENTIFIER)
+            else:
+                tokenType = self._ruleTypes[kind]
+
+            self._hitEOF = False
+            return (tokenType, Token.DEFAULT_CHANNEL, start, end - 1, line, column)
+
+    def advance(self, text, end):
+        # moves to end, text is the matched text when it can contain newlines
+        if text is not None and self._newline in text:
+            self._line += text.count(self._newline)
+            self._column = len(text) - text.rfind(self._newline) - 1
+        else:
+            self._column += end - self._pos
+        self._pos = end
+        self._input.seek(end)
+        self._interp.line = self._line
+        self._interp.column = self._column
+
+    def tokenRecognitionError(self, start):
+        viable = self._errorPattern.match(self._data, start)
+        end = viable.end() if viable is not None else start
+        stop = min(end + 1, len(self._data))
+
+        self._tokenStartCharIndex = start
+        self._tokenStartLine = self._line
+        self._tokenStartColumn = self._column
+        self._input.seek(end)
+        self.notifyListeners(LexerNoViableAltException(self, self._input, start, None))
+
+        # the character that could not be matched is skipped
+        text = self._data[start:stop]
+        self.advance(text.tobytes() if isinstance(text, memoryview) else text, stop)
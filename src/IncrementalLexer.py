@@ -0,0 +1,214 @@
+from antlr4 import InputStream, CompactTokenStream
+from antlr4.CompactTokenStream import TokenColumns
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.Token import Token
+from antlr4_generated.CLexer import CLexer
+from array import array
+import bisect
+
+
+# Lexes a text once with CLexer and then, for every edit of the text, only lexes the tokens the edit can change again.
+# For every token, the furthest character the lexer looked at to find it (or any token before it) is kept. The tokens before the first one that
+# looked at the edited characters are reused as they are. Lexing starts again after them and stops as soon as the lexer
+# ends a token, past the edit, at a position where it also ended a token in the old text. From there on the old text
+# and the new text are the same, and so are the tokens, so the rest of them is reused with shifted offsets and lines.
+# The code points of the text and the lexer are taken over from the old LexedText, only the edited characters are
+# changed, and the lines and columns are found from the tokens next to the edit, so an edit is not lexed from the start.
+
+
+class LookaheadInputStream(InputStream):
+    # an InputStream that remembers the furthest character that was looked at
+
+    def __init__(self, data, codePoints=None):
+        # codePoints (the ord of every character of data) are used instead of made from data when they are given
+        if codePoints is None:
+            super().__init__(data)
+        else:
+            self.name = "<empty>"
+            self.strdata = data
+            self._index = 0
+            self.data = codePoints
+            self._size = len(codePoints)
+        self.furthest = -1
+
+    def LA(self, offset):
+        index = self._index + offset - 1
+        if index > self.furthest:
+            self.furthest = index
+        return super().LA(offset)
+
+
+class CollectingErrorListener(ErrorListener):
+    # keeps the token recognition errors of the lexer as (index, line, column, message)
+
+    def __init__(self):
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((recognizer._tokenStartCharIndex, line, column, msg))
+
+
+class LexedText:
+    # the tokens of text, the furthest index the lexer looked at for each of them and the errors of the lexer
+
+    def __init__(self, text, codePoints=None, lexer=None):
+        # a lexer that is given is only used by this LexedText from then on
+        self.text = text
+        self.input = LookaheadInputStream(text, codePoints)
+        if lexer is None:
+            self.lexer = CLexer(self.input)
+        else:
+            self.lexer = lexer
+            self.lexer.inputStream = self.input
+        self.listener = CollectingErrorListener()
+        self.lexer.removeErrorListeners()
+        self.lexer.addErrorListener(self.listener)
+
+        self.tokens = TokenColumns()
+        self.tokens.source = self.lexer._tokenFactorySourcePair
+        # the furthest index the lexer looked at for each token, and for it or any token before it
+        self.lookaheads = array('q')
+        self.furthest = array('q')
+        # the number of tokens that were lexed (and not reused) to make this LexedText
+        self.lexedTokens = 0
+
+    @property
+    def errors(self):
+        return self.listener.errors
+
+    def lexFrom(self, start, line, column, canStop=None):
+        # lexes the text from start (where a token begins) until canStop(position after the last token) or the end of
+        # the text, returns the position after the last token (the next token starts there) or None at the end
+        self.input.seek(start)
+        self.lexer._interp.line = line
+        self.lexer._interp.column = column
+
+        while True:
+            self.input.furthest = -1
+            token = self.lexer.nextToken()
+            self.tokens.append(token)
+            # the EOF token can be made without looking at anything
+            lookahead = max(self.input.furthest, token.stop)
+            self.lookaheads.append(lookahead)
+            self.furthest.append(max(lookahead, self.furthest[-1]) if self.furthest else lookahead)
+            self.lexedTokens += 1
+            if token.type == Token.EOF:
+                return None
+            if canStop is not None and canStop(token.stop + 1):
+                return token.stop + 1
+
+    def lineAndColumnAfter(self, index):
+        # the line and column right after token index, found from the text of that token only
+        start = self.tokens.starts[index]
+        stop = self.tokens.stops[index] + 1
+        newlines = self.text.count("\n", start, stop)
+        if newlines == 0:
+            return (self.tokens.lines[index], self.tokens.columns[index] + stop - start)
+        return (self.tokens.lines[index] + newlines, stop - self.text.rfind("\n", start, stop) - 1)
+
+    def tokenStream(self):
+        # a filled token stream over the tokens, for CParser
+        stream = CompactTokenStream(self.lexer, onChannelOnly=True)
+        stream.tokens = self.tokens
+        stream.fetchedEOF = True
+        return stream
+
+
+def lexText(text):
+    lexed = LexedText(text)
+    lexed.lexFrom(0, 1, 0)
+    return lexed
+
+
+def relex(old, offset, deleted, inserted):
+    # the LexedText of old.text with the deleted characters at offset replaced by inserted
+    text = old.text[:offset] + inserted + old.text[offset + deleted:]
+    shift = len(inserted) - deleted
+    editEnd = offset + len(inserted)
+
+    # the code points and the lexer of old are changed for the edit and taken over (old keeps its tokens and text),
+    # unless another edit of old already took them
+    codePoints = old.input.data
+    if codePoints is not None:
+        codePoints[offset:offset + deleted] = map(ord, inserted)
+        old.input.data = None
+        new = LexedText(text, codePoints, old.lexer)
+    else:
+        new = LexedText(text)
+
+    # the tokens before the first one that looked at the edit are the same
+    first = bisect.bisect_left(old.furthest, offset)
+    copyTokens(old, new, 0, first)
+    start = old.tokens.stops[first - 1] + 1 if first > 0 else 0
+    new.errors.extend(error for error in old.errors if error[0] < start)
+
+    # lex until a token ends where one ended in the old text, past the edit
+    oldStops = old.tokens.stops
+    resume = [first]
+
+    def canStop(position):
+        if position < editEnd:
+            return False
+        j = bisect.bisect_left(oldStops, position - shift - 1, resume[0])
+        resume[0] = j
+        # the stop of the EOF token is not the end of a token
+        return j < len(oldStops) - 1 and oldStops[j] == position - shift - 1
+
+    line, column = new.lineAndColumnAfter(first - 1) if first > 0 else (1, 0)
+    position = new.lexFrom(start, line, column, canStop)
+    if position is None:
+        return new
+
+    # the rest of the tokens are the old ones, moved by shift characters and by the lines and columns the edit added
+    j = resume[0] + 1
+    oldLine, oldColumn = old.lineAndColumnAfter(resume[0])
+    newLine, newColumn = new.lexer._interp.line, new.lexer._interp.column
+    copyTokens(old, new, j, len(old.tokens), shift, newLine - oldLine, (oldLine, newColumn - oldColumn))
+    new.errors.extend(shiftError(error, shift, newLine - oldLine, (oldLine, newColumn - oldColumn)) for error in old.errors if error[0] >= position - shift)
+
+    return new
+
+
+def copyTokens(old, new, start, stop, shift=0, lines=0, columns=None):
+    # appends the old tokens start..stop-1 to new, columns is (line, added columns) for the tokens on the line of the edit
+    oldTokens = old.tokens
+    tokens = new.tokens
+    tokens.types.extend(oldTokens.types[start:stop])
+    tokens.channels.extend(oldTokens.channels[start:stop])
+    tokens.starts.extend(shifted(oldTokens.starts[start:stop], shift))
+    tokens.stops.extend(shifted(oldTokens.stops[start:stop], shift))
+    tokens.lines.extend(shifted(oldTokens.lines[start:stop], lines))
+    tokens.views.extend([None] * (stop - start))
+    new.lookaheads.extend(shifted(old.lookaheads[start:stop], shift))
+
+    # the old furthest indices can be shifted from the first token that looked the furthest itself, and at least as far
+    # as the tokens before it in new, on
+    furthest = new.furthest[-1] if new.furthest else -1
+    index = start
+    while index < stop and (old.furthest[index] != old.lookaheads[index] or old.furthest[index] + shift < furthest):
+        furthest = max(furthest, old.lookaheads[index] + shift)
+        new.furthest.append(furthest)
+        index += 1
+    new.furthest.extend(shifted(old.furthest[index:stop], shift))
+
+    # only the tokens on the line where the edit ends move to another column, they come first
+    index = start
+    if columns is not None:
+        while index < stop and oldTokens.lines[index] == columns[0]:
+            tokens.columns.append(oldTokens.columns[index] + columns[1])
+            index += 1
+    tokens.columns.extend(oldTokens.columns[index:stop])
+
+    for index, text in oldTokens.texts.items():
+        if start <= index < stop:
+            tokens.texts[len(tokens) - stop + index] = text
+
+
+def shifted(values, shift):
+    # values (a slice of an array) with shift added to every one of them
+    return values if shift == 0 else map(shift.__add__, values)
+
+
+def shiftError(error, shift, lines, columns):
+    index, line, column, message = error
+    return (index + shift, line + lines, column + columns[1] if line == columns[0] else column, message)
@@ -13,6 +13,13 @@ class Listener(CListener):
         self.currentNode = self.ast.root
         self.createdNode = []
 
+    def text(self, ctx):
+        return ctx.getText()
+
+    def name(self, ctx):
+        # every identifier and type name of the program is kept as one (interned) string that all the AST nodes share
+        return sys.intern(self.text(ctx))
+
 
     def enterProgram(self, ctx:CParser.ProgramContext):
         self.ast.root = ASTProgramNode()
@@ -32,7 +39,7 @@ class Listener(CListener):
 
 
     def enterCustomInclude(self, ctx:CParser.CustomIncludeContext):
-        self.currentNode = self.currentNode.addChildNode(ASTIncludeNode(False, ctx.getText()[1:-1]))
+        self.currentNode = self.currentNode.addChildNode(ASTIncludeNode(False, self.text(ctx)[1:-1]))
 
     def exitCustomInclude(self, ctx:CParser.CustomIncludeContext):
         self.currentNode.children = []
@@ -130,7 +137,7 @@ class Listener(CListener):
 
 
     def enterVariable(self, ctx:CParser.VariableContext):
-        self.currentNode = self.currentNode.addChildNode(ASTVariableNode(ctx.getText(), ctx))
+        self.currentNode = self.currentNode.addChildNode(ASTVariableNode(self.name(ctx), ctx))
 
     def exitVariable(self, ctx:CParser.VariableContext):
         self.currentNode = self.currentNode.parent
@@ -147,7 +154,7 @@ class Listener(CListener):
 
     def enterFunctionDefinition(self, ctx:CParser.FunctionDefinitionContext):
         child = ctx.getChild(0, CParser.IdentifierContext)
-        if child is not None and child.getText() == "main":
+        if child is not None and self.name(child) == "main":
             self.currentNode = self.currentNode.addChildNode(ASTMainFunctionNode(ctx=ctx))
         else:
             self.currentNode = self.currentNode.addChildNode(ASTFunctionDefinitionNode(ctx=ctx))
@@ -193,7 +200,7 @@ class Listener(CListener):
 
 
     def enterTypeDeclaration(self, ctx:CParser.TypeDeclarationContext):
-        self.currentNode.baseType = ctx.getText()
+        self.currentNode.baseType = self.name(ctx)
         self.currentNode.typeSpecifierPresent = True
 
     def exitTypeDeclaration(self, ctx:CParser.TypeDeclarationContext):
@@ -312,7 +319,7 @@ class Listener(CListener):
 
 
     def enterFloatLiteral(self, ctx:CParser.FloatLiteralContext):
-        self.currentNode = self.currentNode.addChildNode(ASTFloatLiteralNode(float(ctx.getText()), ctx))
+        self.currentNode = self.currentNode.addChildNode(ASTFloatLiteralNode(float(self.text(ctx)), ctx))
 
     def exitFloatLiteral(self, ctx:CParser.FloatLiteralContext):
         self.currentNode = self.currentNode.parent
@@ -320,7 +327,7 @@ class Listener(CListener):
 
 
     def enterIntegerLiteral(self, ctx:CParser.IntegerLiteralContext):
-        self.currentNode = self.currentNode.addChildNode(ASTIntegerLiteralNode(int(ctx.getText()), ctx))
+        self.currentNode = self.currentNode.addChildNode(ASTIntegerLiteralNode(int(self.text(ctx)), ctx))
 
     def exitIntegerLiteral(self, ctx:CParser.IntegerLiteralContext):
         self.currentNode = self.currentNode.parent
@@ -328,7 +335,7 @@ class Listener(CListener):
 
 
     def enterCharacterLiteral(self, ctx:CParser.CharacterLiteralContext):
-        self.currentNode = self.currentNode.addChildNode(ASTCharacterLiteralNode(ctx.getText(), ctx))
+        self.currentNode = self.currentNode.addChildNode(ASTCharacterLiteralNode(self.text(ctx), ctx))
 
     def exitCharacterLiteral(self, ctx:CParser.CharacterLiteralContext):
         self.currentNode = self.currentNode.parent
@@ -336,7 +343,7 @@ class Listener(CListener):
 
 
     def enterStringLiteral(self, ctx:CParser.StringLiteralContext):
-        self.currentNode = self.currentNode.addChildNode(ASTStringLiteralNode(ctx.getText()[1:-1], ctx))
+        self.currentNode = self.currentNode.addChildNode(ASTStringLiteralNode(self.text(ctx)[1:-1], ctx))
 
     def exitStringLiteral(self, ctx:CParser.StringLiteralContext):
         self.currentNode = self.currentNode.parent
@@ -345,7 +352,7 @@ class Listener(CListener):
 
     def enterIdentifier(self, ctx:CParser.IdentifierContext):
         if hasattr(self.currentNode, "identifier"):
-            self.currentNode.identifier = ctx.getText()
+            self.currentNode.identifier = self.name(ctx)
 
     def exitIdentifier(self, ctx:CParser.IdentifierContext):
         pass
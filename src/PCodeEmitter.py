@@ -0,0 +1,75 @@
+# the buffered instructions are tuples (opcode, operand, ...), they are rendered with the format for their length
+FORMATS = ["%s", "%s %s", "%s %s %s", "%s %s %s %s"]
+
+# the number of distinct instructions of which the rendered line is kept, the cache starts over when it is full
+RENDER_CACHE_SIZE = 4096
+
+
+class PCodeEmitter:
+    # collects the generated P code as instructions and writes it out in large chunks,
+    # the target is a filename, an open file object (e.g. io.StringIO) or a connected socket
+
+    def __init__(self, target, bufferSize=16384):
+        self.ownsTarget = isinstance(target, str)
+        self.target = open(target, "w") if self.ownsTarget else target
+        self.isSocket = hasattr(self.target, "sendall")
+        self.bufferSize = bufferSize
+        self.buffer = []
+        self.rendered = {}
+        # counting the instructions is only done when asked for, by the profiler
+        self.countInstructions = False
+        self.instructionCount = 0
+
+    def emit(self, *instruction):
+        if self.countInstructions:
+            self.instructionCount += 1
+        self.add(instruction)
+
+    def label(self, name):
+        # a label is kept as an instruction without operands
+        self.add((name + ":",))
+
+    def separator(self):
+        # an empty line, between functions
+        self.add(("",))
+
+    def add(self, instruction):
+        # instructions, labels and separators all end up here, so the buffer is written out once it has bufferSize of them
+        self.buffer.append(instruction)
+        if len(self.buffer) >= self.bufferSize:
+            self.flush()
+
+    def render(self, instructions):
+        # P code repeats the same few instructions a lot, so each distinct instruction is formatted once
+        lines = []
+        rendered = self.rendered
+        for instruction in instructions:
+            line = rendered.get(instruction)
+            if line is None:
+                if len(rendered) >= RENDER_CACHE_SIZE:
+                    rendered.clear()
+                line = rendered[instruction] = FORMATS[len(instruction) - 1] % instruction
+            lines.append(line)
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        if not self.buffer:
+            return
+
+        text = self.render(self.buffer)
+        self.buffer = []
+
+        if self.isSocket:
+            self.target.sendall(text.encode("utf-8"))
+        else:
+            self.target.write(text)
+
+    def close(self):
+        # flushes what is left, a target that was given as an open object is left open
+        if self.target is None:
+            return
+
+        self.flush()
+        if self.ownsTarget:
+            self.target.close()
+        self.target = None
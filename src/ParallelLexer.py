@@ -0,0 +1,225 @@
+from antlr4.MappedFileStream import MappedFileStream
+from antlr4.Token import Token
+from antlr4_generated.CLexer import CLexer
+from IncrementalLexer import CollectingErrorListener
+from array import array
+import re
+
+
+# Lexes a large file with a pool of worker processes. The file is cut into chunks at newlines that are not inside
+# a comment, a string or a character literal, where the lexer is between two tokens (or in whitespace, which is skipped).
+# Every worker maps the file and lexes one chunk: it starts at the beginning of its chunk, with the line of that
+# position, and keeps the tokens that start before the end of the chunk. The token arrays of the chunks are then put
+# after each other. The next token a worker would have lexed must be the first token of the next chunk; if it isn't
+# (a split point was inside a token after all, which can only happen around lexer errors), everything after it is
+# lexed again here, one token after the other.
+
+# the text in which a newline does not end a token: comments, strings and character literals
+SPANNING_PATTERN = r"""/\*.*?\*/|//[^\r\n]*|"(?:\\.|[^\\"\r\n])*"|'(?:\\.|.)'"""
+
+textSpanningPattern  = re.compile(SPANNING_PATTERN, re.DOTALL)
+bytesSpanningPattern = re.compile(SPANNING_PATTERN.encode("ascii"), re.DOTALL)
+textNewlinePattern   = re.compile("\n")
+bytesNewlinePattern  = re.compile(b"\n")
+
+# smaller files (or chunks) are not worth sending to a worker
+MIN_CHUNK_SIZE = 1 << 20
+
+
+class LexedChunk:
+    # the token fields of a chunk as arrays, the lexer errors as (token index, line, column, message) in the chunk,
+    # and the fields of the token after the chunk, which the next chunk should start with
+
+    def __init__(self):
+        self.types    = array('i')
+        self.channels = array('i')
+        self.starts   = array('q')
+        self.stops    = array('q')
+        self.lines    = array('i')
+        self.columns  = array('i')
+        self.errors   = []
+        self.next     = None
+
+    def __len__(self):
+        return len(self.types)
+
+    def firstToken(self):
+        # the fields of the first token that was lexed for this chunk
+        if len(self.types) > 0:
+            return (self.types[0], self.channels[0], self.starts[0], self.stops[0], self.lines[0], self.columns[0])
+        return self.next
+
+
+def splitPoints(data, count):
+    # up to count - 1 positions that cut data in chunks of about the same size, each one right after a newline that
+    # is not inside a comment, a string or a character literal
+    if isinstance(data, str):
+        spanningPattern, newlinePattern = textSpanningPattern, textNewlinePattern
+    else:
+        spanningPattern, newlinePattern = bytesSpanningPattern, bytesNewlinePattern
+
+    size = len(data)
+    points = []
+    spans = spanningPattern.finditer(data)
+    span = next(spans, None)
+    position = 0
+    for target in range(1, count):
+        position = max(position, size * target // count)
+        while True:
+            newline = newlinePattern.search(data, position)
+            if newline is None:
+                return points
+            while span is not None and span.end() <= newline.start():
+                span = next(spans, None)
+            if span is not None and span.start() <= newline.start():
+                # the newline is part of a comment, string or character literal
+                position = span.end()
+                continue
+            position = newline.end()
+            break
+        if position < size:
+            points.append(position)
+    return points
+
+
+def lexRange(lexer, start, end, line, column=0):
+    # lexes from start (where a token begins, at line and column) the tokens that begin before end,
+    # with a lexer that has no error listeners
+    chunk = LexedChunk()
+    listener = CollectingErrorListener()
+    lexer.addErrorListener(listener)
+    lexer.inputStream.seek(start)
+    lexer._interp.line = line
+    lexer._interp.column = column
+    nextTokenFields = getattr(lexer, "nextTokenFields", None)
+
+    while True:
+        errors = len(listener.errors)
+        if nextTokenFields is not None:
+            fields = nextTokenFields()
+        else:
+            token = lexer.nextToken()
+            fields = (token.type, token.channel, token.start, token.stop, token.line, token.column)
+
+        # the errors before this token, that belong to this chunk
+        for (index, errorLine, errorColumn, msg) in listener.errors[errors:]:
+            if index < end:
+                chunk.errors.append((len(chunk), errorLine, errorColumn, msg))
+
+        if fields[2] >= end and fields[0] != Token.EOF:
+            chunk.next = fields
+            return chunk
+
+        chunk.types.append(fields[0])
+        chunk.channels.append(fields[1])
+        chunk.starts.append(fields[2])
+        chunk.stops.append(fields[3])
+        chunk.lines.append(fields[4])
+        chunk.columns.append(fields[5])
+        if fields[0] == Token.EOF:
+            return chunk
+
+
+def lexChunk(job):
+    # lexes a chunk of a file in a worker process
+    fileName, encoding, lexerClass, start, end, line = job
+    lexer = lexerClass(MappedFileStream(fileName, encoding))
+    lexer.removeErrorListeners()
+    chunk = lexRange(lexer, start, end, line)
+    lexer.inputStream.close()
+    return chunk
+
+
+class ParallelCLexer(CLexer):
+    # a CLexer that lexes the whole file with jobs worker processes (using lexerClass, CLexer or FastCLexer) the first
+    # time it is asked for a token, and then hands out those tokens; the lexer errors are reported when the token they
+    # come before is handed out, as CLexer would
+
+    def __init__(self, input=None, jobs=2, lexerClass=CLexer):
+        super().__init__(input)
+        self.jobs = jobs
+        self.lexerClass = lexerClass
+        self._chunk = None
+
+    def reset(self):
+        super().reset()
+        self._chunk = None
+
+    def lexAll(self):
+        # the chunks as one LexedChunk, with the errors of the tokens in order
+        input = self._input
+        data = input.data if isinstance(input.data, memoryview) else input.strdata
+        count = min(self.jobs, len(data) // MIN_CHUNK_SIZE)
+        points = splitPoints(data, count) if count > 1 and hasattr(input, "fileName") else []
+
+        if len(points) == 0:
+            return lexRange(self.serialLexer(), input.index, input.size + 1, self._interp.line, self._interp.column)
+
+        import multiprocessing
+
+        starts = [0] + points
+        newline = "\n" if isinstance(data, str) else b"\n"
+        lines = [1]
+        for (previous, start) in zip(starts, points):
+            lines.append(lines[-1] + (data[previous:start].count(newline) if isinstance(data, str) else data[previous:start].tobytes().count(newline)))
+        encoding = getattr(input, "encoding", "ascii")
+        jobs = [(input.fileName, encoding, self.lexerClass, start, end, line) for (start, end, line) in zip(starts, points + [input.size + 1], lines)]
+
+        with multiprocessing.Pool(len(jobs)) as pool:
+            chunks = pool.map(lexChunk, jobs, chunksize=1)
+
+        return self.stitch(chunks)
+
+    def stitch(self, chunks):
+        lexed = chunks[0]
+        for chunk in chunks[1:]:
+            if lexed.next != chunk.firstToken():
+                # the next chunk did not start where the tokens of this one end
+                (_, _, start, _, line, column) = lexed.next
+                self.append(lexed, lexRange(self.serialLexer(), start, self._input.size + 1, line, column))
+                return lexed
+            self.append(lexed, chunk)
+        return lexed
+
+    def append(self, lexed, chunk):
+        offset = len(lexed)
+        lexed.types.extend(chunk.types)
+        lexed.channels.extend(chunk.channels)
+        lexed.starts.extend(chunk.starts)
+        lexed.stops.extend(chunk.stops)
+        lexed.lines.extend(chunk.lines)
+        lexed.columns.extend(chunk.columns)
+        lexed.errors.extend((index + offset, line, column, msg) for (index, line, column, msg) in chunk.errors)
+        lexed.next = chunk.next
+
+    def serialLexer(self):
+        lexer = self.lexerClass(self._input)
+        lexer.removeErrorListeners()
+        return lexer
+
+    def nextToken(self):
+        tokenType, channel, start, stop, line, column = self.nextTokenFields()
+        token = self._factory.create(self._tokenFactorySourcePair, tokenType, None, channel, start, stop, line, column)
+        self._token = token
+        return token
+
+    def nextTokenFields(self):
+        if self._chunk is None:
+            self._chunk = self.lexAll()
+            self._index = 0
+            self._error = 0
+
+        chunk = self._chunk
+        index = self._index
+        if index >= len(chunk):
+            index = len(chunk) - 1
+
+        errors = chunk.errors
+        while self._error < len(errors) and errors[self._error][0] <= index:
+            (_, line, column, msg) = errors[self._error]
+            self.getErrorListenerDispatch().syntaxError(self, None, line, column, msg, None)
+            self._error += 1
+
+        self._index = index + 1
+        self._hitEOF = chunk.types[index] == Token.EOF
+        return (chunk.types[index], chunk.channels[index], chunk.starts[index], chunk.stops[index], chunk.lines[index], chunk.columns[index])
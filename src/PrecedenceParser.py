@@ -0,0 +1,259 @@
+from antlr4.atn.Transition import AtomTransition, RuleTransition
+from antlr4.error.Errors import NoViableAltException, RecognitionException
+from antlr4_generated.CParser import CParser
+
+
+# C.g4 models the precedence of the operators with a chain of rules, oplevel15 down to oplevel1, so the generated
+# parser wraps every operand in a context of each level, most of which only pass the operand on (a single literal
+# becomes 14 nested contexts). PrecedenceCParser parses the expressions with precedence climbing instead and only
+# creates a context where an operator is applied. The operands of such a context are the contexts of other operators,
+# primaries (variables, literals, function calls, type casts) and parenthesized expressions, and its children are the
+# same as those of the generated parser, so Listener builds the same AST from the flat tree. oplevel15 and oplevel14
+# still return a context of their own rule, as the rules that use them expect.
+
+def tokenType(text):
+    return CParser.literalNames.index("'" + text + "'")
+
+# the left associative binary operators, from oplevel12 down to oplevel3: the precedence and the context of each one
+BINARY_OPERATORS = {}
+for (precedence, contextClass, operators) in [
+        (1, CParser.Oplevel12Context, ["||"]),
+        (2, CParser.Oplevel11Context, ["&&"]),
+        (3, CParser.Oplevel7Context,  ["==", "!="]),
+        (4, CParser.Oplevel6Context,  ["<", "<=", ">", ">="]),
+        (5, CParser.Oplevel4Context,  ["+", "-"]),
+        (6, CParser.Oplevel3Context,  ["*", "/", "%"])]:
+    for operator in operators:
+        BINARY_OPERATORS[tokenType(operator)] = (precedence, contextClass)
+
+PREFIX_OPERATORS = {tokenType(operator) for operator in ["++", "--", "+", "-", "&", "*", "!"]}
+POSTFIX_OPERATORS = {tokenType("++"), tokenType("--")}
+# the tokens a declarationSpecifier starts with, after a '(' they make it a type cast
+TYPE_TOKENS = {CParser.TYPECHAR, CParser.TYPEFLOAT, CParser.TYPEINT, CParser.TYPEVOID, CParser.CONST}
+
+COMMA         = tokenType(",")
+ASSIGN        = tokenType("=")
+QUESTION      = tokenType("?")
+COLON         = tokenType(":")
+LEFT_BRACKET  = tokenType("[")
+RIGHT_BRACKET = tokenType("]")
+LEFT_PAREN    = tokenType("(")
+RIGHT_PAREN   = tokenType(")")
+
+
+# the generated rules set self.state to the ATN state of the call before they call another rule, error recovery and
+# adaptive prediction in the called rule follow the ATN from there, so the same states are used here. They are
+# looked up in the ATN of CParser instead of copied from the generated code, so that they follow the grammar.
+def callState(ruleIndex, calledRuleIndex, afterToken=None):
+    # the state from which rule ruleIndex calls rule calledRuleIndex (right after matching afterToken, if it is given)
+    states = [state for state in CParser.atn.states if state.ruleIndex == ruleIndex
+              and any(isinstance(transition, RuleTransition) and transition.ruleIndex == calledRuleIndex for transition in state.transitions)]
+    if afterToken is not None:
+        afterStates = {transition.target for state in CParser.atn.states if state.ruleIndex == ruleIndex
+                       for transition in state.transitions if isinstance(transition, AtomTransition) and transition.label_ == afterToken}
+        states = [state for state in states if state in afterStates]
+    if len(states) != 1:
+        raise Exception("PrecedenceCParser doesn't match the generated CParser: rule " + CParser.ruleNames[ruleIndex]
+                        + " calls " + CParser.ruleNames[calledRuleIndex] + " from " + str(len(states)) + " states")
+    return states[0].stateNumber
+
+def ruleStartState(ruleIndex):
+    return CParser.atn.ruleToStartState[ruleIndex].stateNumber
+
+COMMA_OPERAND_STATE   = callState(CParser.RULE_oplevel15, CParser.RULE_oplevel14, COMMA)
+ASSIGNED_STATE        = callState(CParser.RULE_oplevel14, CParser.RULE_oplevel14, ASSIGN)
+TYPE_CAST_STATE       = callState(CParser.RULE_oplevel2,  CParser.RULE_typeCast)
+SUBSCRIPT_STATE       = callState(CParser.RULE_oplevel1,  CParser.RULE_oplevel15, LEFT_BRACKET)
+PARENTHESIZED_STATE   = callState(CParser.RULE_oplevel1,  CParser.RULE_oplevel15, LEFT_PAREN)
+FUNCTION_CALL_STATE   = callState(CParser.RULE_oplevel1,  CParser.RULE_functionCall)
+VARIABLE_STATE        = callState(CParser.RULE_oplevel1,  CParser.RULE_variable)
+FLOAT_STATE           = callState(CParser.RULE_oplevel1,  CParser.RULE_floatLiteral)
+INTEGER_STATE         = callState(CParser.RULE_oplevel1,  CParser.RULE_integerLiteral)
+CHARACTER_STATE       = callState(CParser.RULE_oplevel1,  CParser.RULE_characterLiteral)
+STRING_STATE          = callState(CParser.RULE_oplevel1,  CParser.RULE_stringLiteral)
+OPLEVEL2_START_STATE  = ruleStartState(CParser.RULE_oplevel2)
+OPLEVEL1_START_STATE  = ruleStartState(CParser.RULE_oplevel1)
+
+
+class PrecedenceCParser(CParser):
+    # a CParser that parses the expressions into a flat tree while flatExpressions is set, and with the generated
+    # rules otherwise. It accepts the same programs, but a syntax error in an expression is reported and recovered
+    # from by the rule around the expression, so the errors are only reported as CParser would without it.
+
+    def __init__(self, input, flatExpressions=True):
+        super().__init__(input)
+        self.flatExpressions = flatExpressions
+
+    def oplevel15(self, _p:int=0):
+        if not self.flatExpressions:
+            return super().oplevel15(_p)
+        parent = self._ctx
+        try:
+            # a comma expression is a chain of Oplevel15Contexts, like the left recursion of the rule makes
+            operand = self.assignmentExpression()
+            while self._input.LA(1) == COMMA:
+                localctx = self.wrap(CParser.Oplevel15Context, operand)
+                self.consume()
+                self.state = COMMA_OPERAND_STATE
+                self.assignmentExpression()
+                self.exitRule()
+                operand = localctx
+            if not isinstance(operand, CParser.Oplevel15Context):
+                operand = self.wrap(CParser.Oplevel15Context, operand)
+                self.exitRule()
+            return operand
+        except RecognitionException:
+            self._ctx = parent
+            raise
+
+    def oplevel14(self):
+        if not self.flatExpressions:
+            return super().oplevel14()
+        parent = self._ctx
+        try:
+            operand = self.assignmentExpression()
+            if not isinstance(operand, CParser.Oplevel14Context):
+                operand = self.wrap(CParser.Oplevel14Context, operand)
+                self.exitRule()
+            return operand
+        except RecognitionException:
+            self._ctx = parent
+            raise
+
+    def oplevel2(self):
+        # the operand of a type cast
+        if not self.flatExpressions:
+            return super().oplevel2()
+        parent = self._ctx
+        try:
+            return self.unaryExpression()
+        except RecognitionException:
+            self._ctx = parent
+            raise
+
+    def enterOuterAlt(self, localctx, altNum:int):
+        # the context of a labeled alternative (the initializers) takes the place of the one of its rule, the parse
+        # listeners were only told about the latter, but are told that the former is exited
+        labeled = self._ctx is not localctx
+        super().enterOuterAlt(localctx, altNum)
+        if labeled and self._parseListeners is not None:
+            self.triggerEnterRuleEvent()
+
+    def wrap(self, contextClass, operand):
+        # puts a context of contextClass in the place of operand, the last child of the current context, with operand
+        # as its first child, and continues in that context (until exitRule)
+        parent = self._ctx
+        localctx = contextClass(self, parent, operand.invokingState)
+        localctx.start = operand.start
+        operand.parentCtx = localctx
+        if self.buildParseTrees:
+            parent.removeLastChild()
+            parent.addChild(localctx)
+            localctx.addChild(operand)
+        self._ctx = localctx
+        if self._parseListeners is not None:
+            self.triggerEnterRuleEvent()
+        return localctx
+
+    def assignmentExpression(self):
+        # oplevel14: oplevel13 ('=' oplevel14)?
+        operand = self.conditionalExpression()
+        if self._input.LA(1) != ASSIGN:
+            return operand
+        localctx = self.wrap(CParser.Oplevel14Context, operand)
+        self.consume()
+        self.state = ASSIGNED_STATE
+        self.assignmentExpression()
+        self.exitRule()
+        return localctx
+
+    def conditionalExpression(self):
+        # oplevel13: oplevel12 ('?' oplevel12 ':' oplevel13)?
+        operand = self.binaryExpression(1)
+        if self._input.LA(1) != QUESTION:
+            return operand
+        localctx = self.wrap(CParser.Oplevel13Context, operand)
+        self.consume()
+        self.binaryExpression(1)
+        self.match(COLON)
+        self.conditionalExpression()
+        self.exitRule()
+        return localctx
+
+    def binaryExpression(self, precedence):
+        # the operators of at least precedence, the right operand of an operator only has operators that bind tighter
+        operand = self.unaryExpression()
+        while True:
+            operator = BINARY_OPERATORS.get(self._input.LA(1))
+            if operator is None or operator[0] < precedence:
+                return operand
+            localctx = self.wrap(operator[1], operand)
+            self.consume()
+            self.binaryExpression(operator[0] + 1)
+            self.exitRule()
+            operand = localctx
+
+    def unaryExpression(self):
+        # oplevel2: a prefix operator, a type cast or oplevel1
+        la = self._input.LA(1)
+        if la in PREFIX_OPERATORS:
+            localctx = CParser.Oplevel2Context(self, self._ctx, self.state)
+            self.enterRule(localctx, OPLEVEL2_START_STATE, self.RULE_oplevel2)
+            self.consume()
+            self.unaryExpression()
+            self.exitRule()
+            return localctx
+        if la == LEFT_PAREN and self._input.LA(2) in TYPE_TOKENS:
+            self.state = TYPE_CAST_STATE
+            return self.typeCast()
+        return self.postfixExpression()
+
+    def postfixExpression(self):
+        # oplevel1: a primary with postfix operators and subscripts
+        operand = self.primaryExpression()
+        while True:
+            la = self._input.LA(1)
+            if la in POSTFIX_OPERATORS:
+                localctx = self.wrap(CParser.Oplevel1Context, operand)
+                self.consume()
+            elif la == LEFT_BRACKET:
+                localctx = self.wrap(CParser.Oplevel1Context, operand)
+                self.consume()
+                self.state = SUBSCRIPT_STATE
+                self.oplevel15()
+                self.match(RIGHT_BRACKET)
+            else:
+                return operand
+            self.exitRule()
+            operand = localctx
+
+    def primaryExpression(self):
+        la = self._input.LA(1)
+        if la == CParser.IDENTIFIER:
+            if self._input.LA(2) == LEFT_PAREN:
+                self.state = FUNCTION_CALL_STATE
+                return self.functionCall()
+            self.state = VARIABLE_STATE
+            return self.variable()
+        elif la == CParser.FLOAT:
+            self.state = FLOAT_STATE
+            return self.floatLiteral()
+        elif la == CParser.INTEGER:
+            self.state = INTEGER_STATE
+            return self.integerLiteral()
+        elif la == CParser.CHARACTER:
+            self.state = CHARACTER_STATE
+            return self.characterLiteral()
+        elif la == CParser.STRING:
+            self.state = STRING_STATE
+            return self.stringLiteral()
+        elif la == LEFT_PAREN:
+            localctx = CParser.Oplevel1Context(self, self._ctx, self.state)
+            self.enterRule(localctx, OPLEVEL1_START_STATE, self.RULE_oplevel1)
+            self.consume()
+            self.state = PARENTHESIZED_STATE
+            self.oplevel15()
+            self.match(RIGHT_PAREN)
+            self.exitRule()
+            return localctx
+        raise NoViableAltException(self)
@@ -0,0 +1,104 @@
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+
+PROFILE_FORMAT_VERSION = 1
+
+
+class Profiler:
+    # records, for every compiled file, the duration, memory and number of live objects of each step
+    # and the sizes of what the steps produced, so they can be saved as json by --profile-json
+
+    def __init__(self):
+        self.files = []
+        self.current = None
+        tracemalloc.start()
+
+    def startFile(self, filename):
+        self.current = {
+            "filename"  : filename,
+            "succeeded" : None,
+            "ns"        : 0,
+            "stages"    : [],
+            "counts"    : {},
+        }
+        self.fileStart = time.perf_counter_ns()
+
+    def endFile(self, succeeded):
+        if self.current is None:
+            return
+
+        self.current["succeeded"] = bool(succeeded)
+        self.current["ns"] = time.perf_counter_ns() - self.fileStart
+        self.files.append(self.current)
+        self.current = None
+
+    def startStage(self):
+        tracemalloc.reset_peak()
+
+    def endStage(self, stage, nanoseconds):
+        if self.current is None:
+            return
+
+        memory, peakMemory = tracemalloc.get_traced_memory()
+        self.current["stages"].append({
+            "stage"           : stage,
+            "ns"              : nanoseconds,
+            "memoryBytes"     : memory,
+            "peakMemoryBytes" : peakMemory,
+            "objects"         : len(gc.get_objects()),
+        })
+
+    def count(self, name, value):
+        if self.current is not None:
+            self.current["counts"][name] = value
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def report(self):
+        return {
+            "version" : PROFILE_FORMAT_VERSION,
+            "python"  : platform.python_version(),
+            "files"   : self.files,
+        }
+
+    def save(self, filename):
+        with open(filename, "w") as myfile:
+            json.dump(self.report(), myfile, indent=4)
+            myfile.write("\n")
+
+
+def countParseTreeNodes(parseTreeRoot):
+    count = 0
+    nodes = [parseTreeRoot]
+    while nodes:
+        node = nodes.pop()
+        count += 1
+        children = getattr(node, "children", None)
+        if children:
+            nodes.extend(children)
+    return count
+
+
+def countASTNodes(astRoot):
+    count = 0
+    nodes = [astRoot]
+    while nodes:
+        node = nodes.pop()
+        count += 1
+        nodes.extend(node.children)
+    return count
+
+
+def countSymbols(symbolTable):
+    count = len(symbolTable.stringLiterals)
+    scopes = [symbolTable.root]
+    while scopes:
+        scope = scopes.pop()
+        count += len(scope.symbols)
+        scopes.extend(scope.children)
+    return count
@@ -0,0 +1,582 @@
+from antlr4.Token import Token
+from antlr4.error.Errors import ParseCancellationException
+from antlr4_generated.CParser import CParser
+from AbstractSyntaxTree import *
+from ASTBuilder import OPERATOR_NODES
+from PrecedenceParser import tokenType, BINARY_OPERATORS, PREFIX_OPERATORS, POSTFIX_OPERATORS, TYPE_TOKENS
+import sys
+
+
+# A hand-written recursive descent parser for the C subset of C.g4, used with --parser=rd. It reads the tokens of
+# CLexer (or FastCLexer) from a token stream and builds the AST directly, the same AST that Listener builds from the
+# parse tree of CParser, with ASTPositions in the place of the contexts, as ASTBuilder gives them. Every decision of
+# the grammar is made on the next one or two tokens, except for a few that look further ahead in the same way the
+# adaptive prediction of CParser does (see isFunction, isNestedInitializerList and takesTrailingComma).
+# It does not report syntax errors: on the first token that does not fit it raises a ParseCancellationException, and
+# the program is parsed again with CParser to report the errors.
+
+INCLUDE       = tokenType("#include")
+LESS_THAN     = tokenType("<")
+GREATER_THAN  = tokenType(">")
+DOT           = tokenType(".")
+COMMA         = tokenType(",")
+SEMICOLON     = tokenType(";")
+ASSIGN        = tokenType("=")
+QUESTION      = tokenType("?")
+COLON         = tokenType(":")
+STAR          = tokenType("*")
+LEFT_PAREN    = tokenType("(")
+RIGHT_PAREN   = tokenType(")")
+LEFT_BRACKET  = tokenType("[")
+RIGHT_BRACKET = tokenType("]")
+LEFT_BRACE    = tokenType("{")
+RIGHT_BRACE   = tokenType("}")
+
+# the tokens that can follow an initializer, after one of them a ',' behind a '}' ends the initializer list
+INITIALIZER_FOLLOW = {COMMA, RIGHT_BRACE, SEMICOLON}
+
+LITERAL_NODES = {
+    CParser.FLOAT:     lambda text: ASTFloatLiteralNode(float(text)),
+    CParser.INTEGER:   lambda text: ASTIntegerLiteralNode(int(text)),
+    CParser.CHARACTER: lambda text: ASTCharacterLiteralNode(text),
+    CParser.STRING:    lambda text: ASTStringLiteralNode(text[1:-1]),
+}
+
+
+class RecursiveDescentParser(object):
+    def __init__(self, tokenStream):
+        self.tokenStream = tokenStream
+        self.LA = tokenStream.LA
+        self.LT = tokenStream.LT
+        self.consume = tokenStream.consume
+
+    def parse(self):
+        # gives the AbstractSyntaxTree of the program
+        abstractSyntaxTree = AbstractSyntaxTree()
+        abstractSyntaxTree.root = ASTProgramNode()
+        self.program(abstractSyntaxTree.root)
+
+        return abstractSyntaxTree
+
+    def syntaxError(self):
+        raise ParseCancellationException("unexpected token " + str(self.LT(1)))
+
+    def match(self, tokenType):
+        token = self.LT(1)
+        if token.type != tokenType:
+            self.syntaxError()
+        self.consume()
+        return token
+
+    def name(self, token):
+        # every identifier and type name of the program is kept as one (interned) string, like Listener does
+        return sys.intern(token.text)
+
+    def positions(self, start, children=None):
+        # the positions of a rule that started at start and ends with the last consumed token
+        return ASTPositions(start, self.LT(-1), children, self.tokenStream)
+
+
+
+    def program(self, node):
+        # (include | functionDeclaration | functionDefinition | variableDeclaration ';')* EOF
+        while True:
+            la = self.LA(1)
+            if la == Token.EOF:
+                return
+            if la == INCLUDE:
+                self.include(node)
+            elif self.isFunction():
+                self.function(node)
+            elif la in TYPE_TOKENS:
+                self.variableDeclaration(node)
+                self.match(SEMICOLON)
+            else:
+                self.syntaxError()
+
+    def include(self, node):
+        self.consume()
+        if self.LA(1) == LESS_THAN:
+            self.consume()
+            # identifier '.' identifier
+            name = self.match(CParser.IDENTIFIER).text + self.match(DOT).text + self.match(CParser.IDENTIFIER).text
+            node.addChildNode(ASTIncludeNode(True, name))
+            self.match(GREATER_THAN)
+        else:
+            node.addChildNode(ASTIncludeNode(False, self.match(CParser.STRING).text[1:-1]))
+
+    def isFunction(self):
+        # declarationSpecifier* pointerPart* identifier '(', where a variable declaration can't have a '('
+        k = 1
+        while self.LA(k) in TYPE_TOKENS or self.LA(k) == STAR:
+            k += 1
+        return self.LA(k) == CParser.IDENTIFIER and self.LA(k + 1) == LEFT_PAREN
+
+    def isDefinition(self):
+        # the parameters are followed by the statements of a definition or the ';' of a declaration
+        k = 1
+        while self.LA(k) != LEFT_PAREN:
+            k += 1
+        depth = 0
+        while True:
+            la = self.LA(k)
+            if la == LEFT_PAREN:
+                depth += 1
+            elif la == RIGHT_PAREN:
+                depth -= 1
+                if depth == 0:
+                    return self.LA(k + 1) == LEFT_BRACE
+            elif la == Token.EOF:
+                return False
+            k += 1
+
+    def function(self, parent):
+        # declarationSpecifier* pointerPart* identifier '(' parameters ')' (';' | statements)
+        start = self.LT(1)
+        isDefinition = self.isDefinition()
+        if not isDefinition:
+            node = ASTFunctionDeclarationNode()
+        else:
+            k = 1
+            while self.LA(k) != CParser.IDENTIFIER:
+                k += 1
+            node = ASTMainFunctionNode() if self.LT(k).text == "main" else ASTFunctionDefinitionNode()
+        parent.addChildNode(node)
+
+        self.declarationSpecifiers(node)
+        while self.LA(1) == STAR:
+            node.indirections.append((False, self.pointerPart(node)))
+        node.identifier = self.name(self.match(CParser.IDENTIFIER))
+        self.match(LEFT_PAREN)
+        self.parameters(node)
+        self.match(RIGHT_PAREN)
+        if isDefinition:
+            self.statements(node)
+        else:
+            self.match(SEMICOLON)
+        node.ctx = self.positions(start)
+
+    def parameters(self, parent):
+        # parameter (',' parameter)* |
+        node = parent.addChildNode(ASTParametersNode())
+        if self.LA(1) not in TYPE_TOKENS:
+            return
+        self.parameter(node)
+        while self.LA(1) == COMMA:
+            self.consume()
+            self.parameter(node)
+
+    def parameter(self, parent):
+        # declarationSpecifier+ paramDeclarator
+        start = self.LT(1)
+        node = parent.addChildNode(ASTParameterNode())
+        if self.LA(1) not in TYPE_TOKENS:
+            self.syntaxError()
+        self.declarationSpecifiers(node)
+        self.declarator(node, True)
+        node.ctx = self.positions(start)
+
+
+
+    def declarationSpecifiers(self, node):
+        # declarationSpecifier*, a type or const
+        while self.LA(1) in TYPE_TOKENS:
+            token = self.LT(1)
+            if token.type == CParser.CONST:
+                node.isConstant = True
+            else:
+                node.baseType = self.name(token)
+                node.typeSpecifierPresent = True
+            self.consume()
+
+    def pointerPart(self, node):
+        # '*' cvQualifier?, gives whether the pointer is const
+        self.consume()
+        if self.LA(1) == CParser.CONST:
+            self.consume()
+            node.isConstant = True
+            return True
+        return False
+
+    def declarator(self, node, isParameter):
+        # pointerPart* '(' declarator ')' arrayPart* | pointerPart* identifier arrayPart*, the identifier is optional
+        # in a parameter. The pointers and arrays of a declarator go before those of the declarator inside of it.
+        position = len(node.indirections)
+        while self.LA(1) == STAR:
+            node.indirections.insert(position, (False, self.pointerPart(node)))
+            position += 1
+        la = self.LA(1)
+        if la == LEFT_PAREN:
+            self.consume()
+            self.declarator(node, isParameter)
+            self.match(RIGHT_PAREN)
+        elif la == CParser.IDENTIFIER:
+            node.identifier = self.name(self.LT(1))
+            self.consume()
+        elif not isParameter:
+            self.syntaxError()
+        while self.LA(1) == LEFT_BRACKET:
+            node.indirections.insert(position, (True, False))
+            self.arrayPart(node)
+
+    def arrayPart(self, parent):
+        # '[' oplevel15? ']'
+        start = self.LT(1)
+        node = ASTArrayPartNode()
+        parent.arrayLengths.append(node)
+        parent.addChildNode(node)
+        self.consume()
+        if self.LA(1) != RIGHT_BRACKET:
+            node.addChildNode(self.expression())
+        self.match(RIGHT_BRACKET)
+        node.ctx = self.positions(start)
+
+    def variableDeclaration(self, parent):
+        # declarationSpecifier+ declaratorInitializer (',' declaratorInitializer)*
+        node = parent.addChildNode(ASTVariableDeclarationNode())
+        self.declarationSpecifiers(node)
+        self.declaratorInitializer(node)
+        while self.LA(1) == COMMA:
+            self.consume()
+            self.declaratorInitializer(node)
+
+    def declaratorInitializer(self, parent):
+        # declarator ('=' initializer)?
+        start = self.LT(1)
+        node = parent.addChildNode(ASTDeclaratorInitializerNode())
+        self.declarator(node, False)
+        if self.LA(1) == ASSIGN:
+            self.consume()
+            self.initializer(node)
+        node.ctx = self.positions(start)
+
+    def initializer(self, parent):
+        # '{' (oplevel14 (',' oplevel14)*)? '}' ','? | '{' (initializer (',' initializer)*)? '}' ','? | oplevel14
+        start = self.LT(1)
+        node = ASTInitializerListNode()
+        parent.initializerList = node
+        parent.addChildNode(node)
+        if self.LA(1) != LEFT_BRACE:
+            node.addChildNode(self.assignmentExpression())
+            node.ctx = self.positions(start)
+            return
+
+        node.isArray = True
+        nested = self.isNestedInitializerList()
+        self.consume()
+        if self.LA(1) != RIGHT_BRACE:
+            while True:
+                if nested:
+                    self.initializer(node)
+                else:
+                    node.addChildNode(self.assignmentExpression())
+                if self.LA(1) != COMMA:
+                    break
+                self.consume()
+        self.match(RIGHT_BRACE)
+        if self.takesTrailingComma():
+            self.consume()
+        node.ctx = self.positions(start)
+
+    def isNestedInitializerList(self):
+        # the elements are initializers instead of expressions when one of them is a list, both fit a list without
+        # lists and CParser takes the first alternative then
+        k = 2
+        while True:
+            la = self.LA(k)
+            if la == LEFT_BRACE:
+                return True
+            if la == RIGHT_BRACE or la == Token.EOF:
+                return False
+            k += 1
+
+    def takesTrailingComma(self):
+        # a ',' after an initializer list belongs to it when no other initializer or declarator follows it
+        return self.LA(1) == COMMA and self.LA(2) in INITIALIZER_FOLLOW
+
+
+
+    def statements(self, parent):
+        # '{' statement* '}'
+        node = parent.addChildNode(ASTStatementsNode())
+        self.match(LEFT_BRACE)
+        while self.LA(1) != RIGHT_BRACE:
+            self.statement(node)
+        self.consume()
+
+    def statement(self, parent):
+        start = self.LT(1)
+        node = parent.addChildNode(ASTStatementNode())
+        la = self.LA(1)
+        if la == LEFT_BRACE:
+            self.statements(node)
+        elif la == CParser.IF:
+            self.ifCond(node)
+        elif la == CParser.WHILE:
+            self.whileCond(node)
+        elif la == CParser.DO:
+            self.doWhileCond(node)
+        elif la == CParser.FOR:
+            self.forLoop(node)
+        elif la == CParser.RETURN:
+            self.returnStmt(node)
+            self.match(SEMICOLON)
+        elif la == CParser.BREAK:
+            node.addChildNode(ASTBreakNode(self.positions(self.match(CParser.BREAK))))
+            self.match(SEMICOLON)
+        elif la == CParser.CONTINUE:
+            node.addChildNode(ASTContinueNode(self.positions(self.match(CParser.CONTINUE))))
+            self.match(SEMICOLON)
+        elif la == SEMICOLON:
+            self.consume()
+        elif la in TYPE_TOKENS:
+            self.variableDeclaration(node)
+            self.match(SEMICOLON)
+        else:
+            node.addChildNode(self.expression())
+            self.match(SEMICOLON)
+        node.ctx = self.positions(start)
+
+    def ifCond(self, parent):
+        # IF '(' oplevel15 ')' statement elseCond?
+        start = self.LT(1)
+        node = parent.addChildNode(ASTIfNode())
+        self.consume()
+        self.match(LEFT_PAREN)
+        node.addChildNode(self.expression())
+        self.match(RIGHT_PAREN)
+        self.statement(node)
+        if self.LA(1) == CParser.ELSE:
+            elseStart = self.LT(1)
+            elseNode = node.addChildNode(ASTElseNode())
+            self.consume()
+            self.statement(elseNode)
+            elseNode.ctx = self.positions(elseStart)
+        node.ctx = self.positions(start)
+
+    def whileCond(self, parent):
+        # WHILE '(' oplevel15 ')' statement
+        start = self.LT(1)
+        node = parent.addChildNode(ASTWhileNode())
+        self.consume()
+        self.match(LEFT_PAREN)
+        node.addChildNode(self.expression())
+        self.match(RIGHT_PAREN)
+        self.statement(node)
+        node.ctx = self.positions(start)
+
+    def doWhileCond(self, parent):
+        # DO statements WHILE '(' oplevel15 ')' ';'
+        start = self.LT(1)
+        node = parent.addChildNode(ASTDoWhileNode())
+        self.consume()
+        self.statements(node)
+        self.match(CParser.WHILE)
+        self.match(LEFT_PAREN)
+        node.addChildNode(self.expression())
+        self.match(RIGHT_PAREN)
+        self.match(SEMICOLON)
+        node.ctx = self.positions(start)
+
+    def forLoop(self, parent):
+        # FOR '(' (variableDeclaration | oplevel15)? ';' oplevel15? ';' oplevel15? ')' statement, the three parts are
+        # built in the dummies of the node, like Listener does
+        start = self.LT(1)
+        node = parent.addChildNode(ASTForNode())
+        self.consume()
+        self.match(LEFT_PAREN)
+        if self.LA(1) in TYPE_TOKENS:
+            self.variableDeclaration(node.dummies[0])
+        elif self.LA(1) != SEMICOLON:
+            node.dummies[0].addChildNode(self.expression())
+        self.match(SEMICOLON)
+        if self.LA(1) != SEMICOLON:
+            node.dummies[1].addChildNode(self.expression())
+        self.match(SEMICOLON)
+        if self.LA(1) != RIGHT_PAREN:
+            node.dummies[2].addChildNode(self.expression())
+        self.match(RIGHT_PAREN)
+
+        if node.dummies[0].children:
+            node.initializer = node.dummies[0].children[0]
+            node.initializer.parent = node
+        if node.dummies[1].children:
+            node.condition = node.dummies[1].children[0]
+            node.condition.parent = node
+        if node.dummies[2].children:
+            node.iteration = node.dummies[2].children[0]
+            node.iteration.parent = node
+
+        self.statement(node)
+        node.ctx = self.positions(start)
+
+    def returnStmt(self, parent):
+        # RETURN oplevel15?
+        start = self.LT(1)
+        node = parent.addChildNode(ASTReturnNode())
+        self.consume()
+        if self.LA(1) != SEMICOLON:
+            node.addChildNode(self.expression())
+        node.ctx = self.positions(start)
+
+
+
+    # the expressions are parsed with precedence climbing, like PrecedenceCParser does, and every function gives the
+    # node of the expression it parsed. A node of an operator after its left operand has the positions of a context
+    # that starts with the left operand.
+
+    def expression(self):
+        # oplevel15: oplevel14 (',' oplevel14)*
+        start = self.LT(1)
+        node = self.assignmentExpression()
+        while self.LA(1) == COMMA:
+            self.consume()
+            operator = ASTCommaOperatorNode(None)
+            operator.addChildNode(node)
+            operator.addChildNode(self.assignmentExpression())
+            operator.ctx = self.positions(start)
+            node = operator
+        return node
+
+    def assignmentExpression(self):
+        # oplevel14: oplevel13 ('=' oplevel14)?
+        start = self.LT(1)
+        node = self.conditionalExpression()
+        if self.LA(1) != ASSIGN:
+            return node
+        self.consume()
+        operator = ASTSimpleAssignmentOperatorNode()
+        operator.addChildNode(node)
+        operator.addChildNode(self.assignmentExpression())
+        operator.ctx = self.positions(start)
+        return operator
+
+    def conditionalExpression(self):
+        # oplevel13: oplevel12 ('?' oplevel12 ':' oplevel13)?
+        start = self.LT(1)
+        node = self.binaryExpression(1)
+        if self.LA(1) != QUESTION:
+            return node
+        operator = ASTTernaryConditionalOperatorNode()
+        operator.addChildNode(node)
+        question = self.LT(1)
+        self.consume()
+        trueStart = self.LT(1)
+        operator.addChildNode(self.binaryExpression(1))
+        colon = self.match(COLON)
+        falseStart = self.LT(1)
+        operator.addChildNode(self.conditionalExpression())
+        operator.ctx = self.positions(start, [start, question, trueStart, colon, falseStart])
+        return operator
+
+    def binaryExpression(self, precedence):
+        # the operators of at least precedence, the right operand of an operator only has operators that bind tighter
+        start = self.LT(1)
+        node = self.unaryExpression()
+        while True:
+            token = self.LT(1)
+            operator = BINARY_OPERATORS.get(token.type)
+            if operator is None or operator[0] < precedence:
+                return node
+            self.consume()
+            operatorNode = OPERATOR_NODES[(operator[1], token.text)](None)
+            operatorNode.addChildNode(node)
+            rightStart = self.LT(1)
+            operatorNode.addChildNode(self.binaryExpression(operator[0] + 1))
+            children = [start, token, rightStart] if isinstance(operatorNode, ASTComparisonOperatorNode) else None
+            operatorNode.ctx = self.positions(start, children)
+            node = operatorNode
+
+    def unaryExpression(self):
+        # oplevel2: a prefix operator, a type cast or oplevel1
+        start = self.LT(1)
+        la = start.type
+        if la in PREFIX_OPERATORS:
+            self.consume()
+            node = OPERATOR_NODES[(CParser.Oplevel2Context, start.text)](None)
+            operandStart = self.LT(1)
+            node.addChildNode(self.unaryExpression())
+            node.ctx = self.positions(start, [start, operandStart] if isinstance(node, ASTDereferenceOperatorNode) else None)
+            return node
+        if la == LEFT_PAREN and self.LA(2) in TYPE_TOKENS:
+            return self.typeCast()
+        return self.postfixExpression()
+
+    def typeCast(self):
+        # '(' declarationSpecifier+ pointerPart* ')' oplevel2
+        start = self.LT(1)
+        node = ASTTypeCastNode()
+        self.consume()
+        self.declarationSpecifiers(node)
+        while self.LA(1) == STAR:
+            node.indirections.append((False, self.pointerPart(node)))
+        self.match(RIGHT_PAREN)
+        node.addChildNode(self.unaryExpression())
+        node.ctx = self.positions(start)
+        return node
+
+    def postfixExpression(self):
+        # oplevel1: a primary with postfix operators and subscripts
+        start = self.LT(1)
+        node = self.primaryExpression()
+        while True:
+            token = self.LT(1)
+            if token.type in POSTFIX_OPERATORS:
+                self.consume()
+                operator = OPERATOR_NODES[(CParser.Oplevel1Context, token.text)](None)
+                operator.addChildNode(node)
+            elif token.type == LEFT_BRACKET:
+                self.consume()
+                operator = ASTArraySubscriptNode()
+                operator.addChildNode(node)
+                operator.addChildNode(self.expression())
+                self.match(RIGHT_BRACKET)
+            else:
+                return node
+            operator.ctx = self.positions(start)
+            node = operator
+
+    def primaryExpression(self):
+        token = self.LT(1)
+        la = token.type
+        if la == CParser.IDENTIFIER:
+            if self.LA(2) == LEFT_PAREN:
+                return self.functionCall()
+            self.consume()
+            return ASTVariableNode(self.name(token), self.positions(token))
+        if la in LITERAL_NODES:
+            self.consume()
+            node = LITERAL_NODES[la](token.text)
+            node.ctx = self.positions(token)
+            return node
+        if la == LEFT_PAREN:
+            self.consume()
+            node = self.expression()
+            self.match(RIGHT_PAREN)
+            return node
+        self.syntaxError()
+
+    def functionCall(self):
+        # identifier '(' arguments ')' with arguments: oplevel14 (',' oplevel14)* |
+        start = self.LT(1)
+        node = ASTFunctionCallNode()
+        node.identifier = self.name(start)
+        self.consume()
+        self.consume()
+
+        argumentsStart = self.LT(1)
+        arguments = node.addChildNode(ASTArgumentsNode())
+        tokens = []
+        if self.LA(1) != RIGHT_PAREN:
+            while True:
+                tokens.append(self.LT(1))
+                arguments.addChildNode(self.assignmentExpression())
+                if self.LA(1) != COMMA:
+                    break
+                tokens.append(self.LT(1))
+                self.consume()
+        arguments.ctx = self.positions(argumentsStart, tokens)
+
+        self.match(RIGHT_PAREN)
+        node.ctx = self.positions(start)
+        return node
@@ -1,7 +1,7 @@
-from antlr4 import *
 from AbstractSyntaxTree import *
 from Visitor import *
 from TypeInfo import TYPES
+from PCodeEmitter import PCodeEmitter
 import copy
 
 class VisitorCodeGenerator(Visitor):
@@ -12,7 +12,8 @@ class VisitorCodeGenerator(Visitor):
         self._lvalue = []
         self.backLabels = []
         self.forwardLabels = []
-        self.outFile = open(outFile, "w")
+        # outFile is a filename, an already opened file object (e.g. io.StringIO) or a socket, the last two are left open
+        self.emitter = PCodeEmitter(outFile)
 
         self.p_types = {
             "address" : "a",
@@ -73,26 +74,27 @@ class VisitorCodeGenerator(Visitor):
         return "l" + str(self.current)
 
     def __del__(self):
-        self.outFile.close()
+        self.emitter.close()
 
 
     def visitProgramNode(self, node):
-        self.outFile.write("ldc i 0\n") # work/trash register
-        self.outFile.write("ldc i 0\nldc i 0\n") # work registers
-        self.outFile.write("ssp {0}\n".format(self.symbolTable.currentScope.getAddressCounter() + 5))
+        self.emitter.emit("ldc", "i", 0) # work/trash register
+        self.emitter.emit("ldc", "i", 0) # work registers
+        self.emitter.emit("ldc", "i", 0)
+        self.emitter.emit("ssp", self.symbolTable.currentScope.getAddressCounter() + 5)
 
         # code for string literals
         for string, symbolInfo in sorted(self.symbolTable.stringLiterals.items()):
             for i, c in enumerate(string):
-                self.outFile.write("lda 0 {0}\n".format(symbolInfo.address + i + 5))
+                self.emitter.emit("lda", 0, symbolInfo.address + i + 5)
 
-                self.outFile.write("ldc c {0}\n".format(repr(c) if c != '\'' else "'\''"))
-                self.outFile.write("sto c\n")
+                self.emitter.emit("ldc", "c", repr(c) if c != '\'' else "'\''")
+                self.emitter.emit("sto", "c")
 
             if len(string) > 0:
-                self.outFile.write("lda 0 {0}\n".format(symbolInfo.address + len(string) + 5))
-                self.outFile.write("ldc c 27\n")
-                self.outFile.write("sto c\n")
+                self.emitter.emit("lda", 0, symbolInfo.address + len(string) + 5)
+                self.emitter.emit("ldc", "c", 27)
+                self.emitter.emit("sto", "c")
 
         # code for variables
         for variable in self.symbolTable.currentScope.addressedVariables:
@@ -101,15 +103,17 @@ class VisitorCodeGenerator(Visitor):
         # sep k where k = max. depth local stack
         # self.outFile.write("sep 2147483646\n")
 
-        self.outFile.write("mst 0\n")
-        self.outFile.write("cup 0 function_main\n") #TODO: argc/argv
-        self.outFile.write("hlt\n")
+        self.emitter.emit("mst", 0)
+        self.emitter.emit("cup", 0, "function_main") #TODO: argc/argv
+        self.emitter.emit("hlt")
 
         # code for functions
         for child in node.children:
             if isinstance(child, ASTFunctionDefinitionNode):
                 child.accept(self)
 
+        self.emitter.flush()
+
 
     def visitIncludeNode(self, node):
         # self.outFile.write("code\n")
@@ -126,10 +130,11 @@ class VisitorCodeGenerator(Visitor):
         scope = self.symbolTable.currentScope
 
         # function label
-        self.outFile.write("\nfunction_{0}:\n".format(node.identifier))
+        self.emitter.separator()
+        self.emitter.label("function_" + node.identifier)
 
         # set SP to
-        self.outFile.write("ssp {0}\n".format(self.symbolTable.currentScope.getAddressCounter() + 5))
+        self.emitter.emit("ssp", self.symbolTable.currentScope.getAddressCounter() + 5)
 
         # for variable in scope.addressedVariables:
             # TODO: distinguish arguments from local variables: arguments already placed on stack by caller
@@ -152,9 +157,9 @@ class VisitorCodeGenerator(Visitor):
 
         # return from function
         if node.getType().baseType == "void" and node.getType().nrIndirections() == 0:
-            self.outFile.write("retp\n")
+            self.emitter.emit("retp")
         else:
-            self.outFile.write("retf\n")
+            self.emitter.emit("retf")
 
         self.symbolTable.closeScope()
 
@@ -204,19 +209,19 @@ class VisitorCodeGenerator(Visitor):
 
     def visitReturnNode(self, node):
         if not node.children:
-            self.outFile.write("retp\n")
+            self.emitter.emit("retp")
             return
 
         self.visitChildren(node) # TODO: make sure this takes the r value
-        self.outFile.write("str {0} 0 0\n".format(self.pType(node.children[0].getType())))
-        self.outFile.write("retf\n") # note: this was not in the compendium
+        self.emitter.emit("str", self.pType(node.children[0].getType()), 0, 0)
+        self.emitter.emit("retf")    # note: this was not in the compendium
 
     def visitBreakNode(self, node):
-        self.outFile.write("ujp {0}\n".format(self.forwardLabels[-1]))
+        self.emitter.emit("ujp", self.forwardLabels[-1])
 
 
     def visitContinueNode(self, node):
-        self.outFile.write("ujp {0}\n".format(self.backLabels[-1]))
+        self.emitter.emit("ujp", self.backLabels[-1])
 
 
     def visitIfNode(self, node):
@@ -229,17 +234,17 @@ class VisitorCodeGenerator(Visitor):
             # if proper if node, _lvalue should be empty as it needs to be
             self._lvalue.pop()
         node.children[0].accept(self)                            # condition
-        self.outFile.write("conv {0} b\n".format(self.pType(node.children[0].getType())))
-        self.outFile.write("fjp {0}\n".format(elseLabel))        # if top == false, jump over the 'then' code
+        self.emitter.emit("conv", self.pType(node.children[0].getType()), "b")
+        self.emitter.emit("fjp", elseLabel)                      # if top == false, jump over the 'then' code
         node.children[1].accept(self)                            # 'then'
 
         if len(node.children) == 3:                              # optional else
-            self.outFile.write("ujp {0}\n".format(afterLabel))   # jump over the 'else' code if coming from 'then'
-            self.outFile.write("{0}:\n".format(elseLabel))
+            self.emitter.emit("ujp", afterLabel)                 # jump over the 'else' code if coming from 'then'
+            self.emitter.label(elseLabel)
             node.children[2].accept(self)                        # else
-            self.outFile.write("{0}:\n".format(afterLabel))
+            self.emitter.label(afterLabel)
         else:
-            self.outFile.write("{0}:\n".format(elseLabel))
+            self.emitter.label(elseLabel)
 
         if isinstance(node.children[0], ASTExpressionNode):
             # if ternary conditional, pop from _lvalue after visiting 'then' and 'else' (which are expressions in that case)
@@ -259,17 +264,17 @@ class VisitorCodeGenerator(Visitor):
 
         self.symbolTable.openScope()
         if node.initializer: node.initializer.accept(self)
-        self.outFile.write("{0}:\n".format(conditionLabel))
+        self.emitter.label(conditionLabel)
         if node.condition:
             node.condition.accept(self)
-            self.outFile.write("conv {0} b\n".format(self.pType(node.condition.getType())))
-        else: self.outFile.write("ldc b t\n")
-        self.outFile.write("fjp {0}\n".format(afterLabel))
+            self.emitter.emit("conv", self.pType(node.condition.getType()), "b")
+        else: self.emitter.emit("ldc", "b", "t")
+        self.emitter.emit("fjp", afterLabel)
         self.visitChildren(node)
-        self.outFile.write("{0}:\n".format(iterationLabel))
+        self.emitter.label(iterationLabel)
         if node.iteration: node.iteration.accept(self)
-        self.outFile.write("ujp {0}\n".format(conditionLabel))
-        self.outFile.write("{0}:\n".format(afterLabel))
+        self.emitter.emit("ujp", conditionLabel)
+        self.emitter.label(afterLabel)
         self.symbolTable.closeScope()
 
         self.backLabels.pop()
@@ -282,13 +287,13 @@ class VisitorCodeGenerator(Visitor):
         self.backLabels.append(conditionLabel)
         self.forwardLabels.append(afterLabel)
 
-        self.outFile.write("{0}:\n".format(conditionLabel))
+        self.emitter.label(conditionLabel)
         node.children[0].accept(self)                            # condition
-        self.outFile.write("conv {0} b\n".format(self.pType(node.children[0].getType())))
-        self.outFile.write("fjp {0}\n".format(afterLabel))       # if top == false, jump over the loop code
+        self.emitter.emit("conv", self.pType(node.children[0].getType()), "b")
+        self.emitter.emit("fjp", afterLabel)                     # if top == false, jump over the loop code
         node.children[1].accept(self)                            # loop code
-        self.outFile.write("ujp {0}\n".format(conditionLabel))   # jump back to the condition
-        self.outFile.write("{0}:\n".format(afterLabel))
+        self.emitter.emit("ujp", conditionLabel)                 # jump back to the condition
+        self.emitter.label(afterLabel)
 
         self.backLabels.pop()
         self.forwardLabels.pop()
@@ -300,13 +305,13 @@ class VisitorCodeGenerator(Visitor):
 
         node.children[1].accept(self)                            # loop code
 
-        self.outFile.write("conv {0} b\n".format(self.pType(node.children[1].getType())))
-        self.outFile.write("{0}:\n".format(conditionLabel))
+        self.emitter.emit("conv", self.pType(node.children[1].getType()), "b")
+        self.emitter.label(conditionLabel)
         node.children[0].accept(self)                            # condition
-        self.outFile.write("fjp {0}\n".format(afterLabel))       # if top == false, jump over the loop code
+        self.emitter.emit("fjp", afterLabel)                     # if top == false, jump over the loop code
         node.children[1].accept(self)                            # loop code
-        self.outFile.write("ujp {0}\n".format(conditionLabel))   # jump back to the condition
-        self.outFile.write("{0}:\n".format(afterLabel))
+        self.emitter.emit("ujp", conditionLabel)                 # jump back to the condition
+        self.emitter.label(afterLabel)
 
 
     def visitVariableDeclarationNode(self, node):
@@ -322,8 +327,8 @@ class VisitorCodeGenerator(Visitor):
         if ttype.arrayNrDimensions() == 1:
             for i in range(ttype.array()[-1]):
                 # self.outFile.write("lda 0 {0}\n".format(address + i))
-                self.outFile.write("ldc {0} {1}\n".format(self.pType(arrayElementType), self.initializers["address" if arrayElementType.nrIndirections() > 0 else arrayElementType.baseType]))
-                self.outFile.write("str {0} 0 {1}\n".format(self.pType(arrayElementType), address + i))
+                self.emitter.emit("ldc", self.pType(arrayElementType), self.initializers["address" if arrayElementType.nrIndirections() > 0 else arrayElementType.baseType])
+                self.emitter.emit("str", self.pType(arrayElementType), 0, address + i)
         else:
             for i in range(ttype.array()[-1]):
                 self.allocArray(arrayElementType, address + i * arrayElementType.size())
@@ -336,9 +341,9 @@ class VisitorCodeGenerator(Visitor):
         ttype = decl.getType()
 
         for i in range(ttype.array()[-1]):
-            self.outFile.write("lda 0 {0}\n".format(decl.symbolInfo.address + i + 5))
-            self.outFile.write("ldc c {0}\n".format(repr(string[i]) if i < len(string) else 27))
-            self.outFile.write("sto c\n")
+            self.emitter.emit("lda", 0, decl.symbolInfo.address + i + 5)
+            self.emitter.emit("ldc", "c", repr(string[i]) if i < len(string) else 27)
+            self.emitter.emit("sto", "c")
 
 
     def arrayInitialization(self, node, initializerList, address, level=1):
@@ -350,8 +355,8 @@ class VisitorCodeGenerator(Visitor):
             if i > len(initializerList.children) - 1:
                 if level == maxLevel:
                     ttype.indirections = ttype.indirections[:-level-1]
-                    self.outFile.write("ldc {0} {1}\n".format(self.pType(ttype), self.initializers["address" if ttype.nrIndirections() > 0 else ttype.baseType]))
-                    self.outFile.write("str {0} 0 {1}\n".format(self.pType(ttype), address + i))
+                    self.emitter.emit("ldc", self.pType(ttype), self.initializers["address" if ttype.nrIndirections() > 0 else ttype.baseType])
+                    self.emitter.emit("str", self.pType(ttype), 0, address + i)
                 else:
                     self.arrayInitialization(node, ASTInitializerListNode(initializerList.ctx), address + i * ttype.size(), level+1)
             else:
@@ -362,8 +367,8 @@ class VisitorCodeGenerator(Visitor):
                         initializerList.children[i].accept(self)
                         self._lvalue.pop()
                     else:
-                        self.outFile.write("ldc {0} {1}\n".format(self.pType(ttype), initializerList.children[i].value))
-                    self.outFile.write("str {0} 0 {1}\n".format(self.pType(ttype), address + i))
+                        self.emitter.emit("ldc", self.pType(ttype), initializerList.children[i].value)
+                    self.emitter.emit("str", self.pType(ttype), 0, address + i)
                 else:
                     self.arrayInitialization(node, initializerList.children[i], address + i * ttype.array()[-level-1], level+1)
 
@@ -383,13 +388,13 @@ class VisitorCodeGenerator(Visitor):
                 needStore = False
         elif not ttype.isArray():
             initializer = self.initializers["address" if node.getType().nrIndirections() > 0 else node.getType().baseType]
-            self.outFile.write("ldc {0} {1}\n".format(self.pType(node.getType()), initializer))
+            self.emitter.emit("ldc", self.pType(node.getType()), initializer)
         elif ttype.isArray():
             self.allocArray(ttype, node.symbolInfo.address + 5)
             needStore = False
 
         if needStore:
-            self.outFile.write("str {0} 0 {1}\n".format(self.pType(node.getType()), node.symbolInfo.address + 5))
+            self.emitter.emit("str", self.pType(node.getType()), 0, node.symbolInfo.address + 5)
 
 
     def visitInitializerListNode(self, node):
@@ -400,11 +405,11 @@ class VisitorCodeGenerator(Visitor):
     def enterExpression(self, node):
         # print(type(node), "is stmt node", isinstance(node, ASTStatementNode))
         if expressionResultNeedsToBeCleanedUp(node):
-            self.outFile.write("ldc a 0\n")
+            self.emitter.emit("ldc", "a", 0)
 
     def exitExpression(self, node):
         if expressionResultNeedsToBeCleanedUp(node):
-            self.outFile.write("sto {0}\n".format(self.pType(node.getType())))
+            self.emitter.emit("sto", self.pType(node.getType()))
 
 
     def visitCommaOperatorNode(self, node):
@@ -413,9 +418,9 @@ class VisitorCodeGenerator(Visitor):
         self._lvalue.append(False)
 
         if not node.getType().equals(TYPES["void"]):
-            self.outFile.write("ldc a 0\n")
+            self.emitter.emit("ldc", "a", 0)
             child.accept(self)
-            self.outFile.write("sto {0}\n".format(self.pType(child.getType())))
+            self.emitter.emit("sto", self.pType(child.getType()))
         else:
             child.accept(self)
         node.children[1].accept(self)
@@ -424,35 +429,35 @@ class VisitorCodeGenerator(Visitor):
 
 
     def visitIntegerLiteralNode(self, node):
-        self.outFile.write("ldc i {0}\n".format(str(node.value)))
+        self.emitter.emit("ldc", "i", str(node.value))
 
 
     def visitFloatLiteralNode(self, node):
-        self.outFile.write("ldc r {0}\n".format(format(node.value, "f")))
+        self.emitter.emit("ldc", "r", format(node.value, "f"))
 
 
     def visitCharacterLiteralNode(self, node):
-        self.outFile.write("ldc c {0}\n".format(str(node.value)))
+        self.emitter.emit("ldc", "c", str(node.value))
 
 
     def visitStringLiteralNode(self, node):
         if isinstance(node.parent, ASTInitializerListNode) and node.parent.parent.getType().equals(TYPES["string"]):
             return
         symbolInfo = self.symbolTable.stringLiterals.get(node.decodedValue)
-        self.outFile.write("lda 1 {0}\n".format(symbolInfo.address + 5))
+        self.emitter.emit("lda", 1, symbolInfo.address + 5)
 
 
     def visitVariableNode(self, node):
         depthDifference = self.symbolTable.functionDefinitionDepthDifference(node.symbolInfo)
         if self.lvalue() or node.getType().isArray():
             # put address on stack
-            self.outFile.write("lda {0} {1}\n".format(depthDifference, node.symbolInfo.address + 5))
+            self.emitter.emit("lda", depthDifference, node.symbolInfo.address + 5)
         elif node.getType().nrIndirections() > 0:
             # TODO: can't the elif and else be joined together?
-            self.outFile.write("lod a {0} {1}\n".format(depthDifference, node.symbolInfo.address + 5))
+            self.emitter.emit("lod", "a", depthDifference, node.symbolInfo.address + 5)
         else:
             # put value on stack
-            self.outFile.write("lod {0} {1} {2}\n".format(self.pType(node.getType()), depthDifference, node.symbolInfo.address + 5))
+            self.emitter.emit("lod", self.pType(node.getType()), depthDifference, node.symbolInfo.address + 5)
 
         self.visitChildren(node)
 
@@ -461,8 +466,8 @@ class VisitorCodeGenerator(Visitor):
         for el in node.parsedFormat:
             if isinstance(el, str):
                 for c in bytes(el, "utf-8").decode("unicode-escape"):
-                    self.outFile.write("ldc c {0}\n".format(repr(c) if c != '\'' else "'\''"))
-                    self.outFile.write("out c\n")
+                    self.emitter.emit("ldc", "c", repr(c) if c != '\'' else "'\''")
+                    self.emitter.emit("out", "c")
             else:
                 width, node = el
                 if node.getType().equals(TYPES["int"]) and width > 0:
@@ -472,57 +477,98 @@ class VisitorCodeGenerator(Visitor):
                     afterLoop2Label = self.getLabel() + "_after_loop2"
                     noPaddingLabel = self.getLabel() + "_no_padding"
 
-                    self.outFile.write("ldc a 2\n")
+                    self.emitter.emit("ldc", "a", 2)
                     self._lvalue.append(False)
                     node.accept(self)
                     self._lvalue.pop()
-                    c = "sto i\n" # store number in 2
-                    c += "ldc a 1\nldc a 2\nind i\nsto i\n" # initialize quotient
-                    c += "ldc a 0\nldc i 1\nsto i\n" # initialize number length to -1 in 0
-                    c += "ldc a 1\nind i\n"
-                    c += "ldc i 0\n"
-                    c += "les i\n" # if number < 0
-                    c += "fjp {0}\n".format(loop1Label)
-                    c += "ldc a 0\nldc a 0\nind i\ninc i 1\nsto i\n" # increment number length if number is negative
-                    c += "ldc a 1\nldc a 1\nind i\nneg i\nsto i\n" # negate the quotient if it is negative
-                    c += "{0}:\n".format(loop1Label) # loop
-                    c += "ldc a 1\nind i\nldc i 9\ngrt i\nfjp {0}\n".format(afterLoop1Label) # if quotient > 9, iterate
-                    c += "ldc a 0\nldc a 0\nind i\ninc i 1\nsto i\n" # increment number length in iteration
-                    c += "ldc a 1\nldc a 1\nind i\n"
-                    c += "ldc i 10\n"
-                    c += "div i\n" # divide number by 10
-                    c += "sto i\n"
-                    c += "ujp {0}\n".format(loop1Label)
-                    c += "{0}:\n".format(afterLoop1Label)
-                    c += "ldc a 0\nldc i {0}\n".format(width)
-                    c += "ldc a 0\nind i\n"
-                    c += "sub i\nsto i\n" # calculate amount of padding, store in 0
-                    c += "ldc a 1\nldc i 0\nsto i\n" # initialize loop iterator in 1
-                    c += "{0}:\n".format(loop2Label)
-                    c += "ldc a 1\nind i\nldc a 0\nind i\n" # iterator >= padding: end of loop
-                    c += "les i\nfjp {0}\n".format(noPaddingLabel)
-                    c += "ldc c ' '\nout c\n" # print padding
-                    c += "ldc a 1\nldc a 1\nind i\ninc i 1\nsto i\n" # increment iterator
-                    c += "ujp {0}\n".format(loop2Label)
-                    c += "{0}:\n".format(noPaddingLabel)
-                    c += "ldc a 2\nind i\nout i\n"
-                    self.outFile.write(c)
+                    self.emitter.emit("sto", "i") # store number in 2
+                    self.emitter.emit("ldc", "a", 1) # initialize quotient
+                    self.emitter.emit("ldc", "a", 2)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("sto", "i")
+                    self.emitter.emit("ldc", "a", 0) # initialize number length to -1 in 0
+                    self.emitter.emit("ldc", "i", 1)
+                    self.emitter.emit("sto", "i")
+                    self.emitter.emit("ldc", "a", 1)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("ldc", "i", 0)
+                    self.emitter.emit("les", "i") # if number < 0
+                    self.emitter.emit("fjp", loop1Label)
+                    self.emitter.emit("ldc", "a", 0) # increment number length if number is negative
+                    self.emitter.emit("ldc", "a", 0)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("inc", "i", 1)
+                    self.emitter.emit("sto", "i")
+                    self.emitter.emit("ldc", "a", 1) # negate the quotient if it is negative
+                    self.emitter.emit("ldc", "a", 1)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("neg", "i")
+                    self.emitter.emit("sto", "i")
+                    self.emitter.label(loop1Label) # loop
+                    self.emitter.emit("ldc", "a", 1) # if quotient > 9, iterate
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("ldc", "i", 9)
+                    self.emitter.emit("grt", "i")
+                    self.emitter.emit("fjp", afterLoop1Label)
+                    self.emitter.emit("ldc", "a", 0) # increment number length in iteration
+                    self.emitter.emit("ldc", "a", 0)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("inc", "i", 1)
+                    self.emitter.emit("sto", "i")
+                    self.emitter.emit("ldc", "a", 1)
+                    self.emitter.emit("ldc", "a", 1)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("ldc", "i", 10)
+                    self.emitter.emit("div", "i") # divide number by 10
+                    self.emitter.emit("sto", "i")
+                    self.emitter.emit("ujp", loop1Label)
+                    self.emitter.label(afterLoop1Label)
+                    self.emitter.emit("ldc", "a", 0)
+                    self.emitter.emit("ldc", "i", width)
+                    self.emitter.emit("ldc", "a", 0)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("sub", "i") # calculate amount of padding, store in 0
+                    self.emitter.emit("sto", "i")
+                    self.emitter.emit("ldc", "a", 1) # initialize loop iterator in 1
+                    self.emitter.emit("ldc", "i", 0)
+                    self.emitter.emit("sto", "i")
+                    self.emitter.label(loop2Label)
+                    self.emitter.emit("ldc", "a", 1) # iterator >= padding: end of loop
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("ldc", "a", 0)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("les", "i")
+                    self.emitter.emit("fjp", noPaddingLabel)
+                    self.emitter.emit("ldc", "c", "' '") # print padding
+                    self.emitter.emit("out", "c")
+                    self.emitter.emit("ldc", "a", 1) # increment iterator
+                    self.emitter.emit("ldc", "a", 1)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("inc", "i", 1)
+                    self.emitter.emit("sto", "i")
+                    self.emitter.emit("ujp", loop2Label)
+                    self.emitter.label(noPaddingLabel)
+                    self.emitter.emit("ldc", "a", 2)
+                    self.emitter.emit("ind", "i")
+                    self.emitter.emit("out", "i")
                 elif node.getType().equals(TYPES["char"]):
                     i = 0
                     while i < width - 1:
-                        self.outFile.write("ldc c ' '\nout c\n")
+                        self.emitter.emit("ldc", "c", "' '")
+                        self.emitter.emit("out", "c")
                         i += 1
                     node.accept(self)
-                    self.outFile.write("out c\n")
+                    self.emitter.emit("out", "c")
                 elif node.getType().toRvalue().equals(TYPES["string"].toRvalue()):
-                    b = c = ""
-
-                    # code before evaluating char*
-                    b += "ldc a 1\n"
-
-                    # code after evaluating char*
-                    c += "sto a\n" # store the address of the string
-                    c += "ldc a 0\nldc i 0\nsto i\n" # initialize counter
+                    # the address of the string is stored in 1
+                    self.emitter.emit("ldc", "a", 1)
+                    self._lvalue.append(False)
+                    node.accept(self)
+                    self._lvalue.pop()
+                    self.emitter.emit("sto", "a") # store the address of the string
+                    self.emitter.emit("ldc", "a", 0) # initialize counter
+                    self.emitter.emit("ldc", "i", 0)
+                    self.emitter.emit("sto", "i")
 
                     if width > 0:
                         loopLabel = self.getLabel() + "_count_loop"
@@ -530,50 +576,72 @@ class VisitorCodeGenerator(Visitor):
                         paddingLoopLabel = self.getLabel() + "_padding_loop"
                         afterPaddingLoopLabel = self.getLabel() + "_after_padding_loop"
 
-                        c += "ldc a 2\n" # load address to be able to pop the string's address later
-                        c += "ldc a 1\nind a\n" # load the address of the string to 1
-                        c += "dpl a\nind c\n"
-                        c += "{0}:\n".format(loopLabel)
-                        c += "ldc c 27\nneq c\nfjp {0}\n".format(afterLoopLabel)
-                        c += "ldc a 0\nldc a 0\nind i\ninc i 1\nsto i\n" # increment counter
-                        c += "inc a 1\ndpl a\nind c\n"
-                        c += "ujp {0}\n".format(loopLabel)
-                        c += "{0}:\n".format(afterLoopLabel)
-                        c += "sto a\n" # pop address from stack
-                        c += "ldc a 0\nldc i {0}\n".format(width)
-                        c += "ldc a 0\nind i\n"
-                        c += "sub i\nsto i\n" # determine number of padding spaces required
-                        c += "{0}:\n".format(paddingLoopLabel)
-                        c += "ldc a 0\nind i\nldc i 0\ngrt i\nfjp {0}\n".format(afterPaddingLoopLabel) # padding > 0
-                        c += "ldc c ' '\nout c\n" # print padding
-                        c += "ldc a 0\nldc a 0\nind i\ndec i 1\nsto i\n"
-                        c += "ujp {0}\n".format(paddingLoopLabel)
-                        c += "{0}:\n".format(afterPaddingLoopLabel)
+                        self.emitter.emit("ldc", "a", 2) # load address to be able to pop the string's address later
+                        self.emitter.emit("ldc", "a", 1) # load the address of the string to 1
+                        self.emitter.emit("ind", "a")
+                        self.emitter.emit("dpl", "a")
+                        self.emitter.emit("ind", "c")
+                        self.emitter.label(loopLabel)
+                        self.emitter.emit("ldc", "c", 27)
+                        self.emitter.emit("neq", "c")
+                        self.emitter.emit("fjp", afterLoopLabel)
+                        self.emitter.emit("ldc", "a", 0) # increment counter
+                        self.emitter.emit("ldc", "a", 0)
+                        self.emitter.emit("ind", "i")
+                        self.emitter.emit("inc", "i", 1)
+                        self.emitter.emit("sto", "i")
+                        self.emitter.emit("inc", "a", 1)
+                        self.emitter.emit("dpl", "a")
+                        self.emitter.emit("ind", "c")
+                        self.emitter.emit("ujp", loopLabel)
+                        self.emitter.label(afterLoopLabel)
+                        self.emitter.emit("sto", "a") # pop address from stack
+                        self.emitter.emit("ldc", "a", 0)
+                        self.emitter.emit("ldc", "i", width)
+                        self.emitter.emit("ldc", "a", 0)
+                        self.emitter.emit("ind", "i")
+                        self.emitter.emit("sub", "i") # determine number of padding spaces required
+                        self.emitter.emit("sto", "i")
+                        self.emitter.label(paddingLoopLabel)
+                        self.emitter.emit("ldc", "a", 0) # padding > 0
+                        self.emitter.emit("ind", "i")
+                        self.emitter.emit("ldc", "i", 0)
+                        self.emitter.emit("grt", "i")
+                        self.emitter.emit("fjp", afterPaddingLoopLabel)
+                        self.emitter.emit("ldc", "c", "' '") # print padding
+                        self.emitter.emit("out", "c")
+                        self.emitter.emit("ldc", "a", 0)
+                        self.emitter.emit("ldc", "a", 0)
+                        self.emitter.emit("ind", "i")
+                        self.emitter.emit("dec", "i", 1)
+                        self.emitter.emit("sto", "i")
+                        self.emitter.emit("ujp", paddingLoopLabel)
+                        self.emitter.label(afterPaddingLoopLabel)
 
                     loopLabel = self.getLabel() + "_out_loop"
                     afterLoopLabel = self.getLabel() + "_after_out_loop"
 
-                    c += "ldc a 1\nind a\n"
-                    c += "{0}:\n".format(loopLabel)
-                    c += "\ndpl a\nind c\n"
-                    c += "ldc c 27\nneq c\nfjp {0}\n".format(afterLoopLabel)
-                    c += "dpl a\nind c\nout c\n" # print character
-                    c += "inc a 1\n"
-                    c += "ujp {0}\n".format(loopLabel)
-                    c += "{0}:\n".format(afterLoopLabel)
-
-                    self.outFile.write(b)
-                    self._lvalue.append(False)
-                    node.accept(self)
-                    self._lvalue.pop()
-                    self.outFile.write(c)
+                    self.emitter.emit("ldc", "a", 1)
+                    self.emitter.emit("ind", "a")
+                    self.emitter.label(loopLabel)
+                    self.emitter.emit("dpl", "a")
+                    self.emitter.emit("ind", "c")
+                    self.emitter.emit("ldc", "c", 27)
+                    self.emitter.emit("neq", "c")
+                    self.emitter.emit("fjp", afterLoopLabel)
+                    self.emitter.emit("dpl", "a") # print character
+                    self.emitter.emit("ind", "c")
+                    self.emitter.emit("out", "c")
+                    self.emitter.emit("inc", "a", 1)
+                    self.emitter.emit("ujp", loopLabel)
+                    self.emitter.label(afterLoopLabel)
 
 
                 elif isinstance(node, ASTNode) and not node.getType().equals(TYPES["void"]):
                     self._lvalue.append(False)
                     node.accept(self)
                     self._lvalue.pop()
-                    self.outFile.write("out {0}\n".format(self.pType(node.getType())))
+                    self.emitter.emit("out", self.pType(node.getType()))
 
     def scanf(self, node):
         for el in node.parsedFormat:
@@ -588,20 +656,25 @@ class VisitorCodeGenerator(Visitor):
                     node.accept(self)
                     self._lvalue.pop()
 
-                    self.outFile.write("{0}:\n".format(loopLabel))
-                    self.outFile.write("dpl a\nin c\n") # accept input
-                    self.outFile.write("sto c\n") # store it
-                    self.outFile.write("dpl a\nind c\nldc c 27\nneq c\nfjp {0}\n".format(doneLabel)) # if read character != 27 (escape character)
-                    self.outFile.write("inc a 1\n") # increment address
-                    self.outFile.write("ujp {0}\n".format(loopLabel))
-                    self.outFile.write("{0}:\n".format(doneLabel))
+                    self.emitter.label(loopLabel)
+                    self.emitter.emit("dpl", "a") # accept input
+                    self.emitter.emit("in", "c")
+                    self.emitter.emit("sto", "c") # store it
+                    self.emitter.emit("dpl", "a") # if read character != 27 (escape character)
+                    self.emitter.emit("ind", "c")
+                    self.emitter.emit("ldc", "c", 27)
+                    self.emitter.emit("neq", "c")
+                    self.emitter.emit("fjp", doneLabel)
+                    self.emitter.emit("inc", "a", 1) # increment address
+                    self.emitter.emit("ujp", loopLabel)
+                    self.emitter.label(doneLabel)
 
                 elif isinstance(node, ASTNode):
                     self._lvalue.append(False)
                     node.accept(self)
                     self._lvalue.pop()
-                    self.outFile.write("in {0}\n".format(self.pType(node.getType().dereference())))
-                    self.outFile.write("sto {0}\n".format(self.pType(node.getType().dereference())))
+                    self.emitter.emit("in", self.pType(node.getType().dereference()))
+                    self.emitter.emit("sto", self.pType(node.getType().dereference()))
 
     def visitFunctionCallNode(self, node):
         if node.definitionNode.isStdioFunction:
@@ -612,20 +685,20 @@ class VisitorCodeGenerator(Visitor):
         else:
             functionSymbol = self.symbolTable.retrieveSymbol(node.identifier)
             # organizational block
-            self.outFile.write("mst {0}\n".format(functionSymbol.depth))
+            self.emitter.emit("mst", functionSymbol.depth)
 
             # evaluate arguments
             self.visitChildren(node)
 
             # call user procedure
-            self.outFile.write("cup {0} function_{1}\n".format(len(node.children[0].children), node.definitionNode.identifier))
+            self.emitter.emit("cup", len(node.children[0].children), "function_" + node.definitionNode.identifier)
 
 
     def visitTypeCastNode(self, node):
         self.visitChildren(node)
 
         if self.rvalue() and self.pType(node.children[0].getType()) != self.pType(node.getType()):
-            self.outFile.write("conv {0} {1}\n".format(self.pType(node.children[0].getType()), self.pType(node.getType())))
+            self.emitter.emit("conv", self.pType(node.children[0].getType()), self.pType(node.getType()))
 
 
     def visitTernaryConditionalOperatorNode(self, node):
@@ -636,32 +709,32 @@ class VisitorCodeGenerator(Visitor):
         # children of a = b: [ASTVariableNode, ExpressionNode]
         self._lvalue.append(True)
         node.children[0].accept(self)
-        self.outFile.write("dpl a\n") # duplicate the address to load it after the assignment
+        self.emitter.emit("dpl", "a") # duplicate the address to load it after the assignment
 
         self._lvalue[-1] = False
         node.children[1].accept(self)
         self._lvalue.pop()
 
-        self.outFile.write("sto {0}\n".format(self.pType(node.children[0].getType())))
-        self.outFile.write("ind {0}\n".format(self.pType(node.children[0].getType())))
+        self.emitter.emit("sto", self.pType(node.children[0].getType()))
+        self.emitter.emit("ind", self.pType(node.children[0].getType()))
 
 
     def visitLogicOperatorNode(self, node):
         self._lvalue.append(False)
         node.children[0].accept(self)
-        self.outFile.write("conv i b\n")
+        self.emitter.emit("conv", "i", "b")
         node.children[1].accept(self)
-        self.outFile.write("conv i b\n")
-        self.outFile.write(str(node.logicOperatorType) + "\n")
-        self.outFile.write("conv b i\n")
+        self.emitter.emit("conv", "i", "b")
+        self.emitter.emit(str(node.logicOperatorType))
+        self.emitter.emit("conv", "b", "i")
         self._lvalue.pop()
 
 
     def visitComparisonOperatorNode(self, node):
         self._lvalue.append(False)
         self.visitChildren(node)
-        self.outFile.write("{0} {1}\n".format(self.bin_comp_op[str(node.comparisonType)], self.pType(node.children[0].getType())))
-        self.outFile.write("conv b i\n")
+        self.emitter.emit(self.bin_comp_op[str(node.comparisonType)], self.pType(node.children[0].getType()))
+        self.emitter.emit("conv", "b", "i")
         self._lvalue.pop()
 
 
@@ -673,7 +746,8 @@ class VisitorCodeGenerator(Visitor):
         self.visitChildren(node)
         self._lvalue.pop()
         if op == "++" or op == "--":
-            self.outFile.write("dpl a\ndpl a\n")
+            self.emitter.emit("dpl", "a")
+            self.emitter.emit("dpl", "a")
             maininstr = "inc"
             secinstr = "dec"
             if op == "--":
@@ -681,23 +755,23 @@ class VisitorCodeGenerator(Visitor):
 
             # a++;      aPtr++;
 
-            self.outFile.write("ind {0}\n".format(self.pType(ttype)))
+            self.emitter.emit("ind", self.pType(ttype))
             if ttype.isPointer():
-                self.outFile.write("conv a i\n")
-            self.outFile.write("{0} {1} {2}\n".format(maininstr, *((self.pType(ttype), 1) if not ttype.isPointer() else ("i", str(ttype.dereference().size())))))
+                self.emitter.emit("conv", "a", "i")
+            self.emitter.emit(maininstr, *((self.pType(ttype), 1) if not ttype.isPointer() else ("i", str(ttype.dereference().size()))))
             if ttype.isPointer():
-                self.outFile.write("conv i a\n")
-            self.outFile.write("sto {0}\n".format(self.pType(ttype)))
-            self.outFile.write("ind {0}\n".format(self.pType(ttype)))
+                self.emitter.emit("conv", "i", "a")
+            self.emitter.emit("sto", self.pType(ttype))
+            self.emitter.emit("ind", self.pType(ttype))
             if node.operatorType == ASTUnaryOperatorNode.Type["postfix"]:
                 if ttype.isPointer():
-                    self.outFile.write("conv a i\n")
-                self.outFile.write("{0} {1} {2}\n".format(secinstr, *((self.pType(ttype), 1) if not ttype.isPointer() else ("i", str(ttype.dereference().size())))))
+                    self.emitter.emit("conv", "a", "i")
+                self.emitter.emit(secinstr, *((self.pType(ttype), 1) if not ttype.isPointer() else ("i", str(ttype.dereference().size()))))
                 if ttype.isPointer():
-                    self.outFile.write("conv i a\n")
+                    self.emitter.emit("conv", "i", "a")
 
         if op == "-":
-            self.outFile.write("neg {0}\n".format(self.pType(ttype)))
+            self.emitter.emit("neg", self.pType(ttype))
         elif op == "+":
             pass
 
@@ -717,16 +791,16 @@ class VisitorCodeGenerator(Visitor):
         self._lvalue.pop()
 
         if self.rvalue():
-            self.outFile.write("ind {0}\n".format(self.pType(node.getType())))
+            self.emitter.emit("ind", self.pType(node.getType()))
 
 
     def visitLogicalNotOperatorNode(self, node):
         self._lvalue.append(False)
         self.visitChildren(node)
         self._lvalue.pop()
-        self.outFile.write("conv i b\n")
-        self.outFile.write("not\n")
-        self.outFile.write("conv b i\n")
+        self.emitter.emit("conv", "i", "b")
+        self.emitter.emit("not")
+        self.emitter.emit("conv", "b", "i")
 
 
     def visitArraySubscriptNode(self, node):
@@ -736,18 +810,18 @@ class VisitorCodeGenerator(Visitor):
         self._lvalue.append(True)
         node.children[0].accept(self)
         if arrayType.isPointer():
-            self.outFile.write("ind a\n")
+            self.emitter.emit("ind", "a")
         self._lvalue[-1] = False
         node.children[1].accept(self)
         self._lvalue.pop()
 
         if not arrayType.isPointer():
-            self.outFile.write("chk 0 {0}\n".format(arrayType.size() - 1))
+            self.emitter.emit("chk", 0, arrayType.size() - 1)
 
-        self.outFile.write("ixa {0}\n".format(arrayElementType.size()))
+        self.emitter.emit("ixa", arrayElementType.size())
 
         if self.rvalue():
-            self.outFile.write("ind {0}\n".format(self.pType(node.getType())))
+            self.emitter.emit("ind", self.pType(node.getType()))
 
 
     def visitBinaryArithmeticNode(self, node):
@@ -756,36 +830,36 @@ class VisitorCodeGenerator(Visitor):
         self._lvalue.append(False)
         if node.arithmeticType == ASTBinaryArithmeticOperatorNode.ArithmeticType["modulo"]:
             node.children[0].accept(self)
-            self.outFile.write("dpl i\n")
-            self.outFile.write("ldc a 0\n")
+            self.emitter.emit("dpl", "i")
+            self.emitter.emit("ldc", "a", 0)
             node.children[1].accept(self)
-            self.outFile.write("sto i\n" +\
-                               "ldc a 0\n"+\
-                               "ind i\n" +\
-                               "div i\n" +\
-                               "ldc a 0\n" +\
-                               "ind i\n" +\
-                               "mul i\n" +\
-                               "sub i\n")
+            self.emitter.emit("sto", "i")
+            self.emitter.emit("ldc", "a", 0)
+            self.emitter.emit("ind", "i")
+            self.emitter.emit("div", "i")
+            self.emitter.emit("ldc", "a", 0)
+            self.emitter.emit("ind", "i")
+            self.emitter.emit("mul", "i")
+            self.emitter.emit("sub", "i")
         elif t1.isPointer() or t2.isPointer():
             # pointer arithmetic
             pointerType, integerType = (t1, t2) if t1.isPointer() else (t2, t1)
 
-            pointerCode = "conv a i\n"
-            integerCode = "ldc i {0}\n".format(pointerType.dereference().size())
-            integerCode += "mul i\n"
-
-            node.children[0].accept(self)
-            self.outFile.write(pointerCode if t1 is pointerType else integerCode)
-            node.children[1].accept(self)
-            self.outFile.write(pointerCode if t2 is pointerType else integerCode)
+            for child, childType in zip(node.children, (t1, t2)):
+                child.accept(self)
+                if childType is pointerType:
+                    self.emitter.emit("conv", "a", "i")
+                else:
+                    # the integer is a number of elements
+                    self.emitter.emit("ldc", "i", pointerType.dereference().size())
+                    self.emitter.emit("mul", "i")
 
-            self.outFile.write("{0} i\n".format(self.bin_arithm_op[str(node.arithmeticType)]))
-            self.outFile.write("conv i a\n")
+            self.emitter.emit(self.bin_arithm_op[str(node.arithmeticType)], "i")
+            self.emitter.emit("conv", "i", "a")
 
         else:
             self.visitChildren(node)
-            self.outFile.write("{0} {1}\n".format(self.bin_arithm_op[str(node.arithmeticType)], self.pType(node.children[0].getType())))
+            self.emitter.emit(self.bin_arithm_op[str(node.arithmeticType)], self.pType(node.children[0].getType()))
         self._lvalue.pop()
 
 def expressionResultNeedsToBeCleanedUp(node):
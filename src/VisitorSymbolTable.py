@@ -1,4 +1,3 @@
-from antlr4 import *
 from AbstractSyntaxTree import *
 from Visitor import *
 
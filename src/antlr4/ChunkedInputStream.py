@@ -0,0 +1,119 @@
+#
+#  An InputStream that reads a file object (e.g. sys.stdin) in chunks while
+#  it is being lexed, and only keeps a window of the characters that can still
+#  be looked at: those from the start of the token the lexer is matching.
+#  The lexer marks that start with mark() and releases it with release(), the
+#  window is cut after the release. As the characters of a token are gone once
+#  the lexer has moved on, its text has to be copied into the token, which
+#  TextCopyingTokenFactory does.
+#
+
+import codecs
+from antlr4.InputStream import InputStream
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Token import Token
+
+
+class ChunkedInputStream(InputStream):
+
+    def __init__(self, file, chunkSize:int=65536, encoding:str='ascii', textFile=None):
+        self.name = getattr(file, "name", "<stream>")
+        self.file = file
+        self.chunkSize = chunkSize
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        # the characters window[0:] are those at windowStart and after
+        self.window = ""
+        self.windowStart = 0
+        self.eof = False
+        self.marks = 0
+        self._index = 0
+        # every chunk is also written to textFile (e.g. a temporary file) if it is given, to show the source lines
+        # in messages afterwards without keeping all of the text in memory
+        self.textFile = textFile
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def size(self):
+        # the number of characters read so far, the size of the input once it has all been read
+        return self.windowStart + len(self.window)
+
+    def load(self, index:int):
+        # reads chunks until the character at index is in the window or the input ends
+        while index >= self.windowStart + len(self.window) and not self.eof:
+            chunk = self.file.read(self.chunkSize)
+            if not chunk:
+                self.eof = True
+            if isinstance(chunk, bytes):
+                chunk = self.decoder.decode(chunk, final=self.eof)
+            if self.textFile is not None:
+                self.textFile.write(chunk)
+            self.window += chunk
+
+    def reset(self):
+        self.seek(0)
+
+    def consume(self):
+        if self.LA(1) == Token.EOF:
+            raise Exception("cannot consume EOF")
+        self._index += 1
+
+    def LA(self, offset:int):
+        # most characters that are looked at are already in the window
+        pos = self._index + offset - 1 - self.windowStart
+        if offset > 0 and 0 <= pos < len(self.window):
+            return ord(self.window[pos])
+
+        if offset==0:
+            return 0 # undefined
+        if offset<0:
+            offset += 1 # e.g., translate LA(-1) to use offset=0
+        pos = self._index + offset - 1
+        if pos < self.windowStart:
+            raise IndexError("character " + str(pos) + " is no longer in the window of the stream")
+        if pos >= self.windowStart + len(self.window):
+            self.load(pos)
+            if pos >= self.windowStart + len(self.window):
+                return Token.EOF
+        return ord(self.window[pos - self.windowStart])
+
+    def mark(self):
+        self.marks += 1
+        return -self.marks
+
+    def release(self, marker:int):
+        self.marks -= 1
+        # nothing before the current character can be looked at anymore, the window is only cut
+        # when that is more than a chunk, so the characters are not copied for every token
+        if self.marks == 0 and self._index - self.windowStart > self.chunkSize:
+            self.window = self.window[self._index - self.windowStart:]
+            self.windowStart = self._index
+
+    def seek(self, _index:int):
+        if _index < self.windowStart:
+            raise IndexError("cannot seek to " + str(_index) + ", it is no longer in the window of the stream")
+        self.load(_index)
+        self._index = min(_index, self.size)
+
+    def getText(self, start:int, stop:int):
+        if start < self.windowStart:
+            raise IndexError("the text at " + str(start) + " is no longer in the window of the stream")
+        self.load(stop)
+        return self.window[start - self.windowStart:stop - self.windowStart + 1]
+
+    def __str__(self):
+        return self.window
+
+
+class TextCopyingTokenFactory(CommonTokenFactory):
+    # copies the text of every token but EOF into the token, EOF keeps its "<EOF>" text
+
+    def create(self, source:tuple, type:int, text:str, channel:int, start:int, stop:int, line:int, column:int):
+        if text is None and type != Token.EOF:
+            text = source[1].getText(start, stop)
+        return super().create(source, type, text, channel, start, stop, line, column)
+
+
+TextCopyingTokenFactory.DEFAULT = TextCopyingTokenFactory()
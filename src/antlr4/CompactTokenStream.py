@@ -0,0 +1,253 @@
+#
+#  A CommonTokenStream that does not keep a CommonToken object per token.
+#  The fields of the tokens are stored in parallel arrays (one per field),
+#  and get(), LT() and the tokens list hand out CompactToken views that read
+#  those arrays. A view is only made for a token that is asked for, and then
+#  kept, so the parse tree shares it. LA() reads the type array directly, so
+#  predicting the next alternative does not create any token objects at all.
+#
+#  With onChannelOnly, tokens that are not on the channel of the stream are
+#  dropped as they come from the lexer instead of being buffered, so LT(k)
+#  is a plain index without skipping over them. Their line and column are
+#  still counted by the lexer, but getHiddenTokensToLeft/Right find nothing.
+#
+
+from array import array
+from antlr4.Token import Token, CommonToken
+from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.Lexer import Lexer
+from antlr4.error.Errors import IllegalStateException
+
+
+class CompactToken(CommonToken):
+    # a view of token tokenIndex in columns, it behaves like the CommonToken it was made from
+
+    __slots__ = ('columns', 'tokenIndex')
+
+    def __init__(self, columns, tokenIndex:int):
+        self.columns = columns
+        self.tokenIndex = tokenIndex
+
+    @property
+    def type(self):
+        return self.columns.types[self.tokenIndex]
+
+    @property
+    def channel(self):
+        return self.columns.channels[self.tokenIndex]
+
+    @property
+    def start(self):
+        return self.columns.starts[self.tokenIndex]
+
+    @property
+    def stop(self):
+        return self.columns.stops[self.tokenIndex]
+
+    @property
+    def line(self):
+        return self.columns.lines[self.tokenIndex]
+
+    @property
+    def column(self):
+        return self.columns.columns[self.tokenIndex]
+
+    @property
+    def source(self):
+        return self.columns.sources.get(self.tokenIndex, self.columns.source)
+
+    @property
+    def _text(self):
+        return self.columns.texts.get(self.tokenIndex)
+
+    @_text.setter
+    def _text(self, text:str):
+        self.columns.texts[self.tokenIndex] = text
+
+
+class TokenColumns(object):
+    # the tokens of a stream as a sequence, stored as one array per field
+
+    def __init__(self):
+        self.types    = array('i')
+        self.channels = array('i')
+        self.starts   = array('q')
+        self.stops    = array('q')
+        self.lines    = array('i')
+        self.columns  = array('i')
+        # the (lexer, input stream) pair shared by all tokens of a lexer
+        self.source   = None
+        # the sources of the tokens that have another source, and the text set explicitly on a token
+        # (instead of taken from the input), by token index
+        self.sources  = dict()
+        self.texts    = dict()
+        # the views that were handed out, by token index
+        self.views    = []
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index:int):
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        view = self.views[index]
+        if view is None:
+            view = self.views[index] = CompactToken(self, index)
+        return view
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self[index]
+
+    def append(self, token:Token):
+        if self.source is None:
+            self.source = token.source
+        elif token.source != self.source:
+            self.sources[len(self.types)] = token.source
+        if token._text is not None:
+            self.texts[len(self.types)] = token._text
+        self.appendFields(token.type, token.channel, token.start, token.stop, token.line, token.column)
+
+    def appendFields(self, type:int, channel:int, start:int, stop:int, line:int, column:int):
+        self.types.append(type)
+        self.channels.append(channel)
+        self.starts.append(start)
+        self.stops.append(stop)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.views.append(None)
+
+
+class CompactTokenStream(CommonTokenStream):
+
+    def __init__(self, lexer:Lexer, channel:int=Token.DEFAULT_CHANNEL, onChannelOnly:bool=False):
+        super().__init__(lexer, channel)
+        self.tokens = TokenColumns()
+        self.onChannelOnly = onChannelOnly
+
+    def setTokenSource(self, tokenSource:Lexer):
+        super().setTokenSource(tokenSource)
+        self.tokens = TokenColumns()
+
+    def fetch(self, n:int):
+        if self.fetchedEOF:
+            return 0
+
+        tokens = self.tokens
+        # a token source with nextTokenFields() gives the fields without creating a token
+        nextTokenFields = getattr(self.tokenSource, "nextTokenFields", None)
+        if nextTokenFields is not None and tokens.source is None:
+            tokens.source = self.tokenSource._tokenFactorySourcePair
+
+        i = 0
+        while i < n:
+            if nextTokenFields is not None:
+                fields = nextTokenFields()
+                if self.onChannelOnly and fields[1]!=self.channel and fields[0]!=Token.EOF:
+                    continue
+                tokens.appendFields(*fields)
+            else:
+                token = self.tokenSource.nextToken()
+                if self.onChannelOnly and token.channel!=self.channel and token.type!=Token.EOF:
+                    continue
+                tokens.append(token)
+            i += 1
+            if tokens.types[-1]==Token.EOF:
+                self.fetchedEOF = True
+                return i
+        return n
+
+    def nextTokenOnChannel(self, i:int, channel:int):
+        types = self.tokens.types
+        channels = self.tokens.channels
+        if i < len(types) and channels[i]==channel:
+            return i
+        self.sync(i)
+        if i>=len(types):
+            return -1
+        while channels[i]!=channel:
+            if types[i]==Token.EOF:
+                return -1
+            i += 1
+            self.sync(i)
+        return i
+
+    def previousTokenOnChannel(self, i:int, channel:int):
+        channels = self.tokens.channels
+        while i>=0 and channels[i]!=channel:
+            i -= 1
+        return i
+
+    def lookIndex(self, k:int):
+        # the index of LT(k), or None
+        self.lazyInit()
+        if k == 0:
+            return None
+        if k == 1:
+            return self.index
+        if self.onChannelOnly:
+            # every buffered token is on channel
+            if k < 0:
+                return None if (self.index+k)<0 else self.index+k
+            i = self.index + k - 1
+            self.sync(i)
+            return min(i, len(self.tokens.types) - 1)
+        if k < 0:
+            if (self.index+k)<0:
+                return None
+            i = self.index
+            for n in range(0, -k):
+                i = self.previousTokenOnChannel(i - 1, self.channel)
+            return None if i < 0 else i
+        i = self.index
+        for n in range(1, k):
+            # skip off-channel tokens, but make sure to not look past EOF
+            if self.sync(i + 1):
+                i = self.nextTokenOnChannel(i + 1, self.channel)
+        return i
+
+    def LT(self, k:int):
+        if k == 1 and self.index >= 0:
+            i = self.index
+        else:
+            i = self.lookIndex(k)
+            if i is None:
+                return None
+        view = self.tokens.views[i]
+        if view is None:
+            view = self.tokens.views[i] = CompactToken(self.tokens, i)
+        return view
+
+    def LB(self, k:int):
+        return self.LT(-k)
+
+    def LA(self, k:int):
+        if k == 1 and self.index >= 0:
+            return self.tokens.types[self.index]
+        return self.tokens.types[self.lookIndex(k)]
+
+    # sync() and consume() are called for every token, they are the ones of BufferedTokenStream with
+    # len(self.tokens.types) instead of len(self.tokens)
+
+    def sync(self, i:int):
+        n = i - len(self.tokens.types) + 1 # how many more elements we need?
+        if n > 0 :
+            fetched = self.fetch(n)
+            return fetched >= n
+        return True
+
+    def consume(self):
+        types = self.tokens.types
+        if self.index >= 0:
+            # the last token is EOF when fetchedEOF is set, otherwise every fetched token can be consumed
+            skipEofCheck = self.index < len(types) - 1 if self.fetchedEOF else self.index < len(types)
+        else:
+            skipEofCheck = False
+
+        if not skipEofCheck and self.LA(1) == Token.EOF:
+            raise IllegalStateException("cannot consume EOF")
+
+        if self.sync(self.index + 1):
+            self.index = self.adjustSeekIndex(self.index + 1)
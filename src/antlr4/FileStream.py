@@ -35,7 +35,6 @@
 # 
 
 import codecs
-import unittest
 from antlr4.InputStream import InputStream
 
 
@@ -50,10 +49,3 @@ class FileStream(InputStream):
         with open(fileName, 'rb') as file:
             bytes = file.read()
             return codecs.decode(bytes, encoding)
-
-
-class TestFileStream(unittest.TestCase):
-
-    def testStream(self):
-        stream = FileStream(__file__)
-        self.assertTrue(stream.size>0)
\ No newline at end of file
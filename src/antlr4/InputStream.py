@@ -28,7 +28,6 @@
 #   (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 #   THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # 
-import unittest
 
 
 # 
@@ -110,21 +109,3 @@ class InputStream (object):
     
     def __str__(self):
         return self.strdata
-
-
-class TestInputStream(unittest.TestCase):
-    
-    def testStream(self):
-        stream = InputStream("abcde")
-        self.assertEqual(0, stream.index)
-        self.assertEqual(5, stream.size)
-        self.assertEqual(ord("a"), stream.LA(1))
-        stream.consume()
-        self.assertEqual(1, stream.index)
-        stream.seek(5)
-        self.assertEqual(Token.EOF, stream.LA(1))
-        self.assertEqual("bcd", stream.getText(1, 3))
-        stream.reset()
-        self.assertEqual(0, stream.index)
-        
-        
\ No newline at end of file
@@ -0,0 +1,89 @@
+#
+#  An InputStream over a memory mapped file. The symbols are read straight
+#  from the mapping through a memoryview when the file is ASCII (or Latin-1),
+#  so the file is never decoded into a str or copied into a list of ints.
+#  Files with other characters are decoded once into an array of code points.
+#
+
+import array
+import codecs
+import mmap
+import re
+import sys
+from antlr4.InputStream import InputStream
+
+
+NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+# encodings in which a file without bytes above 127 is ASCII
+ASCII_COMPATIBLE = ['ascii', 'utf-8', 'iso8859-1', 'cp1252']
+
+# the encoding whose bytes are the code points of an array('I') on this machine
+WIDE_ENCODING = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+class MappedFileStream(InputStream):
+
+    def __init__(self, fileName:str, encoding:str='ascii'):
+        self.name = "<empty>"
+        self.fileName = fileName
+        self.encoding = encoding
+        self._text = None
+        self._index = 0
+        self._load(fileName, encoding)
+
+    def _load(self, fileName:str, encoding:str):
+        self._mmap = None
+        with open(fileName, 'rb') as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                buffer = self._mmap
+            except (ValueError, OSError):
+                # empty files and pipes can't be mapped
+                buffer = file.read()
+
+        name = codecs.lookup(encoding).name
+        if name == 'iso8859-1' or (name in ASCII_COMPATIBLE and NON_ASCII.search(buffer) is None):
+            # every byte is a symbol
+            self._wide = False
+            self.data = memoryview(buffer)
+        else:
+            # raises UnicodeDecodeError like FileStream does when the file does not match the encoding
+            text = codecs.decode(buffer, encoding)
+            self._wide = True
+            self.data = array.array('I')
+            self.data.frombytes(text.encode(WIDE_ENCODING))
+            del text
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+        self._size = len(self.data)
+
+    @property
+    def strdata(self):
+        if self._text is None:
+            self._text = self._decode(0, self._size)
+        return self._text
+
+    def _decode(self, start:int, stop:int):
+        if self._wide:
+            return self.data[start:stop].tobytes().decode(WIDE_ENCODING)
+        return codecs.decode(self.data[start:stop], 'latin-1')
+
+    def getText(self, start :int, stop: int):
+        if stop >= self._size:
+            stop = self._size-1
+        if start >= self._size:
+            return ""
+        elif self._text is not None:
+            return self._text[start:stop+1]
+        else:
+            return self._decode(start, stop+1)
+
+    def close(self):
+        # only needed to release the mapping before the stream is garbage collected
+        if self._mmap is not None:
+            self.data.release()
+            self._mmap.close()
+            self._mmap = None
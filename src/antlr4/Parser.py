@@ -39,7 +39,6 @@ from antlr4.Lexer import Lexer
 from antlr4.atn.ATNDeserializer import ATNDeserializer
 from antlr4.atn.ATNDeserializationOptions import ATNDeserializationOptions
 from antlr4.error.Errors import UnsupportedOperationException, RecognitionException
-from antlr4.tree.ParseTreePatternMatcher import ParseTreePatternMatcher
 from antlr4.tree.Tree import ParseTreeListener, TerminalNode, ErrorNode
 
 class TraceListener(ParseTreeListener):
@@ -293,6 +292,8 @@ class Parser (Recognizer):
         if lexer is None:
             raise UnsupportedOperationException("Parser can't discover a lexer to use")
 
+        # the pattern matcher is rarely used, so it is only imported on demand
+        from antlr4.tree.ParseTreePatternMatcher import ParseTreePatternMatcher
         m = ParseTreePatternMatcher(lexer, self)
         return m.compile(pattern, patternRuleIndex)
 
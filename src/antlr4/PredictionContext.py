@@ -35,6 +35,7 @@ from antlr4.atn.ATNState import ATNState
 
 
 class PredictionContext(object):
+    __slots__ = ('cachedHashCode',)
 
     # Represents {@code $} in local context prediction, which means wildcard.
     # {@code#+x =#}.
@@ -129,6 +130,7 @@ class PredictionContextCache(object):
 
 
 class SingletonPredictionContext(PredictionContext):
+    __slots__ = ('parentCtx', 'returnState')
 
     @staticmethod
     def create(parent:PredictionContext , returnState:int ):
@@ -178,6 +180,7 @@ class SingletonPredictionContext(PredictionContext):
 
 
 class EmptyPredictionContext(SingletonPredictionContext):
+    __slots__ = ()
 
     def __init__(self):
         super().__init__(None, self.EMPTY_RETURN_STATE)
@@ -198,6 +201,7 @@ class EmptyPredictionContext(SingletonPredictionContext):
 PredictionContext.EMPTY = EmptyPredictionContext()
 
 class ArrayPredictionContext(PredictionContext):
+    __slots__ = ('parents', 'returnStates')
     # Parent can be null only if full ctx mode and we make an array
     #  from {@link #EMPTY} and non-empty. We merge {@link #EMPTY} by using null parent and
     #  returnState == {@link #EMPTY_RETURN_STATE}.
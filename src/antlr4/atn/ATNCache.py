@@ -0,0 +1,94 @@
+#
+# A cache of deserialized ATNs, comparable to python's own __pycache__.
+#
+# Deserializing the ATN of a generated recognizer decodes the whole serialized
+# string, creates every ATN state and transition and verifies the result each
+# time the recognizer is imported. The first time an ATN is deserialized, the
+# resulting object graph is pickled to antlr4/__atncache__/, and later imports
+# load that pickle instead.
+#
+# The cache file is named after a hash of the serialized ATN, of the
+# deserialization options and of the source of the runtime classes in the
+# pickle, so a changed grammar or a changed ATN class (e.g. other __slots__)
+# never loads an old ATN. Any problem while reading or writing the cache falls
+# back to deserializing.
+#/
+import glob
+import hashlib
+import os
+import pickle
+import sys
+
+RUNTIME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CACHE_DIR = os.path.join(RUNTIME_DIR, "__atncache__")
+
+# pickling follows the transitions between ATN states recursively
+PICKLE_RECURSION_LIMIT = 20000
+
+runtimeHashValue = None
+
+
+def runtimeSources():
+    # the modules of the classes an ATN is made of: the ATN states, transitions and lexer actions in antlr4/atn and
+    # the IntervalSets of the transitions
+    filenames  = glob.glob(os.path.join(RUNTIME_DIR, "atn", "*.py"))
+    filenames += [os.path.join(RUNTIME_DIR, "IntervalSet.py")]
+    return sorted(filenames)
+
+
+def runtimeHash():
+    # hash of the runtime sources, so a pickled ATN is only loaded by the classes that pickled it
+    global runtimeHashValue
+
+    if runtimeHashValue is None:
+        sha = hashlib.sha256()
+        for filename in runtimeSources():
+            sha.update(os.path.relpath(filename, RUNTIME_DIR).encode("utf-8"))
+            with open(filename, "rb") as file:
+                sha.update(file.read())
+        runtimeHashValue = sha.hexdigest()
+
+    return runtimeHashValue
+
+
+def cacheFilename(data:str, options):
+    sha = hashlib.sha256()
+    sha.update(runtimeHash().encode("utf-8"))
+    sha.update(str((sys.version_info[:2], options.verifyATN, options.generateRuleBypassTransitions)).encode("utf-8"))
+    sha.update(data.encode("utf-8", "surrogatepass"))
+    return os.path.join(CACHE_DIR, sha.hexdigest() + ".pickle")
+
+
+def loadATN(filename:str):
+    try:
+        with open(filename, "rb") as file:
+            return pickle.load(file)
+    except Exception:
+        return None
+
+
+def saveATN(filename:str, atn):
+    # follow the same rules as the bytecode cache
+    if sys.dont_write_bytecode:
+        return
+
+    # only needed when the cache is written, not by every import of a recognizer
+    import tempfile
+
+    recursionLimit = sys.getrecursionlimit()
+    try:
+        sys.setrecursionlimit(max(recursionLimit, PICKLE_RECURSION_LIMIT))
+        data = pickle.dumps(atn, protocol=pickle.HIGHEST_PROTOCOL)
+
+        directory = os.path.dirname(filename)
+        os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first so other processes never read a half written file
+        fd, tmpFilename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmpFilename, filename)
+    except (OSError, RecursionError, pickle.PicklingError):
+        pass
+    finally:
+        sys.setrecursionlimit(recursionLimit)
@@ -46,6 +46,8 @@ from antlr4.atn.SemanticContext import SemanticContext
 ATNConfig = None
 
 class ATNConfig(object):
+    # prediction creates a lot of configurations, they have no __dict__
+    __slots__ = ('state', 'alt', 'context', 'semanticContext', 'reachesIntoOuterContext', 'precedenceFilterSuppressed', 'cachedHashCode')
 
     def __init__(self, state:ATNState=None, alt:int=None, context:PredictionContext=None, semantic:SemanticContext=None, config:ATNConfig=None):
         if config is not None:
@@ -80,6 +82,9 @@ class ATNConfig(object):
         # accurate depth since I don't ever decrement. TODO: make it a boolean then
         self.reachesIntoOuterContext = 0 if config is None else config.reachesIntoOuterContext
         self.precedenceFilterSuppressed = False if config is None else config.precedenceFilterSuppressed
+        # The hash code of (state, alt, context, semanticContext), computed when it is first needed. Whoever
+        # replaces the context of a configuration (see ATNConfigSet) resets it to None.
+        self.cachedHashCode = None
 
     # An ATN configuration is equal to another if both have
     #  the same state, they predict the same alternative, and
@@ -98,7 +103,9 @@ class ATNConfig(object):
                 and self.precedenceFilterSuppressed==other.precedenceFilterSuppressed
 
     def __hash__(self):
-        return hash((self.state.stateNumber, self.alt, self.context, self.semanticContext))
+        if self.cachedHashCode is None:
+            self.cachedHashCode = hash((self.state.stateNumber, self.alt, self.context, self.semanticContext))
+        return self.cachedHashCode
 
     def __str__(self):
         with StringIO() as buf:
@@ -123,6 +130,7 @@ class ATNConfig(object):
 LexerATNConfig = None
 
 class LexerATNConfig(ATNConfig):
+    __slots__ = ('lexerActionExecutor', 'passedThroughNonGreedyDecision')
 
     def __init__(self, state:ATNState, alt:int=None, context:PredictionContext=None, semantic:SemanticContext=SemanticContext.NONE,
                  lexerActionExecutor:LexerActionExecutor=None, config:LexerATNConfig=None):
@@ -135,9 +143,11 @@ class LexerATNConfig(ATNConfig):
         self.passedThroughNonGreedyDecision = False if config is None else self.checkNonGreedyDecision(config, state)
 
     def __hash__(self):
-        return hash((self.state.stateNumber, self.alt, self.context,
+        if self.cachedHashCode is None:
+            self.cachedHashCode = hash((self.state.stateNumber, self.alt, self.context,
                 self.semanticContext, self.passedThroughNonGreedyDecision,
                 self.lexerActionExecutor))
+        return self.cachedHashCode
 
     def __eq__(self, other):
         if self is other:
@@ -44,6 +44,9 @@ from antlr4.error.Errors import UnsupportedOperationException, IllegalStateExcep
 ATNSimulator = None
 
 class ATNConfigSet(object):
+    __slots__ = ('configLookup', 'fullCtx', 'readonly', 'configs', 'uniqueAlt', 'conflictingAlts', 'hasSemanticContext',
+                 'dipsIntoOuterContext', 'cachedHashCode')
+
     #
     # The reason that we need this is because we don't want the hash map to use
     # the standard hash code and equals. We need all configurations with the same
@@ -115,20 +118,25 @@ class ATNConfigSet(object):
         if config.precedenceFilterSuppressed:
             existing.precedenceFilterSuppressed = True
         existing.context = merged # replace context; no need to alt mapping
+        existing.cachedHashCode = None
         return True
 
+    # configLookup maps a hash code to the one config that has it or, only
+    # when several do, to a list of them
     def getOrAdd(self, config:ATNConfig):
         h = hash(config)
         l = self.configLookup.get(h, None)
-        if l is not None:
+        if l is None:
+            self.configLookup[h] = config
+        elif type(l) is list:
             for c in l:
                 if c==config:
                     return c
-        if l is None:
-            l = [config]
-            self.configLookup[h] = l
-        else:
             l.append(config)
+        elif l==config:
+            return l
+        else:
+            self.configLookup[h] = [l, config]
         return config
 
     def getStates(self):
@@ -200,7 +208,9 @@ class ATNConfigSet(object):
             raise UnsupportedOperationException("This method is not implemented for readonly sets.")
         h = hash(config)
         l = self.configLookup.get(h, None)
-        return l is not None and config in l
+        if type(l) is list:
+            return config in l
+        return l is not None and l==config
 
     def clear(self):
         if self.readonly:
@@ -231,6 +241,7 @@ class ATNConfigSet(object):
 
 
 class OrderedATNConfigSet(ATNConfigSet):
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
@@ -30,6 +30,7 @@
 from uuid import UUID
 from io import StringIO
 from antlr4.Token import Token
+from antlr4.atn import ATNCache
 from antlr4.atn.ATN import ATN
 from antlr4.atn.ATNType import ATNType
 from antlr4.atn.ATNState import *
@@ -75,7 +76,17 @@ class ATNDeserializer (object):
         idx2 = SUPPORTED_UUIDS.index(actualUuid)
         return idx2 >= idx1
 
+    # Returns the ATN from the ATN cache if it is there, deserializes it and
+    # stores it in the cache otherwise.
     def deserialize(self, data : str):
+        cacheFilename = ATNCache.cacheFilename(data, self.deserializationOptions)
+        atn = ATNCache.loadATN(cacheFilename)
+        if atn is None:
+            atn = self.deserializeData(data)
+            ATNCache.saveATN(cacheFilename, atn)
+        return atn
+
+    def deserializeData(self, data : str):
         self.reset(data)
         self.checkVersion()
         self.checkUUID()
@@ -56,6 +56,7 @@ from antlr4.atn.ATNState import RuleStopState, ATNState
 from antlr4.atn.LexerActionExecutor import LexerActionExecutor
 from antlr4.atn.Transition import Transition
 from antlr4.dfa.DFAState import DFAState
+from antlr4.dfa.LexerDFATable import LexerDFATable, UNKNOWN, ERROR
 from antlr4.error.Errors import LexerNoViableAltException, UnsupportedOperationException
 
 class SimState(object):
@@ -120,6 +121,8 @@ class LexerATNSimulator(ATNSimulator):
             dfa = self.decisionToDFA[mode]
             if dfa.s0 is None:
                 return self.matchATN(input)
+            elif type(input).LA is InputStream.LA and not self.debug:
+                return self.execDFA(input, dfa)
             else:
                 return self.execATN(input, dfa.s0)
         finally:
@@ -215,6 +218,61 @@ class LexerATNSimulator(ATNSimulator):
 
         return self.failOrAccept(self.prevAccept, input, s.configs, t)
 
+    # Follows the dense edge tables of the DFA over the symbols of input, which
+    # must be an InputStream that reads its symbols from input.data, for as long
+    # as they have an edge. Where they don't (an edge that has not been computed
+    # yet, a symbol outside the DFA edge range or EOF), execATN takes over.
+    def execDFA(self, input:InputStream, dfa):
+        table = dfa.lexerTable
+        if table is None:
+            table = dfa.lexerTable = LexerDFATable(dfa, self.ERROR, self.MAX_DFA_EDGE - self.MIN_DFA_EDGE + 1)
+        targets = table.targets
+        accepts = table.accepts
+        data = input.data
+        size = input._size
+        index = input._index
+        line = self.line
+        column = self.column
+
+        minEdge = self.MIN_DFA_EDGE
+        maxEdge = self.MAX_DFA_EDGE
+
+        s = dfa.s0.stateNumber
+        accept = s if accepts[s] else -1
+        acceptIndex, acceptLine, acceptColumn = index, line, column
+        target = UNKNOWN
+        while index < size:
+            t = data[index]
+            if t < minEdge or t > maxEdge:
+                target = UNKNOWN
+                break
+            target = targets[s][t - minEdge]
+            if target < 0:
+                break
+            index += 1
+            if t == 0x0a:
+                line += 1
+                column = 0
+            else:
+                column += 1
+            s = target
+            if accepts[s]:
+                accept = s
+                acceptIndex, acceptLine, acceptColumn = index, line, column
+
+        input._index = index
+        self.line = line
+        self.column = column
+        if accept >= 0:
+            self.prevAccept.index = acceptIndex
+            self.prevAccept.line = acceptLine
+            self.prevAccept.column = acceptColumn
+            self.prevAccept.dfaState = table.states[accept]
+
+        if target == ERROR:
+            return self.failOrAccept(self.prevAccept, input, table.states[s].configs, data[index])
+        return self.execATN(input, table.states[s])
+
     # Get an existing target state for an edge in the DFA. If the target state
     # for the edge has not yet been computed or is otherwise not available,
     # this method returns {@code null}.
@@ -531,6 +589,9 @@ class LexerATNSimulator(ATNSimulator):
             from_.edges = [ None ] * (self.MAX_DFA_EDGE - self.MIN_DFA_EDGE + 1)
 
         from_.edges[tk - self.MIN_DFA_EDGE] = to # connect
+        table = self.decisionToDFA[self.mode].lexerTable
+        if table is not None:
+            table.addEdge(from_, tk - self.MIN_DFA_EDGE, to)
 
         return to
 
@@ -564,6 +625,8 @@ class LexerATNSimulator(ATNSimulator):
         configs.setReadonly(True)
         newState.configs = configs
         dfa.states[newState] = newState
+        if dfa.lexerTable is not None:
+            dfa.lexerTable.addState(newState)
         return newState
 
     def getDFA(self, mode:int):
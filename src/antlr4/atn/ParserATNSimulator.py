@@ -307,6 +307,13 @@ class ParserATNSimulator(ATNSimulator):
         #  also be examined during cache lookup.
         #
         self.mergeCache = None
+        # The set of configurations a closure operation has reached through
+        #  non-epsilon (EOF) transitions and out of rules, to not follow them
+        #  twice. Every closure of computeReachSet and computeStartState starts
+        #  with it empty, so one set is reused for all of them; it is cleared
+        #  right after each use, so it doesn't keep the configurations alive
+        #  until the next prediction.
+        self.closureBusy = set()
 
 
     def reset(self):
@@ -757,10 +764,13 @@ class ParserATNSimulator(ATNSimulator):
         #
         if reach is None:
             reach = ATNConfigSet(fullCtx)
-            closureBusy = set()
+            closureBusy = self.closureBusy
             treatEofAsEpsilon = t == Token.EOF
-            for c in intermediate:
-                self.closure(c, reach, closureBusy, False, fullCtx, treatEofAsEpsilon)
+            try:
+                for c in intermediate:
+                    self.closure(c, reach, closureBusy, False, fullCtx, treatEofAsEpsilon)
+            finally:
+                closureBusy.clear()
 
         if t == Token.EOF:
             # After consuming EOF no additional input is possible, so we are
@@ -841,8 +851,11 @@ class ParserATNSimulator(ATNSimulator):
         for i in range(0, len(p.transitions)):
             target = p.transitions[i].target
             c = ATNConfig(target, i+1, initialContext)
-            closureBusy = set()
-            self.closure(c, configs, closureBusy, True, fullCtx, False)
+            closureBusy = self.closureBusy
+            try:
+                self.closure(c, configs, closureBusy, True, fullCtx, False)
+            finally:
+                closureBusy.clear()
         return configs
 
     #
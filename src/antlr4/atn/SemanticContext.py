@@ -42,6 +42,7 @@ from antlr4.RuleContext import RuleContext
 
 
 class SemanticContext(object):
+    __slots__ = ()
     #
     # The default {@link SemanticContext}, which is semantically equivalent to
     # a predicate of the form {@code {true}?}.
@@ -126,6 +127,7 @@ def filterPrecedencePredicates(collection:list):
 
 
 class Predicate(SemanticContext):
+    __slots__ = ('ruleIndex', 'predIndex', 'isCtxDependent')
 
     def __init__(self, ruleIndex:int=-1, predIndex:int=-1, isCtxDependent:bool=False):
         self.ruleIndex = ruleIndex
@@ -153,6 +155,7 @@ class Predicate(SemanticContext):
 
 
 class PrecedencePredicate(SemanticContext):
+    __slots__ = ('precedence',)
 
     def __init__(self, precedence:int=0):
         self.precedence = precedence
@@ -184,6 +187,7 @@ class PrecedencePredicate(SemanticContext):
 # is false.
 del AND
 class AND(SemanticContext):
+    __slots__ = ('opnds',)
 
     def __init__(self, a:SemanticContext, b:SemanticContext):
         operands = set()
@@ -274,6 +278,7 @@ class AND(SemanticContext):
 # contexts is true.
 del OR
 class OR (SemanticContext):
+    __slots__ = ('opnds',)
 
     def __init__(self, a:SemanticContext, b:SemanticContext):
         operands = set()
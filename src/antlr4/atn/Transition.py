@@ -51,6 +51,7 @@ ATNState = None
 RuleStartState = None
 
 class Transition (object):
+    __slots__ = ('target', 'isEpsilon', 'label', 'serializationType')
     # constants for serialization
     EPSILON			= 1
     RANGE			= 2
@@ -91,6 +92,7 @@ class Transition (object):
 
 # TODO: make all transitions sets? no, should remove set edges
 class AtomTransition(Transition):
+    __slots__ = ('label_',)
 
     def __init__(self, target:ATNState, label:int):
         super().__init__(target)
@@ -110,6 +112,7 @@ class AtomTransition(Transition):
         return str(self.label_)
 
 class RuleTransition(Transition):
+    __slots__ = ('ruleIndex', 'precedence', 'followState')
 
     def __init__(self, ruleStart:RuleStartState, ruleIndex:int, precedence:int, followState:ATNState):
         super().__init__(ruleStart)
@@ -124,6 +127,7 @@ class RuleTransition(Transition):
 
 
 class EpsilonTransition(Transition):
+    __slots__ = ('outermostPrecedenceReturn',)
 
     def __init__(self, target, outermostPrecedenceReturn=-1):
         super(EpsilonTransition, self).__init__(target)
@@ -138,6 +142,7 @@ class EpsilonTransition(Transition):
         return "epsilon"
 
 class RangeTransition(Transition):
+    __slots__ = ('start', 'stop')
 
     def __init__(self, target:ATNState, start:int, stop:int):
         super().__init__(target)
@@ -158,12 +163,14 @@ class RangeTransition(Transition):
         return "'" + chr(self.start) + "'..'" + chr(self.stop) + "'"
 
 class AbstractPredicateTransition(Transition):
+    __slots__ = ()
 
     def __init__(self, target:ATNState):
         super().__init__(target)
 
 
 class PredicateTransition(AbstractPredicateTransition):
+    __slots__ = ('ruleIndex', 'predIndex', 'isCtxDependent')
 
     def __init__(self, target:ATNState, ruleIndex:int, predIndex:int, isCtxDependent:bool):
         super().__init__(target)
@@ -183,6 +190,7 @@ class PredicateTransition(AbstractPredicateTransition):
         return "pred_" + str(self.ruleIndex) + ":" + str(self.predIndex)
 
 class ActionTransition(Transition):
+    __slots__ = ('ruleIndex', 'actionIndex', 'isCtxDependent')
 
     def __init__(self, target:ATNState, ruleIndex:int, actionIndex:int=-1, isCtxDependent:bool=False):
         super().__init__(target)
@@ -200,6 +208,7 @@ class ActionTransition(Transition):
 
 # A transition containing a set of values.
 class SetTransition(Transition):
+    __slots__ = ()
 
     def __init__(self, target:ATNState, set:IntervalSet):
         super().__init__(target)
@@ -217,6 +226,7 @@ class SetTransition(Transition):
         return str(self.label)
 
 class NotSetTransition(SetTransition):
+    __slots__ = ()
 
     def __init__(self, target:ATNState, set:IntervalSet):
         super().__init__(target, set)
@@ -232,6 +242,7 @@ class NotSetTransition(SetTransition):
 
 
 class WildcardTransition(Transition):
+    __slots__ = ()
 
     def __init__(self, target:ATNState):
         super().__init__(target)
@@ -245,6 +256,7 @@ class WildcardTransition(Transition):
 
 
 class PrecedencePredicateTransition(AbstractPredicateTransition):
+    __slots__ = ('precedence',)
 
     def __init__(self, target:ATNState, precedence:int):
         super().__init__(target)
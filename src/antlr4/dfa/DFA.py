@@ -48,6 +48,8 @@ class DFA(object):
         # {@code false}. This is the backing field for {@link #isPrecedenceDfa},
         # {@link #setPrecedenceDfa}.
         self.precedenceDfa = False
+        # the dense edge tables of a lexer DFA, built by LexerATNSimulator
+        self.lexerTable = None
 
 
     # Get the start state for a specific precedence value.
@@ -111,6 +113,7 @@ class DFA(object):
     def setPrecedenceDfa(self, precedenceDfa:bool):
         if self.precedenceDfa != precedenceDfa:
             self._states = dict()
+            self.lexerTable = None
             if precedenceDfa:
                 precedenceState = DFAState(ATNConfigSet())
                 precedenceState.edges = []
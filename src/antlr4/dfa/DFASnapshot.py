@@ -0,0 +1,327 @@
+#
+# Saves the DFA caches of generated recognizers to a file and loads them back,
+# so a new process can start with the DFA states that earlier runs have built
+# instead of simulating the ATN again until its DFA is warmed up.
+#
+# The snapshot only holds plain python data. Every ATN state is stored as its
+# state number and every lexer action as its index in the ATN, and all DFA
+# states, configurations and prediction contexts are created again when the
+# snapshot is loaded, so their (per process) hash codes are computed anew.
+#
+# A snapshot records a hash of the serialized ATN of every recognizer; the DFAs
+# of a recognizer are only loaded if its serialized ATN is still the same.
+#/
+import hashlib
+import pickle
+import sys
+from antlr4.Lexer import Lexer
+from antlr4.PredictionContext import PredictionContext, SingletonPredictionContext, ArrayPredictionContext
+from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+from antlr4.atn.ATNConfigSet import ATNConfigSet, OrderedATNConfigSet
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.LexerAction import LexerIndexedCustomAction
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.SemanticContext import SemanticContext, Predicate, PrecedencePredicate, AND, OR
+from antlr4.dfa.DFAState import DFAState, PredPrediction
+
+SNAPSHOT_VERSION = 1
+
+# ids of special objects, regular objects are numbered from 0
+EMPTY_CONTEXT = -1
+ERROR_STATE = -1
+NONE_SEMANTIC_CONTEXT = -1
+
+
+class DFASnapshotException(Exception):
+    pass
+
+
+def atnHash(recognizerClass):
+    # generated recognizers live in a module that also defines serializedATN()
+    serializedATN = sys.modules[recognizerClass.__module__].serializedATN()
+    return hashlib.sha256(serializedATN.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def saveDFASnapshot(filename:str, recognizerClasses:list):
+    snapshot = { "version": SNAPSHOT_VERSION, "recognizers": dict() }
+    for recognizerClass in recognizerClasses:
+        writer = DFASnapshotWriter(recognizerClass.atn)
+        snapshot["recognizers"][recognizerClass.__name__] = {
+            "atn": atnHash(recognizerClass),
+            "dfas": writer.writeDFAs(recognizerClass.decisionsToDFA),
+            "contexts": writer.contexts,
+            "executors": writer.executors,
+            "configs": writer.configs,
+            "configSets": writer.configSets,
+            "semanticContexts": writer.semanticContexts,
+        }
+
+    with open(filename, "wb") as file:
+        pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# Loads the DFAs of the given recognizer classes from a snapshot, replacing the
+# DFAs those classes have now. Raises DFASnapshotException, without changing
+# any DFA, if the snapshot does not belong to these recognizers.
+def loadDFASnapshot(filename:str, recognizerClasses:list):
+    with open(filename, "rb") as file:
+        snapshot = pickle.load(file)
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        raise DFASnapshotException("unsupported snapshot version")
+
+    for recognizerClass in recognizerClasses:
+        data = snapshot["recognizers"].get(recognizerClass.__name__)
+        if data is None:
+            raise DFASnapshotException("snapshot has no DFAs for " + recognizerClass.__name__)
+        if data["atn"] != atnHash(recognizerClass):
+            raise DFASnapshotException("snapshot was made for a different ATN of " + recognizerClass.__name__)
+        if len(data["dfas"]) != len(recognizerClass.decisionsToDFA):
+            raise DFASnapshotException("snapshot has a different number of decisions for " + recognizerClass.__name__)
+
+    for recognizerClass in recognizerClasses:
+        data = snapshot["recognizers"][recognizerClass.__name__]
+        reader = DFASnapshotReader(recognizerClass.atn, data, issubclass(recognizerClass, Lexer))
+        reader.readDFAs(recognizerClass.decisionsToDFA)
+
+
+class DFASnapshotWriter(object):
+
+    def __init__(self, atn):
+        self.atn = atn
+        self.contexts = []
+        self.contextIds = dict()
+        self.executors = []
+        self.executorIds = dict()
+        self.configs = []
+        self.configIds = dict()
+        self.configSets = []
+        self.semanticContexts = []
+        self.semanticContextIds = dict()
+
+    def writeDFAs(self, decisionsToDFA:list):
+        return [ self.writeDFA(dfa) for dfa in decisionsToDFA ]
+
+    def writeDFA(self, dfa):
+        # s0 of a precedence DFA is not part of dfa.states
+        states = list(dfa.states.keys())
+        if dfa.s0 is not None and dfa.states.get(dfa.s0, None) is not dfa.s0:
+            states.append(dfa.s0)
+        stateIds = dict( (id(state), i) for i, state in enumerate(states) )
+        stateIds[id(ATNSimulator.ERROR)] = ERROR_STATE
+        stateIds[id(LexerATNSimulator.ERROR)] = ERROR_STATE
+
+        encodedStates = []
+        for state in states:
+            edges = None
+            if state.edges is not None:
+                edges = (len(state.edges), [ (i, stateIds[id(target)]) for i, target in enumerate(state.edges) if target is not None ])
+            predicates = None
+            if state.predicates is not None:
+                predicates = [ (self.writeSemanticContext(p.pred), p.alt) for p in state.predicates ]
+            encodedStates.append((state.stateNumber, self.writeConfigSet(state.configs), edges, state.isAcceptState,
+                                  state.prediction, self.writeExecutor(state.lexerActionExecutor), state.requiresFullContext, predicates))
+
+        s0 = None if dfa.s0 is None else stateIds[id(dfa.s0)]
+        return (dfa.precedenceDfa, s0, len(dfa.states), encodedStates)
+
+    def writeConfigSet(self, configs:ATNConfigSet):
+        conflictingAlts = None if configs.conflictingAlts is None else sorted(configs.conflictingAlts)
+        self.configSets.append((isinstance(configs, OrderedATNConfigSet), configs.fullCtx, configs.uniqueAlt, conflictingAlts,
+                                configs.hasSemanticContext, configs.dipsIntoOuterContext, configs.readonly,
+                                [ self.writeConfig(config) for config in configs ]))
+        return len(self.configSets) - 1
+
+    def writeConfig(self, config:ATNConfig):
+        # configurations can be shared between sets, keep them shared
+        configId = self.configIds.get(id(config), None)
+        if configId is not None:
+            return configId
+
+        encoded = (config.state.stateNumber, config.alt, self.writeContext(config.context),
+                   config.reachesIntoOuterContext, config.precedenceFilterSuppressed, self.writeSemanticContext(config.semanticContext))
+        if isinstance(config, LexerATNConfig):
+            encoded += (self.writeExecutor(config.lexerActionExecutor), config.passedThroughNonGreedyDecision)
+
+        self.configs.append(encoded)
+        self.configIds[id(config)] = len(self.configs) - 1
+        return len(self.configs) - 1
+
+    def writeContext(self, context:PredictionContext):
+        if context is None:
+            return None
+        if context is PredictionContext.EMPTY:
+            return EMPTY_CONTEXT
+        contextId = self.contextIds.get(id(context), None)
+        if contextId is not None:
+            return contextId
+
+        # parents are written first so they can be created first when loading
+        if isinstance(context, SingletonPredictionContext):
+            encoded = (self.writeContext(context.parentCtx), context.returnState)
+        else:
+            encoded = ([ self.writeContext(parent) for parent in context.parents ], list(context.returnStates))
+
+        self.contexts.append(encoded)
+        self.contextIds[id(context)] = len(self.contexts) - 1
+        return len(self.contexts) - 1
+
+    def writeSemanticContext(self, semanticContext:SemanticContext):
+        if semanticContext is SemanticContext.NONE:
+            return NONE_SEMANTIC_CONTEXT
+        semanticContextId = self.semanticContextIds.get(id(semanticContext), None)
+        if semanticContextId is not None:
+            return semanticContextId
+
+        if isinstance(semanticContext, PrecedencePredicate):
+            encoded = ("precedence", semanticContext.precedence)
+        elif isinstance(semanticContext, Predicate):
+            encoded = ("predicate", semanticContext.ruleIndex, semanticContext.predIndex, semanticContext.isCtxDependent)
+        elif isinstance(semanticContext, (AND, OR)):
+            encoded = ("and" if isinstance(semanticContext, AND) else "or", [ self.writeSemanticContext(o) for o in semanticContext.opnds ])
+        else:
+            raise DFASnapshotException("unknown semantic context " + str(semanticContext))
+
+        self.semanticContexts.append(encoded)
+        self.semanticContextIds[id(semanticContext)] = len(self.semanticContexts) - 1
+        return len(self.semanticContexts) - 1
+
+    def writeExecutor(self, executor:LexerActionExecutor):
+        if executor is None:
+            return None
+        executorId = self.executorIds.get(id(executor), None)
+        if executorId is not None:
+            return executorId
+
+        actions = []
+        for action in executor.lexerActions:
+            if isinstance(action, LexerIndexedCustomAction):
+                actions.append((action.offset, self.actionIndex(action.action)))
+            else:
+                actions.append((None, self.actionIndex(action)))
+
+        self.executors.append(actions)
+        self.executorIds[id(executor)] = len(self.executors) - 1
+        return len(self.executors) - 1
+
+    def actionIndex(self, action):
+        for i, atnAction in enumerate(self.atn.lexerActions):
+            if atnAction is action or atnAction == action:
+                return i
+        raise DFASnapshotException("lexer action " + str(action) + " is not part of the ATN")
+
+
+class DFASnapshotReader(object):
+
+    def __init__(self, atn, data:dict, isLexer:bool):
+        self.atn = atn
+        self.isLexer = isLexer
+        self.contexts = []
+        for encoded in data["contexts"]:
+            self.contexts.append(self.readContext(encoded))
+        self.semanticContexts = []
+        for encoded in data["semanticContexts"]:
+            self.semanticContexts.append(self.readSemanticContext(encoded))
+        self.executors = [ self.readExecutor(encoded) for encoded in data["executors"] ]
+        self.configs = [ self.readConfig(encoded) for encoded in data["configs"] ]
+        self.configSets = data["configSets"]
+        self.dfas = data["dfas"]
+
+    def readDFAs(self, decisionsToDFA:list):
+        for dfa, encoded in zip(decisionsToDFA, self.dfas):
+            self.readDFA(dfa, encoded)
+
+    def readDFA(self, dfa, encoded):
+        precedenceDfa, s0, numberOfStates, encodedStates = encoded
+
+        error = LexerATNSimulator.ERROR if self.isLexer else ATNSimulator.ERROR
+        states = []
+        for (stateNumber, configSetId, edges, isAcceptState, prediction, executorId, requiresFullContext, predicates) in encodedStates:
+            state = DFAState(stateNumber, self.readConfigSet(self.configSets[configSetId]))
+            state.isAcceptState = isAcceptState
+            state.prediction = prediction
+            state.lexerActionExecutor = None if executorId is None else self.executors[executorId]
+            state.requiresFullContext = requiresFullContext
+            if predicates is not None:
+                state.predicates = [ PredPrediction(self.semanticContext(semanticContextId), alt) for semanticContextId, alt in predicates ]
+            states.append(state)
+
+        for state, (_, _, edges, _, _, _, _, _) in zip(states, encodedStates):
+            if edges is not None:
+                length, targets = edges
+                state.edges = [None] * length
+                for i, targetId in targets:
+                    state.edges[i] = error if targetId == ERROR_STATE else states[targetId]
+
+        dfa.precedenceDfa = precedenceDfa
+        dfa._states = dict( (state, state) for state in states[:numberOfStates] )
+        dfa.s0 = None if s0 is None else states[s0]
+        dfa.lexerTable = None
+
+    def readConfigSet(self, encoded):
+        ordered, fullCtx, uniqueAlt, conflictingAlts, hasSemanticContext, dipsIntoOuterContext, readonly, configIds = encoded
+        configs = OrderedATNConfigSet() if ordered else ATNConfigSet(fullCtx)
+        configs.fullCtx = fullCtx
+        configs.uniqueAlt = uniqueAlt
+        configs.conflictingAlts = None if conflictingAlts is None else set(conflictingAlts)
+        configs.hasSemanticContext = hasSemanticContext
+        configs.dipsIntoOuterContext = dipsIntoOuterContext
+        # the configurations were already merged when the set was built
+        configs.configs = [ self.configs[configId] for configId in configIds ]
+        if readonly:
+            configs.setReadonly(True)
+        else:
+            for config in configs.configs:
+                configs.getOrAdd(config)
+        return configs
+
+    def readConfig(self, encoded):
+        state = self.atn.states[encoded[0]]
+        context = self.context(encoded[2])
+        semanticContext = self.semanticContext(encoded[5])
+        if self.isLexer:
+            executor = None if encoded[6] is None else self.executors[encoded[6]]
+            config = LexerATNConfig(state, encoded[1], context, semanticContext, executor)
+            config.passedThroughNonGreedyDecision = encoded[7]
+        else:
+            config = ATNConfig(state, encoded[1], context, semanticContext)
+        config.reachesIntoOuterContext = encoded[3]
+        config.precedenceFilterSuppressed = encoded[4]
+        return config
+
+    def context(self, contextId):
+        if contextId is None:
+            return None
+        if contextId == EMPTY_CONTEXT:
+            return PredictionContext.EMPTY
+        return self.contexts[contextId]
+
+    def readContext(self, encoded):
+        parent, returnState = encoded
+        if isinstance(parent, list):
+            return ArrayPredictionContext([ self.context(p) for p in parent ], list(returnState))
+        return SingletonPredictionContext(self.context(parent), returnState)
+
+    def semanticContext(self, semanticContextId):
+        if semanticContextId == NONE_SEMANTIC_CONTEXT:
+            return SemanticContext.NONE
+        return self.semanticContexts[semanticContextId]
+
+    def readSemanticContext(self, encoded):
+        if encoded[0] == "precedence":
+            return PrecedencePredicate(encoded[1])
+        if encoded[0] == "predicate":
+            return Predicate(encoded[1], encoded[2], encoded[3])
+
+        # operands are set directly, the constructors would reduce them again
+        semanticContext = AND.__new__(AND) if encoded[0] == "and" else OR.__new__(OR)
+        semanticContext.opnds = [ self.semanticContext(o) for o in encoded[1] ]
+        return semanticContext
+
+    def readExecutor(self, encoded):
+        actions = []
+        for offset, actionIndex in encoded:
+            action = self.atn.lexerActions[actionIndex]
+            actions.append(action if offset is None else LexerIndexedCustomAction(offset, action))
+        return LexerActionExecutor(actions)
@@ -36,6 +36,7 @@ from antlr4.atn.SemanticContext import SemanticContext
 
 
 class PredPrediction(object):
+    __slots__ = ('alt', 'pred')
     def __init__(self, pred:SemanticContext, alt:int):
         self.alt = alt
         self.pred = pred
@@ -68,6 +69,8 @@ class PredPrediction(object):
 #  meaning that state was reached via a different set of rule invocations.</p>
 #/
 class DFAState(object):
+    __slots__ = ('stateNumber', 'configs', 'edges', 'isAcceptState', 'prediction', 'lexerActionExecutor',
+                 'requiresFullContext', 'predicates')
 
     def __init__(self, stateNumber:int=-1, configs:ATNConfigSet=ATNConfigSet()):
         self.stateNumber = stateNumber
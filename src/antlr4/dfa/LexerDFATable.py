@@ -0,0 +1,44 @@
+#
+# The edges of a lexer DFA as dense integer tables, so the lexer can follow
+# them without touching DFAState objects. For every DFA state (by state
+# number) there is an array with the target state number of each character
+# in the DFA edge range, UNKNOWN where the edge has not been computed yet and
+# ERROR where the character can't follow. LexerATNSimulator builds the table
+# of a DFA the first time it matches a token with that DFA and then keeps it
+# up to date when it adds states and edges.
+#/
+from array import array
+from antlr4.dfa.DFAState import DFAState
+
+UNKNOWN = -1
+ERROR = -2
+
+
+class LexerDFATable(object):
+
+    def __init__(self, dfa, errorState:DFAState, edgeCount:int):
+        self.errorState = errorState
+        self.edgeCount = edgeCount
+        # the DFA states, their edges and whether they accept, by state number
+        self.states = []
+        self.targets = []
+        self.accepts = bytearray()
+        for state in dfa.sortedStates():
+            self.addState(state)
+        for state in self.states:
+            if state.edges is not None:
+                for t, target in enumerate(state.edges):
+                    if target is not None:
+                        self.addEdge(state, t, target)
+
+    def addState(self, state:DFAState):
+        # states are numbered in the order they are added to the DFA
+        while len(self.states) <= state.stateNumber:
+            self.states.append(None)
+            self.targets.append(array('i', [UNKNOWN]) * self.edgeCount)
+            self.accepts.append(0)
+        self.states[state.stateNumber] = state
+        self.accepts[state.stateNumber] = state.isAcceptState
+
+    def addEdge(self, from_:DFAState, t:int, to:DFAState):
+        self.targets[from_.stateNumber][t] = ERROR if to is self.errorState else to.stateNumber
@@ -0,0 +1,96 @@
+import argparse
+import os
+import subprocess
+import sys
+
+
+# measures which modules c2p.py imports for a run, and how long importing them takes,
+# and fails when a run imports a module it has no use for
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCE = os.path.join(SRC_DIR, "tests", "programs", "areaCircle.c")
+
+# never needed to compile a file
+NEVER_NEEDED = [
+    "unittest",
+    "antlr4.xpath",
+    "antlr4.tree.ParseTreePattern",
+    "antlr4.tree.ParseTreePatternMatcher",
+    "multiprocessing",
+    "socketserver",
+    "CompilationCache",
+    "Profiler",
+    "antlr4.dfa.DFASnapshot",
+    "FastLexer",
+    "ParallelLexer",
+    "IncrementalLexer",
+    "ASTBuilder",
+    "RecursiveDescentParser",
+    "c2pclient",
+    "socket",
+    "tempfile",
+    "antlr4.ChunkedInputStream",
+]
+
+# (name, c2p.py arguments, modules that must not be imported)
+MODES = [
+    ("syntax-only", ["--syntax-only"], NEVER_NEEDED + [
+        "AbstractSyntaxTree",
+        "Listener",
+        "SymbolTable",
+        "VisitorDecorator",
+        "VisitorSymbolTableFiller",
+        "VisitorDeclarationProcessor",
+        "VisitorTypeChecker",
+        "VisitorCodeGenerator",
+    ]),
+    ("compile", [], NEVER_NEEDED),
+]
+
+
+def importTimes(arguments):
+    # returns {module: (self microseconds, cumulative microseconds)} of a run of c2p.py
+    command = [sys.executable, "-X", "importtime", os.path.join(SRC_DIR, "c2p.py")] + arguments
+    process = subprocess.run(command, cwd=SRC_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        selfTime, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = (int(selfTime), int(cumulative))
+
+    return times
+
+
+def forbiddenImports(times, forbidden):
+    return sorted(module for module in times if any(module == name or module.startswith(name + ".") for name in forbidden))
+
+
+def run(source, outFile, modes=MODES):
+    # prints a line per mode and returns the list of (mode, forbidden modules that were imported)
+    failures = []
+
+    # the first run after the grammar or the runtime changed saves the ATN cache, which imports what other runs don't
+    importTimes(["-q", "-o", outFile, source])
+
+    for (name, arguments, forbidden) in modes:
+        times = importTimes(["-q", "-o", outFile, source] + arguments)
+        total = sum(selfTime for (selfTime, cumulative) in times.values())
+        print((name + ":").ljust(14) + str(len(times)).rjust(4) + " modules " + ("%.1f" % (total / 1000)).rjust(8) + " ms")
+
+        imported = forbiddenImports(times, forbidden)
+        if imported:
+            print("    should not import: " + ", ".join(imported))
+            failures.append((name, imported))
+
+    return failures
+
+
+if __name__=="__main__":
+    argparser = argparse.ArgumentParser(description="Reports the imports of c2p.py and fails when a run imports modules it does not need")
+    argparser.add_argument("source", nargs="?", help="The c program that is compiled", default=DEFAULT_SOURCE)
+    argparser.add_argument("-o", help="The output filename of the compilations", default=os.devnull)
+    args = argparser.parse_args()
+
+    sys.exit(1 if run(os.path.abspath(args.source), args.o) else 0)
@@ -0,0 +1,272 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+# measures the lexing throughput (tokens and bytes per second) and peak memory of an input stream, a lexer and a
+# token stream over generated C programs of several sizes, and compares the results with those of an earlier run
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS_VERSION = 1
+
+DEFAULT_SIZES = "1K,64K,1M"
+
+UNITS = {"K": 1024, "M": 1024 * 1024}
+
+INPUTS = ["file", "mapped"]
+LEXERS = ["antlr", "fast"]
+STREAMS = ["common", "compact"]
+
+NAMES = ["count", "total", "index", "value", "result", "length", "width", "height", "offset", "limit", "step",
+         "first", "last", "left", "right", "sum", "max", "min", "flag", "temp", "buffer", "matrix", "row", "column"]
+OPERATORS = ["+", "-", "*", "/", "%", "<", ">", "<=", ">=", "==", "!=", "&&", "||"]
+WORDS = ["value", "result", "is", "too", "large", "done", "error", "row", "of", "the", "matrix", "sum", "step"]
+
+
+def parseSize(size):
+    # "64K" -> 65536
+    size = size.strip().upper()
+    if size[-1] in UNITS:
+        return int(float(size[:-1]) * UNITS[size[-1]])
+    return int(size)
+
+
+def formatSize(size):
+    for unit in ["M", "K"]:
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return str(size // UNITS[unit]) + unit
+    return str(size)
+
+
+class ProgramGenerator:
+    # writes C functions with the mix of tokens of the test programs: declarations, loops, conditions, arithmetic,
+    # calls to printf with format strings, character and float literals, arrays, pointers and comments
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        # the number of parameters of every function written so far
+        self.arities = []
+
+    def name(self):
+        return self.random.choice(NAMES) + str(self.random.randrange(10))
+
+    def literal(self, type):
+        if type == "float":
+            return self.random.choice(["%d.%d" % (self.random.randrange(100), self.random.randrange(1000)), "%d.5e%d" % (self.random.randrange(10), self.random.randrange(-3, 4))])
+        if type == "char":
+            return self.random.choice(["'a'", "'z'", "'0'", "'\\n'", "' '"])
+        return str(self.random.randrange(1000))
+
+    def expression(self, variables, depth=0):
+        if depth > 2 or self.random.random() < 0.3:
+            return self.random.choice(variables) if self.random.random() < 0.7 else self.literal("int")
+        left = self.expression(variables, depth + 1)
+        right = self.expression(variables, depth + 1)
+        if self.random.random() < 0.2:
+            return "(" + left + " " + self.random.choice(OPERATORS) + " " + right + ")"
+        return left + " " + self.random.choice(OPERATORS) + " " + right
+
+    def function(self, number):
+        parameters = [self.name() + "_p" for _ in range(self.random.randrange(1, 4))]
+        variables = sorted(set(self.name() for _ in range(self.random.randrange(2, 6))) - set(parameters))
+        numbers = parameters + variables
+        lines = []
+        if self.random.random() < 0.5:
+            lines.append("/* " + " ".join(self.random.choice(WORDS) for _ in range(self.random.randrange(3, 12))) + "\n * f" + str(number) + "\n */")
+        lines.append("int f" + str(number) + "(" + ", ".join("int " + p for p in parameters) + ") {")
+        lines.append("    int " + ", ".join(v + " = " + self.literal("int") for v in variables) + ";")
+        lines.append("    int values[16];")
+        lines.append("    int* pointer = &values[0];")
+        lines.append("    float scale = " + self.literal("float") + ";")
+        lines.append("    char letter = " + self.literal("char") + ";")
+        for _ in range(self.random.randrange(2, 6)):
+            kind = self.random.randrange(5)
+            target = self.random.choice(variables)
+            if kind == 0:
+                lines.append("    // " + " ".join(self.random.choice(WORDS) for _ in range(self.random.randrange(2, 8))))
+                lines.append("    " + target + " = " + self.expression(numbers) + ";")
+            elif kind == 1:
+                lines.append("    for (" + target + " = 0; " + target + " < 16; " + target + "++) {")
+                lines.append("        values[" + target + "] = " + self.expression(numbers) + ";")
+                lines.append("        scale = scale * " + self.literal("float") + ";")
+                lines.append("    }")
+            elif kind == 2:
+                lines.append("    if (" + self.expression(numbers) + ") {")
+                lines.append("        " + target + " = " + self.expression(numbers) + ";")
+                lines.append("    } else {")
+                lines.append("        *pointer = " + self.expression(numbers) + ";")
+                lines.append("    }")
+            elif kind == 3:
+                lines.append("    while (" + target + " > " + self.literal("int") + ") {")
+                lines.append("        " + target + " = " + target + " / 2;")
+                lines.append("    }")
+            else:
+                words = " ".join(self.random.choice(WORDS) for _ in range(self.random.randrange(1, 5)))
+                lines.append("    printf(\"" + words + ": %d %f %c\\n\", " + target + ", scale, letter);")
+        if number > 0:
+            callee = self.random.randrange(number)
+            lines.append("    " + variables[0] + " = f" + str(callee) + "(" + ", ".join(self.random.choice(numbers) for _ in range(self.arities[callee])) + ");")
+        self.arities.append(len(parameters))
+        lines.append("    return " + self.expression(numbers) + ";")
+        lines.append("}")
+        return "\n".join(lines) + "\n\n"
+
+    def program(self, size):
+        # a program of at least size bytes (and at most one function more)
+        parts = ["#include <stdio.h>\n\n"]
+        length = len(parts[0])
+        number = 0
+        while length < size:
+            function = self.function(number)
+            parts.append(function)
+            length += len(function)
+            number += 1
+        parts.append("int main() {\n    printf(\"%d\\n\", f" + str(number - 1) + "(" + ", ".join(["1"] * self.arities[-1]) + "));\n    return 0;\n}\n")
+        return "".join(parts)
+
+
+def corpus(directory, size, seed):
+    # the file of the generated program of size bytes, which is only generated once for every size and seed
+    filename = os.path.join(directory, "corpus-" + formatSize(size) + "-" + str(seed) + ".c")
+    if not os.path.exists(filename):
+        with open(filename, "w") as file:
+            file.write(ProgramGenerator(seed).program(size))
+    return filename
+
+
+def lex(filename, input, lexer, stream):
+    # lexes filename with the given input stream, lexer and token stream, returns the number of tokens
+    from antlr4 import FileStream, CommonTokenStream, CompactTokenStream
+    from antlr4.MappedFileStream import MappedFileStream
+
+    if lexer == "fast":
+        from FastLexer import FastCLexer as lexerClass
+    else:
+        from antlr4_generated.CLexer import CLexer as lexerClass
+
+    inputStream = (MappedFileStream if input == "mapped" else FileStream)(filename)
+    lexerInstance = lexerClass(inputStream)
+    lexerInstance.removeErrorListeners()
+    tokenStream = (CompactTokenStream if stream == "compact" else CommonTokenStream)(lexerInstance)
+    tokenStream.fill()
+    return len(tokenStream.tokens)
+
+
+def measure(filename, input, lexer, stream, repeat):
+    size = os.path.getsize(filename)
+
+    seconds = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        tokens = lex(filename, input, lexer, stream)
+        duration = time.perf_counter() - start
+        seconds = duration if seconds is None else min(seconds, duration)
+
+    # the memory is traced in a run of its own, as tracing slows it down
+    gc.collect()
+    tracemalloc.start()
+    lex(filename, input, lexer, stream)
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "bytes": size,
+        "tokens": tokens,
+        "seconds": seconds,
+        "tokensPerSecond": tokens / seconds,
+        "bytesPerSecond": size / seconds,
+        "peakMemory": peakMemory,
+    }
+
+
+def compare(results, baseline):
+    # (size, tokens per second ratio, peak memory ratio) for every size in both, ratios are new / baseline
+    baselineResults = dict((result["size"], result) for result in baseline["results"])
+    comparison = []
+    for result in results["results"]:
+        old = baselineResults.get(result["size"])
+        if old is not None:
+            comparison.append((result["size"], result["tokensPerSecond"] / old["tokensPerSecond"], result["peakMemory"] / old["peakMemory"]))
+    return comparison
+
+
+def run(sizes, input="file", lexer="antlr", stream="common", repeat=3, seed=0, directory=None, baseline=None):
+    # prints a line per size and returns the results, as they are saved in json
+    configuration = {"input": input, "lexer": lexer, "stream": stream, "repeat": repeat, "seed": seed}
+    results = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "configuration": configuration,
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as temporaryDirectory:
+        directory = directory or temporaryDirectory
+        filenames = [(size, corpus(directory, size, seed)) for size in sizes]
+
+        # the DFA of the lexer is built while lexing, warm it up so every size is lexed at full speed
+        lex(corpus(directory, parseSize("64K"), seed + 1), input, lexer, stream)
+
+        for size, filename in filenames:
+            result = {"size": formatSize(size)}
+            result.update(measure(filename, input, lexer, stream, repeat))
+            results["results"].append(result)
+            print(result["size"].rjust(6) + ": " + str(result["tokens"]).rjust(9) + " tokens " + ("%.3f" % result["seconds"]).rjust(9) + " s "
+                  + ("%.0f" % result["tokensPerSecond"]).rjust(9) + " tokens/s " + ("%.2f" % (result["bytesPerSecond"] / UNITS["M"])).rjust(7) + " MB/s "
+                  + ("%.1f" % (result["peakMemory"] / UNITS["M"])).rjust(8) + " MB peak")
+
+    if baseline is not None:
+        if baseline.get("version") != RESULTS_VERSION:
+            print("baseline ignored: it was saved by another version of this benchmark")
+        else:
+            if baseline["configuration"] != configuration:
+                print("baseline was measured with " + json.dumps(baseline["configuration"], sort_keys=True))
+            results["comparison"] = []
+            for size, speed, memory in compare(results, baseline):
+                results["comparison"].append({"size": size, "tokensPerSecond": speed, "peakMemory": memory})
+                print(size.rjust(6) + ": " + ("%+.1f%%" % ((speed - 1) * 100)).rjust(8) + " tokens/s " + ("%+.1f%%" % ((memory - 1) * 100)).rjust(8) + " peak memory")
+
+    return results
+
+
+if __name__=="__main__":
+    sys.path.insert(0, SRC_DIR)
+
+    argparser = argparse.ArgumentParser(description="Measures the lexing throughput and peak memory over generated C programs of several sizes")
+    argparser.add_argument("--sizes", help="The sizes of the generated programs, comma separated, with K or M for KB or MB (default " + DEFAULT_SIZES + ", up to e.g. 50M)", default=DEFAULT_SIZES)
+    argparser.add_argument("--input", choices=INPUTS, help="FileStream or MappedFileStream", default="file")
+    argparser.add_argument("--lexer", choices=LEXERS, help="The generated CLexer or FastCLexer", default="antlr")
+    argparser.add_argument("--stream", choices=STREAMS, help="CommonTokenStream or CompactTokenStream", default="common")
+    argparser.add_argument("--repeat", type=int, help="How many times every program is lexed, the fastest time is kept", default=3)
+    argparser.add_argument("--seed", type=int, help="The seed of the generated programs", default=0)
+    argparser.add_argument("--corpus-dir", help="Keeps the generated programs in CORPUS_DIR to reuse them in the next run", default=None)
+    argparser.add_argument("--json", help="Saves the results as json to JSON", default=None)
+    argparser.add_argument("--baseline", help="Compares the results with those saved by an earlier run with --json", default=None)
+    argparser.add_argument("--max-slowdown", type=float, help="Fails when the tokens per second of a size are more than MAX_SLOWDOWN percent below the baseline", default=None)
+    args = argparser.parse_args()
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    if args.corpus_dir is not None:
+        os.makedirs(args.corpus_dir, exist_ok=True)
+
+    results = run([parseSize(size) for size in args.sizes.split(",")], args.input, args.lexer, args.stream, args.repeat, args.seed, args.corpus_dir, baseline)
+
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.max_slowdown is not None and any(result["tokensPerSecond"] < 1 - args.max_slowdown / 100 for result in results.get("comparison", [])):
+        sys.exit(1)
@@ -0,0 +1,253 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+
+# measures what adaptive prediction allocates while the DFAs of CParser are still cold: the objects of the prediction
+# classes that are created, the lists and sets the configuration sets and closure create to look up and keep track of
+# configurations, the peak memory of the parse and the memory (bytes and blocks) the warmed up DFAs keep, for a
+# generated C program parsed with SLL and with LL prediction, and compares the results with those of an earlier run
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS_VERSION = 2
+
+DEFAULT_SIZE = "16K"
+
+MODES = ["SLL", "LL"]
+
+# the classes of which the created objects are counted, by the module they are in
+COUNTED_CLASSES = [
+    ("antlr4.atn.ATNConfig", ["ATNConfig"]),
+    ("antlr4.atn.ATNConfigSet", ["ATNConfigSet"]),
+    ("antlr4.PredictionContext", ["SingletonPredictionContext", "ArrayPredictionContext"]),
+    ("antlr4.dfa.DFAState", ["DFAState"]),
+]
+
+
+def countedInitializers():
+    # {code object of __init__: counted class name}
+    import importlib
+
+    initializers = {}
+    for moduleName, classNames in COUNTED_CLASSES:
+        module = importlib.import_module(moduleName)
+        for className in classNames:
+            initializers[getattr(module, className).__init__.__code__] = className
+    return initializers
+
+
+def countContainers(tokens, mode):
+    # {container: count} of the lists configLookup gets for the hash codes of the configurations in a configuration
+    # set, and of the sets closure gets to keep track of the configurations it went through, counted by wrapping
+    # ATNConfigSet.getOrAdd and ParserATNSimulator.closure
+    from antlr4.atn.ATNConfigSet import ATNConfigSet
+    from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+
+    getOrAdd = ATNConfigSet.getOrAdd
+    closure = ParserATNSimulator.closure
+    lookupLists = [0]
+    # every set is kept, so that the id of one that is freed is not taken for the same set when another one gets it
+    closureSets = {}
+
+    def countingGetOrAdd(configs, config):
+        h = hash(config)
+        before = configs.configLookup.get(h)
+        existing = getOrAdd(configs, config)
+        after = configs.configLookup.get(h)
+        if type(after) is list and after is not before:
+            lookupLists[0] += 1
+        return existing
+
+    def countingClosure(simulator, config, configs, closureBusy, *args):
+        closureSets[id(closureBusy)] = closureBusy
+        return closure(simulator, config, configs, closureBusy, *args)
+
+    old = coldDFAs()
+    ATNConfigSet.getOrAdd = countingGetOrAdd
+    ParserATNSimulator.closure = countingClosure
+    try:
+        parse(tokens, mode)
+    finally:
+        ATNConfigSet.getOrAdd = getOrAdd
+        ParserATNSimulator.closure = closure
+        restoreDFAs(old)
+
+    return {"configLookupLists": lookupLists[0], "closureSets": len(closureSets)}
+
+
+def coldDFAs():
+    # gives CParser new, empty DFAs and prediction context cache, returns the ones it had to put them back
+    from antlr4.dfa.DFA import DFA
+    from antlr4.PredictionContext import PredictionContextCache
+    from antlr4_generated.CParser import CParser
+
+    old = (CParser.decisionsToDFA, CParser.sharedContextCache)
+    CParser.decisionsToDFA = [DFA(state, i) for i, state in enumerate(CParser.atn.decisionToState)]
+    CParser.sharedContextCache = PredictionContextCache()
+    return old
+
+
+def restoreDFAs(old):
+    from antlr4_generated.CParser import CParser
+
+    CParser.decisionsToDFA, CParser.sharedContextCache = old
+
+
+def parse(tokens, mode):
+    # parses the tokens with the generated CParser (every expression goes through the chain of oplevel rules), with
+    # the DFAs CParser has at that moment
+    from antlr4 import CommonTokenStream
+    from antlr4.ListTokenSource import ListTokenSource
+    from antlr4.atn.PredictionMode import PredictionMode
+    from antlr4_generated.CParser import CParser
+
+    parser = CParser(CommonTokenStream(ListTokenSource(tokens)))
+    parser.removeErrorListeners()
+    parser.buildParseTrees = False
+    parser._interp.predictionMode = PredictionMode.SLL if mode == "SLL" else PredictionMode.LL
+    parser.program()
+    return parser._syntaxErrors
+
+
+def measure(tokens, mode):
+    from antlr4_generated.CParser import CParser
+
+    # the time of a cold parse, without tracing
+    old = coldDFAs()
+    try:
+        gc.collect()
+        start = time.perf_counter()
+        syntaxErrors = parse(tokens, mode)
+        seconds = time.perf_counter() - start
+    finally:
+        restoreDFAs(old)
+
+    # the objects that are created, counted by their __init__
+    initializers = countedInitializers()
+    objects = dict((className, 0) for className in initializers.values())
+    def profile(frame, event, arg):
+        if event == "call":
+            className = initializers.get(frame.f_code)
+            if className is not None:
+                objects[className] += 1
+    old = coldDFAs()
+    try:
+        sys.setprofile(profile)
+        parse(tokens, mode)
+    finally:
+        sys.setprofile(None)
+        restoreDFAs(old)
+
+    containers = countContainers(tokens, mode)
+
+    # the peak memory of the parse and the memory that is still held by the DFAs after it
+    old = coldDFAs()
+    try:
+        gc.collect()
+        tracemalloc.start()
+        parse(tokens, mode)
+        gc.collect()
+        peakMemory = tracemalloc.get_traced_memory()[1]
+        statistics = tracemalloc.take_snapshot().statistics("filename")
+        tracemalloc.stop()
+        dfaStates = sum(len(dfa.states) for dfa in CParser.decisionsToDFA)
+    finally:
+        restoreDFAs(old)
+
+    return {
+        "syntaxErrors": syntaxErrors,
+        "seconds": seconds,
+        "objects": objects,
+        "containers": containers,
+        "peakMemory": peakMemory,
+        "dfaStates": dfaStates,
+        "dfaMemory": sum(statistic.size for statistic in statistics),
+        "dfaBlocks": sum(statistic.count for statistic in statistics),
+    }
+
+
+def compare(results, baseline):
+    # (mode, {measure: new / baseline}) for every mode in both
+    baselineResults = dict((result["mode"], result) for result in baseline["results"])
+    comparison = []
+    for result in results["results"]:
+        old = baselineResults.get(result["mode"])
+        if old is not None:
+            ratios = dict((key, result[key] / old[key]) for key in ["seconds", "peakMemory", "dfaMemory", "dfaBlocks"])
+            ratios["objects"] = sum(result["objects"].values()) / sum(old["objects"].values())
+            ratios["containers"] = sum(result["containers"].values()) / sum(old["containers"].values())
+            comparison.append((result["mode"], ratios))
+    return comparison
+
+
+def run(size, modes=MODES, seed=0, baseline=None):
+    # prints a line per mode and returns the results, as they are saved in json
+    from antlr4 import InputStream, CommonTokenStream
+    from antlr4_generated.CLexer import CLexer
+    from benchmarks.lexing import ProgramGenerator, formatSize
+
+    configuration = {"size": formatSize(size), "seed": seed}
+    results = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "configuration": configuration,
+        "results": [],
+    }
+
+    # the program is lexed once, only the parse is measured
+    stream = CommonTokenStream(CLexer(InputStream(ProgramGenerator(seed).program(size))))
+    stream.fill()
+
+    for mode in modes:
+        result = {"mode": mode}
+        result.update(measure(stream.tokens, mode))
+        results["results"].append(result)
+        print(mode.rjust(4) + ": " + ("%.3f" % result["seconds"]).rjust(7) + " s " + str(sum(result["objects"].values())).rjust(8) + " objects ("
+              + ", ".join(str(count) + " " + className for className, count in sorted(result["objects"].items())) + ") "
+              + str(sum(result["containers"].values())).rjust(8) + " containers ("
+              + ", ".join(str(count) + " " + container for container, count in sorted(result["containers"].items())) + ") "
+              + ("%.1f" % (result["peakMemory"] / 1024 / 1024)).rjust(6) + " MB peak, " + str(result["dfaStates"]) + " DFA states in "
+              + ("%.1f" % (result["dfaMemory"] / 1024 / 1024)).rjust(5) + " MB, " + str(result["dfaBlocks"]) + " blocks")
+
+    if baseline is not None:
+        if baseline.get("version") != RESULTS_VERSION:
+            print("baseline ignored: it was saved by another version of this benchmark")
+        else:
+            if baseline["configuration"] != configuration:
+                print("baseline was measured with " + json.dumps(baseline["configuration"], sort_keys=True))
+            results["comparison"] = []
+            for mode, ratios in compare(results, baseline):
+                results["comparison"].append(dict(ratios, mode=mode))
+                print(mode.rjust(4) + ": " + ", ".join(("%+.1f%% " % ((ratios[key] - 1) * 100)) + key for key in ["seconds", "objects", "containers", "peakMemory", "dfaMemory", "dfaBlocks"]))
+
+    return results
+
+
+if __name__=="__main__":
+    sys.path.insert(0, SRC_DIR)
+    from benchmarks.lexing import parseSize
+
+    argparser = argparse.ArgumentParser(description="Measures the objects and memory that adaptive prediction allocates while the DFAs of CParser are cold")
+    argparser.add_argument("--size", help="The size of the generated program, with K or M for KB or MB (default " + DEFAULT_SIZE + ")", default=DEFAULT_SIZE)
+    argparser.add_argument("--mode", choices=MODES, help="Only measures this prediction mode", default=None)
+    argparser.add_argument("--seed", type=int, help="The seed of the generated program", default=0)
+    argparser.add_argument("--json", help="Saves the results as json to JSON", default=None)
+    argparser.add_argument("--baseline", help="Compares the results with those saved by an earlier run with --json", default=None)
+    args = argparser.parse_args()
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    results = run(parseSize(args.size), MODES if args.mode is None else [args.mode], args.seed, baseline)
+
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
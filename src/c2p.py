@@ -1,17 +1,23 @@
+from antlr4 import InputStream, CompactTokenStream, ParseTreeWalker, ParserRuleContext
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Token import Token
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 from antlr4_generated.CLexer import CLexer
 from antlr4_generated.CParser import CParser
+from PrecedenceParser import PrecedenceCParser
 
-from AbstractSyntaxTree import *
-from Listener import *
 from ErrorHandler import *
-from SymbolTable import *
-from VisitorSymbolTableFiller import *
-from VisitorDeclarationProcessor import *
-from VisitorTypeChecker import *
-from VisitorCodeGenerator import *
-from VisitorDecorator import *
+
+# the AST, the visitors, the cache, the DFA snapshots, multiprocessing and socketserver are imported
+# by the stages that use them, so a run only loads what it needs (see benchmarks/importtime.py)
 
 import argparse
+import contextlib
+import io
+import json
+import linecache
 import traceback
 import sys
 import time
@@ -24,6 +30,24 @@ SAVE_SYMBOL_TABLE = False
 PRINT_TIMINGS     = False
 PRINT_NOTHING     = False
 OUT_FILE_NAME     = "out.p"
+STDIN             = "-"
+STDIN_NAME        = "<stdin>"
+CACHE             = None
+SYNTAX_ONLY       = False
+PROFILER          = None
+FAST_LEXER        = False
+LEX_JOBS          = 1
+DIRECT_AST        = False
+PARSER            = "antlr"
+LOAD_DFA          = None
+
+# the lexer and parser are created once and reused for every file that gets compiled in this process,
+# so the deserialized ATN and the DFA cache that is warmed up by previous files are not thrown away
+lexer  = None
+parser = None
+
+# (stage, seconds) pairs of the file that is being compiled
+timings = []
 
 
 def output(text, is_timing=False):
@@ -36,49 +60,223 @@ def output(text, is_timing=False):
     print(text)
 
 
+def startTiming():
+    if PROFILER is not None:
+        PROFILER.startStage()
+    return time.perf_counter_ns()
+
+
+def outputTiming(stage, timeNow):
+    nanoseconds = time.perf_counter_ns() - timeNow
+    seconds = nanoseconds / 1e9
+    timings.append((stage, seconds))
+    if PROFILER is not None:
+        PROFILER.endStage(stage, nanoseconds)
+    output((stage + ":").ljust(22) + str(seconds), is_timing=True)
+
+
 def parseFile(filename):
-    timeNow = time.time()
-    input_file = FileStream(filename)
-    output("file read:            " + str(time.time() - timeNow), is_timing=True)
+    from antlr4.MappedFileStream import MappedFileStream
+
+    timeNow = startTiming()
+    input_file = MappedFileStream(filename)
+    outputTiming("file read", timeNow)
+
+    return parseStream(input_file, filename)
+
+
+def parseStdin(textFile):
+    from antlr4.ChunkedInputStream import ChunkedInputStream
 
+    # the source is lexed while it is read, the text is only written to textFile to show the lines of the errors
+    timeNow = startTiming()
+    input_file = ChunkedInputStream(sys.stdin.buffer, textFile=textFile)
+    outputTiming("file read", timeNow)
+
+    return parseStream(input_file, STDIN_NAME)
+
+
+def parseStream(input_file, filename, syntaxErrors=None):
     # get lexer
-    timeNow = time.time()
-    lexer = CLexer(input_file)
-    output("file lexed:           " + str(time.time() - timeNow), is_timing=True)
+    timeNow = startTiming()
+    lexer = getLexer(input_file)
+    outputTiming("file lexed", timeNow)
 
     # get list of matched tokens
-    timeNow = time.time()
-    stream = CommonTokenStream(lexer)
-    output("file tokenized:       " + str(time.time() - timeNow), is_timing=True)
+    timeNow = startTiming()
+    stream = CompactTokenStream(lexer, onChannelOnly=True)
+    outputTiming("file tokenized", timeNow)
+
+    # the recursive descent parser gives the AST, or None if the program has a syntax error, which CParser then reports
+    if PARSER == "rd":
+        abstractSyntaxTree = parseRecursiveDescent(stream)
+        if abstractSyntaxTree is not None:
+            if PROFILER is not None:
+                PROFILER.count("tokens", len(stream.tokens))
+                PROFILER.count("parseTreeNodes", 0)
+            return abstractSyntaxTree
+        stream.seek(0)
 
     # pass tokens to the parser
-    parser = CParser(stream)
+    parser = getParser(stream, filename, syntaxErrors)
+
+    # the AST can be built while the program is parsed, instead of from the parse tree
+    builder = None
+    if DIRECT_AST and not SYNTAX_ONLY:
+        from AbstractSyntaxTree import AbstractSyntaxTree
+        from ASTBuilder import ASTBuilder
+        builder = ASTBuilder(AbstractSyntaxTree(), stream)
 
-    # specify the entry point
-    timeNow = time.time()
-    programContext = parser.program() # tree with program as root
-    output("file parsed:          " + str(time.time() - timeNow), is_timing=True)
+    # specify the entry point, this gives a tree with program as root, or the AST if it was built while parsing
+    parseTreeRoot = parseProgram(parser, builder)
 
-    # quit if there are any syntax errors
+    if PROFILER is not None:
+        from Profiler import countParseTreeNodes
+        PROFILER.count("tokens", len(stream.tokens))
+        PROFILER.count("parseTreeNodes", countParseTreeNodes(parseTreeRoot) if isinstance(parseTreeRoot, ParserRuleContext) else 0)
+
+    # don't continue if there are any syntax errors
     if parser._syntaxErrors > 0:
-        sys.exit(0)
+        return None
+
+    return parseTreeRoot
+
+
+def parseProgram(parser, builder=None):
+    # the program is parsed with SLL prediction first, which never has to look at the full context of a decision and
+    # gives the same tree as LL for every program it can parse; it stops at the first syntax error (or a decision that
+    # needs LL), without reporting it, and then the program is parsed again with LL and the usual error recovery.
+    # The first parse builds flat expression trees, the second one uses the generated rules to report the errors.
+    # With a builder, the first parse builds the AST instead of a parse tree and gives the AST.
+    timeNow = startTiming()
+    listeners = parser._listeners
+    parser._listeners = []
+    parser._errHandler = BailErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser.flatExpressions = True
+    if builder is not None:
+        parser.buildParseTrees = False
+        parser.addParseListener(builder)
+    try:
+        programContext = parser.program()
+    except ParseCancellationException:
+        programContext = None
+    finally:
+        parser._listeners = listeners
+        if builder is not None:
+            parser.buildParseTrees = True
+            parser.removeParseListener(builder)
+    outputTiming("file parsed (SLL)", timeNow)
+
+    # program doesn't end with EOF, BailErrorStrategy stops at tokens after the last declaration without an error
+    if programContext is not None and parser._syntaxErrors == 0 and parser.getTokenStream().LA(1) == Token.EOF:
+        return programContext if builder is None else builder.ast
+
+    timeNow = startTiming()
+    parser.reset()
+    parser._errHandler = DefaultErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.LL
+    parser.flatExpressions = False
+    programContext = parser.program()
+    outputTiming("file parsed (LL)", timeNow)
 
     return programContext
 
 
+def parseRecursiveDescent(stream):
+    from RecursiveDescentParser import RecursiveDescentParser
+
+    timeNow = startTiming()
+    try:
+        abstractSyntaxTree = RecursiveDescentParser(stream).parse()
+    except ParseCancellationException:
+        abstractSyntaxTree = None
+    outputTiming("file parsed (rd)", timeNow)
+
+    return abstractSyntaxTree
+
+
+def getLexer(input_file):
+    global lexer
+
+    # the fast lexer needs all of the text at once, so it is not used for a stream that is read in chunks
+    chunked = isStream(input_file, "ChunkedInputStream")
+    if FAST_LEXER and not chunked:
+        from FastLexer import FastCLexer
+        lexerClass = FastCLexer
+    else:
+        lexerClass = CLexer
+
+    if LEX_JOBS > 1 and isStream(input_file, "MappedFileStream"):
+        # a large file is lexed in chunks by worker processes, with lexerClass
+        from ParallelLexer import ParallelCLexer
+        if type(lexer) is not ParallelCLexer or lexer.lexerClass is not lexerClass:
+            lexer = ParallelCLexer(input_file, LEX_JOBS, lexerClass)
+        else:
+            lexer.inputStream = input_file
+    elif type(lexer) is not lexerClass:
+        lexer = lexerClass(input_file)
+    else:
+        lexer.inputStream = input_file
+
+    # the text of a token is gone from a chunked stream after the token, so it is copied into the token
+    if chunked:
+        from antlr4.ChunkedInputStream import TextCopyingTokenFactory
+        lexer._factory = TextCopyingTokenFactory.DEFAULT
+    else:
+        lexer._factory = CommonTokenFactory.DEFAULT
+
+    return lexer
+
+
+def isStream(input_file, className):
+    # whether input_file is an instance of antlr4.{className}.{className}, without importing that module for a stream
+    # that can't be one, as the module is only imported by the runs that read their input with that class
+    module = sys.modules.get("antlr4." + className)
+    return module is not None and isinstance(input_file, getattr(module, className))
+
+
+def getParser(stream, filename, syntaxErrors=None):
+    global parser
+
+    if parser is None:
+        parser = PrecedenceCParser(stream)
+        parser.removeErrorListeners()
+        parser.addErrorListener(SyntaxErrorListener(filename))
+    else:
+        parser.setTokenStream(stream)
+        parser._listeners[0].srcFilename = filename
+
+    # syntax errors are printed, unless a list is given to collect them in
+    parser._listeners[0].messages = syntaxErrors
+
+    return parser
+
+
 def buildAST(parseTreeRoot):
-    timeNow = time.time()
+    from AbstractSyntaxTree import AbstractSyntaxTree
+    from Listener import Listener
 
-    # create an AST an attach it to a listener so the listener can fill in the tree
-    abstractSyntaxTree = AbstractSyntaxTree()
+    if isinstance(parseTreeRoot, AbstractSyntaxTree):
+        # built while parsing (--direct-ast)
+        abstractSyntaxTree = parseTreeRoot
+    else:
+        timeNow = startTiming()
+
+        # create an AST an attach it to a listener so the listener can fill in the tree
+        abstractSyntaxTree = AbstractSyntaxTree()
 
-    walker = ParseTreeWalker()
-    listener = Listener(abstractSyntaxTree)
-    # attach the listener, walk the parse tree, and fill in the AST
-    walker.walk(listener, parseTreeRoot)
+        walker = ParseTreeWalker()
+        listener = Listener(abstractSyntaxTree)
+        # attach the listener, walk the parse tree, and fill in the AST
+        walker.walk(listener, parseTreeRoot)
 
-    # output the resulting AST after the walk
-    output("AST built:            " + str(time.time() - timeNow), is_timing=True)
+        # output the resulting AST after the walk
+        outputTiming("AST built", timeNow)
+
+    if PROFILER is not None:
+        from Profiler import countASTNodes
+        PROFILER.count("astNodes", countASTNodes(abstractSyntaxTree.root))
 
     if SAVE_AST:
         # os.path.splitext(name) splits name into tuple: (name without extension, extension)
@@ -91,23 +289,32 @@ def buildAST(parseTreeRoot):
 
 
 def firstPassDecoration(abstractSyntaxTree):
-    timeNow = time.time()
+    from VisitorDecorator import VisitorDecorator
+
+    timeNow = startTiming()
 
     decorator = VisitorDecorator()
     decorator.visitProgramNode(abstractSyntaxTree.root)
-    output("decorated first pass:  " + str(time.time() - timeNow), is_timing=True)
+    outputTiming("decorated first pass", timeNow)
 
 
 def scopeCheck(abstractSyntaxTree, errorHandler, symbolTable):
-    timeNow = time.time()
+    from VisitorSymbolTableFiller import VisitorSymbolTableFiller
+    from VisitorDeclarationProcessor import VisitorDeclarationProcessor
+
+    timeNow = startTiming()
     functionFiller = VisitorSymbolTableFiller(symbolTable, errorHandler)
     functionFiller.visitProgramNode(abstractSyntaxTree.root)
-    output("symbol table filled:  " + str(time.time() - timeNow), is_timing=True)
+    outputTiming("symbol table filled", timeNow)
 
-    timeNow = time.time()
+    timeNow = startTiming()
     tableFiller = VisitorDeclarationProcessor(symbolTable, errorHandler)
     tableFiller.visitProgramNode(abstractSyntaxTree.root)
-    output("symbol table checked: " + str(time.time() - timeNow), is_timing=True)
+    outputTiming("symbol table checked", timeNow)
+
+    if PROFILER is not None:
+        from Profiler import countSymbols
+        PROFILER.count("symbols", countSymbols(symbolTable))
 
     if SAVE_SYMBOL_TABLE:
         # os.path.splitext(name) splits name into tuple: (name without extension, extension)
@@ -118,45 +325,49 @@ def scopeCheck(abstractSyntaxTree, errorHandler, symbolTable):
 
 
 def typeCheck(abstractSyntaxTree, errorHandler):
-    timeNow = time.time()
+    from VisitorTypeChecker import VisitorTypeChecker
+
+    timeNow = startTiming()
     typeCheck = VisitorTypeChecker(errorHandler)
     typeCheck.visitProgramNode(abstractSyntaxTree.root)
-    output("program type checked: " + str(time.time() - timeNow), is_timing=True)
+    outputTiming("program type checked", timeNow)
+
 
+def generateCode(abstractSyntaxTree, symbolTable, outFile):
+    from VisitorCodeGenerator import VisitorCodeGenerator
 
-def generateCode(abstractSyntaxTree, symbolTable):
-    timeNow = time.time()
-    codeGenerator = VisitorCodeGenerator(symbolTable, OUT_FILE_NAME)
+    timeNow = startTiming()
+    codeGenerator = VisitorCodeGenerator(symbolTable, outFile)
+    codeGenerator.emitter.countInstructions = PROFILER is not None
     codeGenerator.visitProgramNode(abstractSyntaxTree.root)
-    output("code generated:       " + str(time.time() - timeNow), is_timing=True)
+    outputTiming("code generated", timeNow)
 
+    if PROFILER is not None:
+        PROFILER.count("instructions", codeGenerator.emitter.instructionCount)
 
-def main(filename):
-    # get the root of the parse tree of the input file
-    parseTreeRoot = parseFile(filename)
 
-    # the errorHandler which will group all of the errors
-    errorHandler = ErrorHandler(filename)
+def main(filename, outFile=None):
+    timings.clear()
 
-    try:
-        # create an AST an attach it to a listener so the listener can fill in the tree
-        abstractSyntaxTree = buildAST(parseTreeRoot)
+    # get the root of the parse tree of the input file, and the errorHandler which will group all of the errors
+    if filename == STDIN:
+        # the text of stdin is not kept in memory, it is written to a temporary file that is read for the messages
+        import tempfile
+        with tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n") as textFile:
+            return compileParsed(parseStdin(textFile), ErrorHandler(STDIN_NAME, sourceFile=textFile), outFile)
 
-        firstPassDecoration(abstractSyntaxTree)
+    return compileParsed(parseFile(filename), ErrorHandler(filename), outFile)
 
-        # create a symbol table and symbol table filler, fill in the table and check if everything is declared before it is used in the c file
-        symbolTable = SymbolTable()
-        scopeCheck(abstractSyntaxTree, errorHandler, symbolTable)
 
-        # do the type checking
-        typeCheck(abstractSyntaxTree, errorHandler)
+def compileParsed(parseTreeRoot, errorHandler, outFile):
+    if parseTreeRoot is None:
+        return False
 
-        output(str(abstractSyntaxTree))
-        output(str(symbolTable))
+    if SYNTAX_ONLY:
+        return True
 
-        # generate code
-        if not errorHandler.errorCount():
-            generateCode(abstractSyntaxTree, symbolTable)
+    try:
+        compileParseTree(parseTreeRoot, errorHandler, outFile if outFile is not None else OUT_FILE_NAME)
 
     except Exception as e:
         ex_type, ex, tb = sys.exc_info()
@@ -167,24 +378,416 @@ def main(filename):
         print(str(errorHandler.warningCount()) + " warning" + ("s" if errorHandler.warningCount() != 1 else ""))
         errorHandler.printErrors()
 
+    return not errorHandler.errorCount()
+
+
+def compileParseTree(parseTreeRoot, errorHandler, outFile):
+    from SymbolTable import SymbolTable
+
+    # create an AST an attach it to a listener so the listener can fill in the tree
+    abstractSyntaxTree = buildAST(parseTreeRoot)
+
+    firstPassDecoration(abstractSyntaxTree)
+
+    # create a symbol table and symbol table filler, fill in the table and check if everything is declared before it is used in the c file
+    symbolTable = SymbolTable()
+    scopeCheck(abstractSyntaxTree, errorHandler, symbolTable)
+
+    # do the type checking
+    typeCheck(abstractSyntaxTree, errorHandler)
+
+    output(str(abstractSyntaxTree))
+    output(str(symbolTable))
+
+    # generate code
+    if not errorHandler.errorCount():
+        generateCode(abstractSyntaxTree, symbolTable, outFile)
+
+
+class CompileResult:
+    # pcode is None when the source has errors, errors and warnings hold the messages as c2p.py prints them
+    def __init__(self, pcode, errors, warnings, timings):
+        self.pcode    = pcode
+        self.errors   = errors
+        self.warnings = warnings
+        self.timings  = timings
+
+    def succeeded(self):
+        return self.pcode is not None
+
+
+def compileSource(source, filename="<source>"):
+    # compiles c source code without reading or writing any file and without printing anything,
+    # filename is only used in the messages
+    global PRINT_NOTHING, SAVE_AST, SAVE_SYMBOL_TABLE, SYNTAX_ONLY
+
+    options = (PRINT_NOTHING, SAVE_AST, SAVE_SYMBOL_TABLE, SYNTAX_ONLY)
+    PRINT_NOTHING, SAVE_AST, SAVE_SYMBOL_TABLE, SYNTAX_ONLY = True, False, False, False
+    timings.clear()
+
+    syntaxErrors = []
+    internalErrors = []
+    errorHandler = ErrorHandler(filename, source)
+    pCode = io.StringIO()
+
+    # the errors of the lexer are collected with those of the parser, instead of being printed by its console listener
+    lexerErrorListener = SyntaxErrorListener(filename)
+    lexerErrorListener.messages = syntaxErrors
+    lexerListeners = None
+
+    try:
+        timeNow = startTiming()
+        input_file = InputStream(source)
+        outputTiming("file read", timeNow)
+
+        # parseStream gets the same (global) lexer, which lexes the tokens while they are parsed
+        lexerListeners = getLexer(input_file)._listeners
+        lexer._listeners = [lexerErrorListener]
+
+        parseTreeRoot = parseStream(input_file, filename, syntaxErrors)
+        if parseTreeRoot is not None:
+            compileParseTree(parseTreeRoot, errorHandler, pCode)
+
+    except Exception as e:
+        internalErrors.append("Error: internal compiler error: " + str(e) + "\n")
+
+    finally:
+        PRINT_NOTHING, SAVE_AST, SAVE_SYMBOL_TABLE, SYNTAX_ONLY = options
+        if lexerListeners is not None:
+            lexer._listeners = lexerListeners
+
+    errorHandler.errors.sort(key=lambda x : (x.lineNumber, x.column))
+    errors   = [errorHandler.errorToString(i) for i, error in enumerate(errorHandler.errors) if not error.isWarning]
+    warnings = [errorHandler.errorToString(i) for i, error in enumerate(errorHandler.errors) if error.isWarning]
+    errors   = syntaxErrors + errors + internalErrors
+
+    return CompileResult(pCode.getvalue() if not errors else None, errors, warnings, list(timings))
+
+
+def outFileNameFor(filename, outDir, root=None):
+    # os.path.splitext(name) splits name into tuple: (name without extension, extension)
+    name = os.path.splitext(filename if filename != STDIN else "stdin")[0] + ".p"
+    if outDir is None:
+        return name
+    # in outDir a source keeps its path relative to root, so sources with the same name in different directories
+    # don't overwrite each other's .p file
+    if root is None or filename == STDIN:
+        return os.path.join(outDir, os.path.basename(name))
+    return os.path.join(outDir, os.path.relpath(os.path.abspath(name), root))
+
+
+def sourceRoot(filenames):
+    # the deepest directory that contains all of the given sources, None when they are on different drives
+    directories = [os.path.dirname(os.path.abspath(filename)) for filename in filenames if filename != STDIN]
+    if not directories:
+        return None
+    try:
+        return os.path.commonpath(directories)
+    except ValueError:
+        return None
+
+
+def compileFiles(filenames, outDir=None, jobs=1):
+    global OUT_FILE_NAME
+
+    root = sourceRoot(filenames)
+    outFileNames = [outFileNameFor(filename, outDir, root) for filename in filenames]
+
+    # the .p file of one source would be overwritten by that of another one
+    sources = {}
+    for filename, outFileName in zip(filenames, outFileNames):
+        if sources.setdefault(outFileName, filename) != filename:
+            print("error: " + sources[outFileName] + " and " + filename + " would both be compiled to " + outFileName, file=sys.stderr)
+            return False
+
+    if outDir is not None:
+        for directory in set(os.path.dirname(outFileName) for outFileName in outFileNames):
+            os.makedirs(directory, exist_ok=True)
+
+    succeeded = 0
+    if jobs > 1:
+        succeeded = compileFilesParallel(filenames, outFileNames, jobs)
+    else:
+        for filename, OUT_FILE_NAME in zip(filenames, outFileNames):
+            if compileFile(filename):
+                succeeded += 1
+
+    if len(filenames) > 1:
+        output(str(succeeded) + "/" + str(len(filenames)) + " files compiled")
+
+    return succeeded == len(filenames)
+
+
+def compileFile(filename):
+    # a file that can't be read, or of which the .p file can't be written, fails on its own so the other files are still compiled
+    try:
+        return compileReadableFile(filename)
+
+    except (OSError, UnicodeDecodeError) as e:
+        if PROFILER is not None:
+            PROFILER.endFile(False)
+        if isinstance(e, OSError) and e.strerror is not None:
+            print((e.filename if e.filename is not None else filename) + ": error: " + e.strerror, file=sys.stderr)
+        else:
+            print((filename if filename != STDIN else STDIN_NAME) + ": error: " + str(e), file=sys.stderr)
+        return False
+
+
+def compileReadableFile(filename):
+    if PROFILER is not None:
+        PROFILER.startFile(filename)
+        fileSucceeded = main(filename)
+        PROFILER.endFile(fileSucceeded)
+        return fileSucceeded
+
+    # compiles a file through the cache if there is one, the timings of a cached compilation would be stale
+    if CACHE is None or SAVE_AST or SAVE_SYMBOL_TABLE or SYNTAX_ONLY or PRINT_TIMINGS or filename == STDIN:
+        return main(filename)
+
+    key = CACHE.key(filename, {"quiet": PRINT_NOTHING})
+    entry = CACHE.get(key)
+
+    if entry is None:
+        pCode = io.StringIO()
+        fileSucceeded, stdout, stderr = compileCaptured(filename, pCode)
+        entry = {
+            "succeeded" : fileSucceeded,
+            "pcode"     : pCode.getvalue() if fileSucceeded else None,
+            "stdout"    : stdout,
+            "stderr"    : stderr,
+        }
+        CACHE.put(key, entry)
+
+    sys.stdout.write(entry["stdout"])
+    sys.stderr.write(entry["stderr"])
+
+    if entry["pcode"] is not None:
+        with open(OUT_FILE_NAME, "w") as pFile:
+            pFile.write(entry["pcode"])
+
+    return entry["succeeded"]
+
+
+def compileFilesParallel(filenames, outFileNames, jobs):
+    import multiprocessing
+
+    options = (SAVE_AST, SAVE_SYMBOL_TABLE, PRINT_TIMINGS, PRINT_NOTHING, CACHE, SYNTAX_ONLY, PROFILER is not None, FAST_LEXER, DIRECT_AST, PARSER, LOAD_DFA)
+    jobList = list(zip(filenames, outFileNames))
+    succeeded = 0
+
+    # every worker keeps its own lexer and parser (and their DFA caches) alive between the files it gets,
+    # the output of each file is collected and printed here in the order the files were given
+    with multiprocessing.Pool(jobs, initializer=initWorker, initargs=(options,)) as pool:
+        for (fileSucceeded, stdout, stderr, fileProfile) in pool.imap(compileInWorker, jobList, chunksize=1):
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            if fileProfile is not None:
+                PROFILER.files.append(fileProfile)
+            if fileSucceeded:
+                succeeded += 1
+
+    return succeeded
+
+
+def initWorker(options):
+    global SAVE_AST, SAVE_SYMBOL_TABLE, PRINT_TIMINGS, PRINT_NOTHING, CACHE, SYNTAX_ONLY, PROFILER, FAST_LEXER, DIRECT_AST, PARSER, LOAD_DFA
+    SAVE_AST, SAVE_SYMBOL_TABLE, PRINT_TIMINGS, PRINT_NOTHING, CACHE, SYNTAX_ONLY, profile, FAST_LEXER, DIRECT_AST, PARSER, LOAD_DFA = options
+
+    if profile:
+        from Profiler import Profiler
+        PROFILER = Profiler()
+
+    # the snapshot is loaded again by every worker, which doesn't get the DFAs of this process when it is spawned,
+    # a snapshot that can't be loaded has already been reported by this process
+    if LOAD_DFA is not None:
+        loadDFAs(LOAD_DFA, warn=False)
+
+
+def loadDFAs(filename, warn=True):
+    from antlr4.dfa.DFASnapshot import loadDFASnapshot, DFASnapshotException
+
+    try:
+        loadDFASnapshot(filename, [CLexer, CParser])
+    except (OSError, DFASnapshotException) as e:
+        if warn:
+            print("warning: DFA snapshot " + filename + " not loaded: " + str(e), file=sys.stderr)
+
+
+def compileInWorker(job):
+    global OUT_FILE_NAME
+    filename, OUT_FILE_NAME = job
+
+    fileSucceeded, stdout, stderr = captureOutput(compileFile, filename)
+    fileProfile = PROFILER.files.pop() if PROFILER is not None else None
+
+    return (fileSucceeded, stdout, stderr, fileProfile)
+
+
+def compileCaptured(filename, outFile=None):
+    return captureOutput(main, filename, outFile)
+
+
+def captureOutput(function, *args):
+    # runs function while collecting everything that would be printed instead of printing it
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        result = function(*args)
+
+    return (result, stdout.getvalue(), stderr.getvalue())
+
+
+def handleCompileRequest(rfile, wfile):
+    # a request is a single line of json: {"cwd", "filename", "outFile", "quiet", "timings"}
+    # it is answered with a single line of json: {"succeeded", "pcode", "stdout", "stderr", "timings"}
+    global OUT_FILE_NAME, PRINT_TIMINGS, PRINT_NOTHING
+
+    # the working directory and the options of a request don't carry over to the next one
+    state = (os.getcwd(), OUT_FILE_NAME, PRINT_TIMINGS, PRINT_NOTHING)
+    try:
+        request = json.loads(rfile.readline().decode("utf-8"))
+        os.chdir(request.get("cwd", state[0]))
+        OUT_FILE_NAME = request.get("outFile", "out.p")
+        PRINT_NOTHING = request.get("quiet", False)
+        PRINT_TIMINGS = request.get("timings", False)
+
+        # the source file may have changed since a previous request printed lines from it
+        linecache.checkcache(request["filename"])
+
+        pCode = io.StringIO()
+        fileSucceeded, stdout, stderr = compileCaptured(request["filename"], pCode)
+
+        response = {
+            "succeeded" : fileSucceeded,
+            "pcode"     : pCode.getvalue() if fileSucceeded else None,
+            "stdout"    : stdout,
+            "stderr"    : stderr,
+            "timings"   : timings,
+        }
+    except Exception as e:
+        # every request gets an answer, also one that can't be read or compiled, and the server keeps running
+        response = {
+            "succeeded" : False,
+            "pcode"     : None,
+            "stdout"    : "",
+            "stderr"    : "error: " + str(e) + "\n",
+            "timings"   : [],
+        }
+    finally:
+        os.chdir(state[0])
+        OUT_FILE_NAME, PRINT_TIMINGS, PRINT_NOTHING = state[1:]
+
+    wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+def createServer(socketPath):
+    if os.path.exists(socketPath):
+        os.remove(socketPath)
+
+    import socketserver
+
+    class CompileRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            handleCompileRequest(self.rfile, self.wfile)
+
+    # requests are handled one at a time, they share the lexer, parser and global options of this process
+    return socketserver.UnixStreamServer(socketPath, CompileRequestHandler)
+
+
+def serve(socketPath):
+    server = createServer(socketPath)
+    print("c2p server listening on " + socketPath)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socketPath)
+
 
 if __name__=="__main__":
     argparser = argparse.ArgumentParser(description="A C to P compiler")
 
-    argparser.add_argument("filename",                                         help="The filename of the c program")
+    argparser.add_argument("filenames", nargs="*", metavar="filename",        help="The filename(s) of the c program(s), - reads a program from stdin")
     # saveast as per assignment constraint
     argparser.add_argument("-save-ast", "--save-ast", "-saveast", "--saveast", help="Serializes the AST and saves it to {OUTFILE}_AST.txt", action="store_true", default=False)
     argparser.add_argument("-save-symbol-table", "--save-symbol-table",        help="Serializes the symbol table and saves it to {OUTFILE}_symbol_table.txt", action="store_true", default=False)
     argparser.add_argument("-t", "--timings",                                  help="Shows how long each step of the process takes", action="store_true", default=False)
+    argparser.add_argument("--profile-json",                                   help="Saves the duration (perf_counter_ns), memory (tracemalloc) and object count of every step, and the number of tokens, parse tree nodes, AST nodes, symbols and instructions of every file, as json to PROFILE_JSON", default=None)
     argparser.add_argument("-q", "--quiet",                                    help="Disables the printing of the AST and symbol table", action="store_true", default=False)
+    argparser.add_argument("--syntax-only",                                    help="Only checks the syntax of the given files, no AST is built and no code is generated", action="store_true", default=False)
+    argparser.add_argument("--fast-lexer",                                     help="Splits the source into tokens with a regular expression instead of the generated ANTLR lexer, the tokens are the same", action="store_true", default=False)
+    argparser.add_argument("--direct-ast",                                     help="Builds the AST while the program is parsed, without a parse tree, the AST is the same", action="store_true", default=False)
+    argparser.add_argument("--parser", choices=["antlr", "rd"],               help="The parser of the programs: the generated ANTLR parser, or a recursive descent parser that builds the AST from the tokens (a program with syntax errors is parsed again by the ANTLR parser to report them), the AST is the same", default="antlr")
+    argparser.add_argument("--lex-jobs", type=int,                             help="Lexes files of several MB in chunks with up to LEX_JOBS worker processes", default=1)
     argparser.add_argument("-o",                                               help="Specifies the output filename (preferably with .p filename extension)", default="out.p")
+    argparser.add_argument("-j", "--jobs", type=int,                           help="Compiles the given files with JOBS worker processes", default=1)
+    argparser.add_argument("--serve",                                          help="Keeps running and compiles the files that are sent by c2pclient.py over a unix socket", action="store_true", default=False)
+    argparser.add_argument("--socket",                                         help="The unix socket used by --serve (default: c2p-{UID}.sock in the temporary directory)", default=None)
+    argparser.add_argument("--cache-dir",                                      help="Stores the results of compilations in CACHE_DIR and reuses them when the source, its includes, the flags and the compiler did not change", default=None)
+    argparser.add_argument("--cache-size", type=int,                           help="The maximum size of the cache in MB, the least recently used results are removed first", default=100)
+    argparser.add_argument("--load-dfa",                                       help="Starts with the lexer and parser DFAs saved in LOAD_DFA by --save-dfa", default=None)
+    argparser.add_argument("--save-dfa",                                       help="Saves the lexer and parser DFAs built while compiling the given files to SAVE_DFA", default=None)
+    argparser.add_argument("--out-dir",                                        help="Compiles every file to {OUT_DIR}/{PATH}.p, with PATH the path of the file relative to the directory that contains all given files; when several files are given without it, each .p file is placed next to its source", default=None)
     args = argparser.parse_args()
 
+    if not args.filenames and not args.serve:
+        argparser.error("the following arguments are required: filename")
+    if args.filenames.count(STDIN) > 1 or (STDIN in args.filenames and args.jobs > 1):
+        argparser.error("stdin (-) can only be read once, by the main process")
+    if args.lex_jobs > 1 and args.jobs > 1:
+        argparser.error("--lex-jobs can't be combined with -j, the worker processes can't start processes of their own")
+    if args.save_dfa is not None and args.jobs > 1:
+        argparser.error("--save-dfa can't be combined with -j, the DFAs are built by the worker processes")
+    if args.serve and args.socket is None:
+        # only the server needs the default socket, which doesn't exist on every platform
+        from c2pclient import defaultSocket
+        args.socket = defaultSocket()
+        if args.socket is None:
+            argparser.error("--serve needs unix sockets, which this platform doesn't have")
+
     # set global variables
     SAVE_AST          = args.save_ast
     SAVE_SYMBOL_TABLE = args.save_symbol_table
     PRINT_TIMINGS     = args.timings
     PRINT_NOTHING     = args.quiet
     OUT_FILE_NAME     = args.o
-
-    main(args.filename)
+    SYNTAX_ONLY       = args.syntax_only
+    FAST_LEXER        = args.fast_lexer
+    LEX_JOBS          = args.lex_jobs
+    DIRECT_AST        = args.direct_ast
+    PARSER            = args.parser
+    LOAD_DFA          = args.load_dfa
+    CACHE             = None
+
+    if args.cache_dir is not None:
+        from CompilationCache import CompilationCache
+        CACHE = CompilationCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    if args.profile_json is not None:
+        from Profiler import Profiler
+        PROFILER = Profiler()
+
+    if args.load_dfa is not None:
+        loadDFAs(args.load_dfa)
+
+    succeeded = True
+    if args.serve:
+        serve(args.socket)
+    elif len(args.filenames) == 1 and args.out_dir is None:
+        succeeded = compileFile(args.filenames[0])
+    else:
+        succeeded = compileFiles(args.filenames, args.out_dir, args.jobs)
+
+    if args.save_dfa is not None:
+        from antlr4.dfa.DFASnapshot import saveDFASnapshot
+        saveDFASnapshot(args.save_dfa, [CLexer, CParser])
+
+    if args.profile_json is not None:
+        PROFILER.save(args.profile_json)
+
+    # the exit status is 1 when a file could not be compiled
+    if not succeeded:
+        sys.exit(1)
@@ -0,0 +1,83 @@
+# thin client for 'c2p.py --serve', it only imports what is needed to talk to the server
+# so it starts a lot faster than c2p.py itself
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+def defaultSocket():
+    # the socket of the current user, None where there are no unix sockets (or user ids)
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return None
+    return os.path.join(tempfile.gettempdir(), "c2p-" + str(os.getuid()) + ".sock")
+
+
+class ServerError(Exception):
+    pass
+
+
+def request(message, socketPath=None):
+    if socketPath is None:
+        socketPath = defaultSocket()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socketPath)
+        connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+        with connection.makefile("rb") as response:
+            line = response.readline()
+
+    # a server that stopped while compiling gives no answer at all
+    try:
+        answer = json.loads(line.decode("utf-8"))
+    except ValueError:
+        raise ServerError("no valid answer from the server" if line.strip() else "the server closed the connection without answering")
+    if not isinstance(answer, dict) or not all(key in answer for key in ["succeeded", "pcode", "stdout", "stderr"]):
+        raise ServerError("no valid answer from the server")
+    return answer
+
+
+def main(filename, outFile, quiet, timings, socketPath):
+    response = request({
+        "cwd"      : os.getcwd(),
+        "filename" : filename,
+        "outFile"  : outFile,
+        "quiet"    : quiet,
+        "timings"  : timings,
+    }, socketPath)
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+
+    if response["pcode"] is not None:
+        with open(outFile, "w") as pFile:
+            pFile.write(response["pcode"])
+
+    return response["succeeded"]
+
+
+if __name__=="__main__":
+    argparser = argparse.ArgumentParser(description="Compiles a C file with a running 'c2p.py --serve'")
+
+    argparser.add_argument("filename",              help="The filename of the c program")
+    argparser.add_argument("-t", "--timings",       help="Shows how long each step of the process takes", action="store_true", default=False)
+    argparser.add_argument("-q", "--quiet",         help="Disables the printing of the AST and symbol table", action="store_true", default=False)
+    argparser.add_argument("-o",                    help="Specifies the output filename (preferably with .p filename extension)", default="out.p")
+    argparser.add_argument("--socket",              help="The unix socket of the server", default=None)
+    args = argparser.parse_args()
+
+    if args.socket is None:
+        args.socket = defaultSocket()
+        if args.socket is None:
+            argparser.error("this platform has no unix sockets")
+
+    try:
+        succeeded = main(args.filename, args.o, args.quiet, args.timings, args.socket)
+    except (OSError, ServerError) as e:
+        print("c2pclient: error: " + str(e), file=sys.stderr)
+        succeeded = False
+
+    sys.exit(0 if succeeded else 1)
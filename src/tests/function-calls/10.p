@@ -907,7 +907,6 @@ l14_after_padding_loop:
 ldc a 1
 ind a
 l15_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -934,7 +933,6 @@ sto i
 ldc a 1
 ind a
 l17_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -967,7 +965,6 @@ sto i
 ldc a 1
 ind a
 l19_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -991,7 +988,6 @@ sto i
 ldc a 1
 ind a
 l21_out_loop:
-
 dpl a
 ind c
 ldc c 27
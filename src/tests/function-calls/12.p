@@ -878,7 +878,6 @@ l14_after_padding_loop:
 ldc a 1
 ind a
 l15_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -908,7 +907,6 @@ sto i
 ldc a 1
 ind a
 l17_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -950,7 +948,6 @@ sto i
 ldc a 1
 ind a
 l19_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -975,7 +972,6 @@ sto i
 ldc a 1
 ind a
 l21_out_loop:
-
 dpl a
 ind c
 ldc c 27
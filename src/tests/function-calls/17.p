@@ -140,7 +140,6 @@ sto i
 ldc a 1
 ind a
 l1_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -163,7 +162,6 @@ sto i
 ldc a 1
 ind a
 l3_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -194,7 +192,6 @@ sto i
 ldc a 1
 ind a
 l5_out_loop:
-
 dpl a
 ind c
 ldc c 27
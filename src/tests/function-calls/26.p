@@ -791,7 +791,6 @@ l44_after_padding_loop:
 ldc a 1
 ind a
 l45_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -885,7 +884,6 @@ l50_after_padding_loop:
 ldc a 1
 ind a
 l51_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -961,7 +959,6 @@ l56_after_padding_loop:
 ldc a 1
 ind a
 l57_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -984,7 +981,6 @@ sto i
 ldc a 1
 ind a
 l59_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -1078,7 +1074,6 @@ l64_after_padding_loop:
 ldc a 1
 ind a
 l65_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -1101,7 +1096,6 @@ sto i
 ldc a 1
 ind a
 l67_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -645,7 +645,6 @@ sto i
 ldc a 1
 ind a
 l7_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -668,7 +667,6 @@ sto i
 ldc a 1
 ind a
 l9_out_loop:
-
 dpl a
 ind c
 ldc c 27
@@ -691,7 +689,6 @@ sto i
 ldc a 1
 ind a
 l11_out_loop:
-
 dpl a
 ind c
 ldc c 27
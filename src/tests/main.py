@@ -6,6 +6,7 @@ import unittest
 import os
 sys.path.insert(0, "..")
 
+from antlr4 import *
 from antlr4_generated.CLexer import CLexer
 from antlr4_generated.CParser import CParser
 
@@ -19,6 +20,13 @@ from VisitorTypeChecker import *
 from VisitorCodeGenerator import *
 from VisitorDecorator import *
 
+from antlr4.IntervalSet import IntervalSet
+from antlr4.Recognizer import Recognizer
+from antlr4.MappedFileStream import MappedFileStream
+from antlr4.ChunkedInputStream import ChunkedInputStream, TextCopyingTokenFactory
+from antlr4.error.ErrorListener import ConsoleErrorListener
+from antlr4.error.Errors import ParseCancellationException
+
 import copy
 # import re to remove all whitespace from strings
 import re
@@ -704,6 +712,24 @@ class MiscellaneousTests(ASTTest, unittest.TestCase):
     def testGlobalVar(self):
         self.generateNoError("misc/global-var")
 
+    # every identifier and type name is a single string object shared by the AST nodes
+    def testSharedNames(self):
+        parser = CParser(CommonTokenStream(CLexer(FileStream("misc/functions.c"))))
+        listener = Listener(AbstractSyntaxTree())
+        ParseTreeWalker().walk(listener, parser.program())
+
+        names = dict()
+        nodes = [listener.ast.root]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children)
+            for name in [getattr(node, "identifier", None), getattr(node, "baseType", None)]:
+                if name is not None:
+                    self.assertIs(names.setdefault(name, name), name)
+                    self.assertIs(sys.intern(name), name)
+        self.assertIn("int", names)
+        self.assertTrue(len(names) > 5)
+
 
 class ProgramsTests(ASTTest, unittest.TestCase):
 
@@ -857,6 +883,1270 @@ class SymbolTableTests(unittest.TestCase):
         self.assertTrue(table.retrieveSymbol("c", requireSeen=False) is None)
         self.assertTrue(table.retrieveSymbol("d", requireSeen=False) is None)
 
+class BatchCompilationTests(unittest.TestCase):
+    def setUp(self):
+        import c2p
+
+        self.printNothing = c2p.PRINT_NOTHING
+        c2p.PRINT_NOTHING = True
+
+    def tearDown(self):
+        import c2p
+
+        c2p.PRINT_NOTHING = self.printNothing
+
+    def compileAndCompare(self, jobs):
+        import c2p
+        import tempfile
+
+        filenames = ["programs/areaCircle", "programs/fibonacci", "assistant-tests/2io1"]
+
+        with tempfile.TemporaryDirectory() as outDir:
+            self.assertTrue(c2p.compileFiles([filename + ".c" for filename in filenames], outDir, jobs))
+
+            for filename in filenames:
+                # the sources keep their paths relative to the directory that contains all of them
+                with open(os.path.join(outDir, filename + ".p"), "r") as myfile:
+                    pCodeGenerated = re.sub("[ \t\n\r]", "", myfile.read())
+                with open(filename + ".p_correct", "r") as myfile:
+                    pCodeCorrect = re.sub("[ \t\n\r]", "", myfile.read())
+
+                self.assertEqual(pCodeGenerated, pCodeCorrect)
+
+    def testCompileFiles(self):
+        self.compileAndCompare(jobs=1)
+
+    def testCompileFilesParallel(self):
+        self.compileAndCompare(jobs=2)
+
+    def testUnreadableFile(self):
+        import c2p
+        import contextlib
+        import io
+        import subprocess
+        import tempfile
+
+        missing = os.path.join("programs", "missing.c")
+        for jobs in [1, 2]:
+            with tempfile.TemporaryDirectory() as outDir:
+                # the other files are still compiled
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    self.assertFalse(c2p.compileFiles(["programs/areaCircle.c", missing, "programs/fibonacci.c"], outDir, jobs))
+                self.assertEqual(stderr.getvalue(), missing + ": error: No such file or directory\n")
+                self.assertTrue(os.path.exists(os.path.join(outDir, "areaCircle.p")))
+                self.assertTrue(os.path.exists(os.path.join(outDir, "fibonacci.p")))
+                self.assertFalse(os.path.exists(os.path.join(outDir, "missing.p")))
+
+        with tempfile.TemporaryDirectory() as outDir:
+            process = subprocess.run([sys.executable, "../c2p.py", "-q", "--out-dir", outDir, "programs/areaCircle.c", missing],
+                                     stderr=subprocess.PIPE, universal_newlines=True)
+            self.assertEqual(process.returncode, 1)
+            self.assertEqual(process.stderr, missing + ": error: No such file or directory\n")
+            self.assertTrue(os.path.exists(os.path.join(outDir, "areaCircle.p")))
+
+    def testSameFilename(self):
+        import c2p
+        import contextlib
+        import io
+        import shutil
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as sourceDir, tempfile.TemporaryDirectory() as outDir:
+            sources = []
+            for program in ["fibonacci", "areaCircle"]:
+                os.mkdir(os.path.join(sourceDir, program))
+                sources.append(os.path.join(sourceDir, program, "1.c"))
+                shutil.copy("programs/" + program + ".c", sources[-1])
+
+            c2p.compileFiles(sources, outDir)
+            for program in ["fibonacci", "areaCircle"]:
+                with open(os.path.join(outDir, program, "1.p"), "r") as myfile:
+                    pCodeGenerated = re.sub("[ \t\n\r]", "", myfile.read())
+                with open("programs/" + program + ".p_correct", "r") as myfile:
+                    self.assertEqual(pCodeGenerated, re.sub("[ \t\n\r]", "", myfile.read()))
+
+            # a single source is compiled to OUT_DIR/{FILENAME}.p
+            c2p.compileFiles(sources[:1], os.path.join(outDir, "single"))
+            self.assertTrue(os.path.exists(os.path.join(outDir, "single", "1.p")))
+
+            # nothing is compiled when two sources would get the same .p file
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                self.assertFalse(c2p.compileFiles([sources[0], os.path.splitext(sources[0])[0] + ".C"], os.path.join(outDir, "same")))
+            self.assertTrue(stderr.getvalue().startswith("error: "))
+            self.assertFalse(os.path.exists(os.path.join(outDir, "same")))
+
+class StdinTests(unittest.TestCase):
+    def testCompileStdin(self):
+        import subprocess
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as outDir:
+            outFile = os.path.join(outDir, "out.p")
+            with open("programs/fibonacci.c", "rb") as source:
+                subprocess.run([sys.executable, "../c2p.py", "-q", "-o", outFile, "-"], stdin=source, check=True)
+            with open(outFile, "r") as myfile:
+                pCodeGenerated = re.sub("[ \t\n\r]", "", myfile.read())
+            with open("programs/fibonacci.p_correct", "r") as myfile:
+                self.assertEqual(pCodeGenerated, re.sub("[ \t\n\r]", "", myfile.read()))
+
+            with open("binary-operators/1.c", "rb") as source:
+                process = subprocess.run([sys.executable, "../c2p.py", "-q", "-o", outFile, "-"], stdin=source, stdout=subprocess.PIPE, universal_newlines=True)
+            self.assertTrue("<stdin>:2:7: error" in process.stdout)
+            self.assertEqual(process.returncode, 1)
+
+class CompileServerTests(unittest.TestCase):
+    def testRequest(self):
+        import c2p
+        import c2pclient
+        import tempfile
+        import threading
+
+        with tempfile.TemporaryDirectory() as socketDir:
+            socketPath = os.path.join(socketDir, "c2p.sock")
+            server = c2p.createServer(socketPath)
+            threading.Thread(target=server.serve_forever).start()
+
+            try:
+                message = {"cwd": os.getcwd(), "filename": "programs/fibonacci.c", "quiet": True}
+                response = c2pclient.request(message, socketPath)
+                self.assertTrue(response["succeeded"])
+                with open("programs/fibonacci.p_correct", "r") as myfile:
+                    self.assertEqual(re.sub("[ \t\n\r]", "", response["pcode"]), re.sub("[ \t\n\r]", "", myfile.read()))
+                self.assertTrue("code generated" in [stage for (stage, seconds) in response["timings"]])
+
+                message["filename"] = "binary-operators/1.c"
+                response = c2pclient.request(message, socketPath)
+                self.assertFalse(response["succeeded"])
+                self.assertTrue(response["pcode"] is None)
+                self.assertTrue("binary-operators/1.c:2:7: error" in response["stdout"])
+
+                # a file that can't be read is answered with an error, and the state of the server is restored
+                cwd, printNothing = os.getcwd(), c2p.PRINT_NOTHING
+                response = c2pclient.request({"cwd": socketDir, "filename": "nonexistent.c", "quiet": not printNothing}, socketPath)
+                self.assertFalse(response["succeeded"])
+                self.assertTrue(response["pcode"] is None)
+                self.assertTrue(response["stderr"].startswith("error: ") and "nonexistent.c" in response["stderr"])
+                self.assertEqual((os.getcwd(), c2p.PRINT_NOTHING), (cwd, printNothing))
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    def testNoAnswer(self):
+        import c2pclient
+        import socketserver
+        import tempfile
+        import threading
+
+        class SilentHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.rfile.readline()
+
+        with tempfile.TemporaryDirectory() as socketDir:
+            socketPath = os.path.join(socketDir, "c2p.sock")
+            server = socketserver.UnixStreamServer(socketPath, SilentHandler)
+            threading.Thread(target=server.serve_forever).start()
+            try:
+                self.assertRaises(c2pclient.ServerError, c2pclient.request, {"filename": "programs/fibonacci.c"}, socketPath)
+            finally:
+                server.shutdown()
+                server.server_close()
+
+class CompilationCacheTests(unittest.TestCase):
+    def testKeyAndEviction(self):
+        from CompilationCache import CompilationCache
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as cacheDir:
+            cache = CompilationCache(cacheDir, maxSize=150)
+            key1 = cache.key("programs/fibonacci.c", {"quiet": True})
+            key2 = cache.key("programs/fibonacci.c", {"quiet": False})
+            key3 = cache.key("programs/areaCircle.c", {"quiet": True})
+            self.assertEqual(key1, cache.key("programs/fibonacci.c", {"quiet": True}))
+            self.assertNotEqual(key1, key2)
+            self.assertNotEqual(key1, key3)
+
+            self.assertTrue(cache.get(key1) is None)
+            cache.put(key1, {"pcode": "a" * 50})
+            cache.put(key2, {"pcode": "b" * 50})
+            os.utime(cache.entryPath(key1), (1, 1))
+            os.utime(cache.entryPath(key2), (2, 2))
+            self.assertEqual(cache.get(key1), {"pcode": "a" * 50})
+
+            # key2 is now the least recently used entry
+            cache.put(key3, {"pcode": "c" * 50})
+            self.assertTrue(cache.get(key1) is not None)
+            self.assertTrue(cache.get(key2) is None)
+            self.assertTrue(cache.get(key3) is not None)
+
+    def testTimingsNotCached(self):
+        from CompilationCache import CompilationCache
+        import c2p
+        import contextlib
+        import io
+        import tempfile
+
+        options = (c2p.CACHE, c2p.PRINT_TIMINGS, c2p.PRINT_NOTHING, c2p.OUT_FILE_NAME)
+        with tempfile.TemporaryDirectory() as cacheDir:
+            cache = CompilationCache(cacheDir, maxSize=1024 * 1024)
+            key = cache.key("programs/fibonacci.c", {"quiet": True})
+            try:
+                c2p.CACHE, c2p.PRINT_NOTHING, c2p.OUT_FILE_NAME = cache, True, os.path.join(cacheDir, "out.p")
+                stdout = io.StringIO()
+                with contextlib.redirect_stdout(stdout):
+                    # the timings are measured by every compilation, they are neither stored nor replayed
+                    c2p.PRINT_TIMINGS = True
+                    self.assertTrue(c2p.compileFile("programs/fibonacci.c"))
+                    self.assertEqual(cache.entries(), [])
+
+                    c2p.PRINT_TIMINGS = False
+                    self.assertTrue(c2p.compileFile("programs/fibonacci.c"))
+                    self.assertTrue(cache.get(key) is not None)
+            finally:
+                c2p.CACHE, c2p.PRINT_TIMINGS, c2p.PRINT_NOTHING, c2p.OUT_FILE_NAME = options
+
+class DFASnapshotTests(ASTTest, unittest.TestCase):
+    def testSaveAndLoad(self):
+        from antlr4.dfa.DFASnapshot import saveDFASnapshot, loadDFASnapshot, DFASnapshotException
+        import pickle
+        import tempfile
+
+        # predicates without __str__ are printed with their address
+        parserDfaStrings = lambda : [re.sub(" at 0x[0-9a-f]+", "", dfa.toString(CParser.literalNames, CParser.symbolicNames)) for dfa in CParser.decisionsToDFA]
+
+        self.generateNoError("programs/matrixMultiplication")
+        dfaStrings = parserDfaStrings()
+        lexerDfaStrings = [dfa.toLexerString() for dfa in CLexer.decisionsToDFA]
+
+        with tempfile.TemporaryDirectory() as snapshotDir:
+            filename = os.path.join(snapshotDir, "c2p.dfa")
+            saveDFASnapshot(filename, [CLexer, CParser])
+
+            for dfa in CParser.decisionsToDFA + CLexer.decisionsToDFA:
+                dfa._states = dict()
+                dfa.s0 = None
+
+            loadDFASnapshot(filename, [CLexer, CParser])
+            self.assertEqual(dfaStrings, parserDfaStrings())
+            self.assertEqual(lexerDfaStrings, [dfa.toLexerString() for dfa in CLexer.decisionsToDFA])
+
+            # the loaded DFAs are used and extended by the next parse
+            self.generateNoError("programs/matrixMultiplication")
+            self.generateNoError("binary-operators/pointer-arithmetic")
+
+            with open(filename, "rb") as snapshotFile:
+                snapshot = pickle.load(snapshotFile)
+            snapshot["recognizers"]["CParser"]["atn"] = "0"
+            with open(filename, "wb") as snapshotFile:
+                pickle.dump(snapshot, snapshotFile)
+            self.assertRaises(DFASnapshotException, loadDFASnapshot, filename, [CLexer, CParser])
+
+    def testWorkers(self):
+        from antlr4.dfa.DFASnapshot import saveDFASnapshot
+        import c2p
+        import subprocess
+        import tempfile
+
+        self.generateNoError("programs/matrixMultiplication")
+        dfaStates = sum(len(dfa.states) for dfa in CParser.decisionsToDFA)
+
+        names = ["SAVE_AST", "SAVE_SYMBOL_TABLE", "PRINT_TIMINGS", "PRINT_NOTHING", "CACHE", "SYNTAX_ONLY", "PROFILER", "FAST_LEXER", "DIRECT_AST", "PARSER", "LOAD_DFA"]
+        options = [getattr(c2p, name) for name in names]
+        with tempfile.TemporaryDirectory() as snapshotDir:
+            filename = os.path.join(snapshotDir, "c2p.dfa")
+            saveDFASnapshot(filename, [CLexer, CParser])
+
+            # a worker that doesn't get the DFAs of its parent loads the snapshot itself
+            for dfa in CParser.decisionsToDFA + CLexer.decisionsToDFA:
+                dfa._states = dict()
+                dfa.s0 = None
+            try:
+                c2p.initWorker((False, False, False, True, None, False, False, False, False, "antlr", filename))
+            finally:
+                for name, value in zip(names, options):
+                    setattr(c2p, name, value)
+            self.assertEqual(sum(len(dfa.states) for dfa in CParser.decisionsToDFA), dfaStates)
+
+            # the DFAs of the workers are not in the snapshot of the parent
+            process = subprocess.run([sys.executable, "../c2p.py", "-q", "-j", "2", "--save-dfa", filename, "programs/fibonacci.c", "programs/matrixMultiplication.c"],
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+            self.assertEqual(process.returncode, 2)
+            self.assertIn("--save-dfa can't be combined with -j", process.stderr)
+
+class ATNCacheTests(unittest.TestCase):
+    def testSaveAndLoad(self):
+        from antlr4.atn import ATNCache
+        import tempfile
+
+        dontWriteBytecode = sys.dont_write_bytecode
+        with tempfile.TemporaryDirectory() as cacheDir:
+            filename = os.path.join(cacheDir, "CParser.pickle")
+            try:
+                sys.dont_write_bytecode = False
+                ATNCache.saveATN(filename, CParser.atn)
+            finally:
+                sys.dont_write_bytecode = dontWriteBytecode
+            atn = ATNCache.loadATN(filename)
+
+        self.assertEqual(len(atn.states), len(CParser.atn.states))
+        self.assertEqual(len(atn.decisionToState), len(CParser.atn.decisionToState))
+
+        # a parser running on the loaded ATN builds the same parse tree
+        trees = []
+        for parserAtn in [CParser.atn, atn]:
+            parser = CParser(CommonTokenStream(CLexer(FileStream("programs/matrixMultiplication.c"))))
+            parser._interp = ParserATNSimulator(parser, parserAtn, [DFA(ds, i) for i, ds in enumerate(parserAtn.decisionToState)], PredictionContextCache())
+            trees.append(parser.program().toStringTree(recog=parser))
+        self.assertEqual(trees[0], trees[1])
+
+    def testKeyCoversTheRuntime(self):
+        from antlr4.atn import ATNCache
+        from antlr4.atn.ATNDeserializationOptions import ATNDeserializationOptions
+        import importlib
+        import pickle
+        import pickletools
+
+        # every module of which a class is pickled with an ATN is part of the hash
+        recursionLimit = sys.getrecursionlimit()
+        try:
+            sys.setrecursionlimit(max(recursionLimit, ATNCache.PICKLE_RECURSION_LIMIT))
+            data = pickle.dumps(CParser.atn, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            sys.setrecursionlimit(recursionLimit)
+        modules = set(arg for (opcode, arg, position) in pickletools.genops(data) if isinstance(arg, str) and arg.startswith("antlr4."))
+        self.assertTrue("antlr4.atn.Transition" in modules)
+        for module in modules:
+            self.assertIn(os.path.abspath(importlib.import_module(module).__file__), ATNCache.runtimeSources())
+
+        # a changed runtime gives another cache file
+        options = ATNDeserializationOptions.defaultOptions
+        runtimeHash = ATNCache.runtimeHash()
+        filename = ATNCache.cacheFilename("atn", options)
+        try:
+            ATNCache.runtimeHashValue = "changed"
+            self.assertNotEqual(ATNCache.cacheFilename("atn", options), filename)
+        finally:
+            ATNCache.runtimeHashValue = runtimeHash
+        self.assertEqual(ATNCache.cacheFilename("atn", options), filename)
+
+class CompileSourceTests(unittest.TestCase):
+    def compileSilently(self, source):
+        import c2p
+        import contextlib
+        import io
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            result = c2p.compileSource(source, "snippet.c")
+        self.assertEqual(stdout.getvalue() + stderr.getvalue(), "")
+
+        return result
+
+    def testSucceeded(self):
+        with open("programs/fibonacci.c", "r") as myfile:
+            result = self.compileSilently(myfile.read())
+        with open("programs/fibonacci.p_correct", "r") as myfile:
+            pCodeCorrect = myfile.read()
+
+        self.assertTrue(result.succeeded())
+        self.assertEqual(re.sub("[ \t\n\r]", "", result.pcode), re.sub("[ \t\n\r]", "", pCodeCorrect))
+        self.assertEqual(result.errors, [])
+        self.assertEqual([stage for (stage, seconds) in result.timings if stage.startswith("file parsed")], ["file parsed (SLL)"])
+
+    # compileSource gives the same p code as the files main writes, for every test with correct p code
+    def testSameAsPCorrect(self):
+        import glob
+
+        filenames = sorted(glob.glob("*/*.p_correct"))
+        self.assertTrue(len(filenames) > 50)
+        for filename in filenames:
+            with open(filename[:-len(".p_correct")] + ".c", "r") as myfile:
+                result = self.compileSilently(myfile.read())
+            with open(filename, "r") as myfile:
+                pCodeCorrect = myfile.read()
+
+            self.assertEqual(result.errors, [], filename)
+            self.assertEqual(re.sub("[ \t\n\r]", "", result.pcode), re.sub("[ \t\n\r]", "", pCodeCorrect), filename)
+
+    def testSyntaxError(self):
+        result = self.compileSilently("int main() {\n    int x = ;\n}\n")
+
+        self.assertFalse(result.succeeded())
+        self.assertEqual(len(result.errors), 1)
+        self.assertTrue(result.errors[0].startswith("snippet.c:2:13: syntax error: "))
+        # the SLL parse bails out silently, the errors come from the LL parse
+        self.assertEqual([stage for (stage, seconds) in result.timings if stage.startswith("file parsed")], ["file parsed (SLL)", "file parsed (LL)"])
+
+    def testLexerError(self):
+        import c2p
+
+        result = self.compileSilently("int main(){ int a = 1 @ 2; }")
+
+        self.assertFalse(result.succeeded())
+        self.assertEqual(result.errors[0], "snippet.c:1:23: syntax error: token recognition error at: '@'\n")
+        # the listeners of the lexer are restored
+        self.assertEqual([type(listener) for listener in c2p.lexer._listeners], [ConsoleErrorListener])
+
+    def testTokensAfterLastDeclaration(self):
+        result = self.compileSilently("int main() {\n    return 0;\n}\n}\n")
+
+        self.assertFalse(result.succeeded())
+        self.assertEqual(len(result.errors), 1)
+        self.assertTrue(result.errors[0].startswith("snippet.c:4:1: syntax error: extraneous input '}'"))
+
+    def testErrorsAndWarnings(self):
+        result = self.compileSilently("int main() {\n    float f;\n    !f;\n}\n")
+
+        self.assertFalse(result.succeeded())
+        self.assertEqual(result.errors, ["snippet.c:3:5: error: invalid operand to logical '!' (have 'float', need 'int')\n     !f;\n     ^\n"])
+
+class PrecedenceParserTests(unittest.TestCase):
+    def parse(self, filename, flatExpressions):
+        from PrecedenceParser import PrecedenceCParser
+
+        parser = PrecedenceCParser(CommonTokenStream(CLexer(FileStream(filename))), flatExpressions)
+        parser.removeErrorListeners()
+        programContext = parser.program()
+        self.assertEqual(parser._syntaxErrors, 0)
+
+        return programContext
+
+    def countContexts(self, tree):
+        if not isinstance(tree, ParserRuleContext):
+            return 0
+        return 1 + sum(self.countContexts(child) for child in tree.getChildren())
+
+    def buildAST(self, programContext):
+        abstractSyntaxTree = AbstractSyntaxTree()
+        ParseTreeWalker().walk(Listener(abstractSyntaxTree), programContext)
+        return str(abstractSyntaxTree)
+
+    def testSameAST(self):
+        import glob
+
+        for filename in sorted(glob.glob("*/*.c")):
+            self.assertEqual(self.buildAST(self.parse(filename, True)), self.buildAST(self.parse(filename, False)), filename)
+
+    def testFewerContexts(self):
+        flat = self.countContexts(self.parse("misc/expressions.c", True))
+        generated = self.countContexts(self.parse("misc/expressions.c", False))
+        self.assertTrue(flat * 2 < generated)
+
+    def testStatesOfGeneratedCode(self):
+        import PrecedenceParser
+        import antlr4_generated.CParser
+
+        # the generated code sets self.state to the state of a call right before it calls the rule
+        with open(antlr4_generated.CParser.__file__, "r") as myfile:
+            generatedCode = myfile.read()
+        calls = dict((int(state), rule) for state, rule in re.findall(r"self\.state = (\d+)\n\s*self\.(\w+)\(", generatedCode))
+        for state, rule in [("COMMA_OPERAND_STATE", "oplevel14"), ("ASSIGNED_STATE", "oplevel14"), ("TYPE_CAST_STATE", "typeCast"),
+                            ("SUBSCRIPT_STATE", "oplevel15"), ("PARENTHESIZED_STATE", "oplevel15"), ("FUNCTION_CALL_STATE", "functionCall"),
+                            ("VARIABLE_STATE", "variable"), ("FLOAT_STATE", "floatLiteral"), ("INTEGER_STATE", "integerLiteral"),
+                            ("CHARACTER_STATE", "characterLiteral"), ("STRING_STATE", "stringLiteral")]:
+            self.assertEqual(calls[getattr(PrecedenceParser, state)], rule, state)
+        self.assertTrue("self.enterRule(localctx, " + str(PrecedenceParser.OPLEVEL2_START_STATE) + ", self.RULE_oplevel2)" in generatedCode)
+        self.assertTrue("self.enterRecursionRule(localctx, " + str(PrecedenceParser.OPLEVEL1_START_STATE) + ", self.RULE_oplevel1, _p)" in generatedCode)
+
+        # oplevel15 calls oplevel14 before and after a ','
+        self.assertRaises(Exception, PrecedenceParser.callState, CParser.RULE_oplevel15, CParser.RULE_oplevel14)
+
+class ASTBuilderTests(unittest.TestCase):
+    def buildWhileParsing(self, filename):
+        from PrecedenceParser import PrecedenceCParser
+        from ASTBuilder import ASTBuilder
+
+        stream = CommonTokenStream(CLexer(FileStream(filename)))
+        parser = PrecedenceCParser(stream)
+        parser.removeErrorListeners()
+        parser.buildParseTrees = False
+        builder = ASTBuilder(AbstractSyntaxTree(), stream)
+        parser.addParseListener(builder)
+        parser.program()
+
+        return builder.ast
+
+    def buildFromParseTree(self, filename):
+        parser = CParser(CommonTokenStream(CLexer(FileStream(filename))))
+        parser.removeErrorListeners()
+        abstractSyntaxTree = AbstractSyntaxTree()
+        ParseTreeWalker().walk(Listener(abstractSyntaxTree), parser.program())
+
+        return abstractSyntaxTree
+
+    def errors(self, abstractSyntaxTree, filename):
+        errorHandler = ErrorHandler(filename)
+        VisitorDecorator().visitProgramNode(abstractSyntaxTree.root)
+        symbolTable = SymbolTable()
+        VisitorSymbolTableFiller(symbolTable, errorHandler).visitProgramNode(abstractSyntaxTree.root)
+        VisitorDeclarationProcessor(symbolTable, errorHandler).visitProgramNode(abstractSyntaxTree.root)
+        VisitorTypeChecker(errorHandler).visitProgramNode(abstractSyntaxTree.root)
+
+        return errorHandler.errorsToString()
+
+    def testSameASTAndErrors(self):
+        import glob
+
+        for filename in sorted(glob.glob("*/*.c")):
+            built = self.buildWhileParsing(filename)
+            walked = self.buildFromParseTree(filename)
+            self.assertEqual(str(built), str(walked), filename)
+            self.assertEqual(self.errors(built, filename), self.errors(walked, filename), filename)
+
+    def testNoContextsKept(self):
+        def nodes(node):
+            yield node
+            for child in node.children:
+                yield from nodes(child)
+
+        for node in nodes(self.buildWhileParsing("programs/matrixInverse.c").root):
+            self.assertTrue(node.ctx is None or isinstance(node.ctx, ASTPositions))
+
+    def testCompileSource(self):
+        import c2p
+
+        with open("programs/fibonacci.c", "r") as myfile:
+            source = myfile.read()
+        c2p.DIRECT_AST = True
+        try:
+            result = c2p.compileSource(source, "fibonacci.c")
+            syntaxError = c2p.compileSource("int main() {\n    int x = ;\n}\n", "snippet.c")
+        finally:
+            c2p.DIRECT_AST = False
+
+        self.assertEqual(result.pcode, c2p.compileSource(source, "fibonacci.c").pcode)
+        self.assertEqual([stage for (stage, seconds) in result.timings if stage.startswith("AST")], [])
+        self.assertTrue(syntaxError.errors[0].startswith("snippet.c:2:13: syntax error: "))
+
+class RecursiveDescentParserTests(unittest.TestCase):
+    errors = ASTBuilderTests.errors
+    buildWhileParsing = ASTBuilderTests.buildWhileParsing
+
+    def parse(self, stream):
+        from RecursiveDescentParser import RecursiveDescentParser
+
+        try:
+            return RecursiveDescentParser(CommonTokenStream(CLexer(stream))).parse()
+        except ParseCancellationException:
+            return None
+
+    def hasSyntaxErrors(self, stream):
+        parser = CParser(CommonTokenStream(CLexer(stream)))
+        parser.removeErrorListeners()
+        parser.program()
+        return parser._syntaxErrors > 0 or parser.getTokenStream().LA(1) != Token.EOF
+
+    def testSameASTAndErrors(self):
+        import glob
+
+        for filename in sorted(glob.glob("*/*.c")):
+            parsed = self.parse(FileStream(filename))
+            built = self.buildWhileParsing(filename)
+            self.assertEqual(str(parsed), str(built), filename)
+            self.assertEqual(self.errors(parsed, filename), self.errors(built, filename), filename)
+
+    def testSyntaxErrors(self):
+        # every program that is left after removing one token is only accepted if CParser accepts it
+        with open("programs/fibonacci.c", "r") as myfile:
+            source = myfile.read()
+        tokens = CommonTokenStream(CLexer(InputStream(source)))
+        tokens.fill()
+
+        for token in tokens.tokens[:-1]:
+            program = source[:token.start] + " " + source[token.stop + 1:]
+            parsed = self.parse(InputStream(program))
+            self.assertEqual(parsed is None, self.hasSyntaxErrors(InputStream(program)), program)
+
+    def testCompileSource(self):
+        import c2p
+
+        with open("programs/fibonacci.c", "r") as myfile:
+            source = myfile.read()
+        c2p.PARSER = "rd"
+        try:
+            result = c2p.compileSource(source, "fibonacci.c")
+            syntaxError = c2p.compileSource("int main() {\n    int x = ;\n}\n", "snippet.c")
+        finally:
+            c2p.PARSER = "antlr"
+
+        self.assertEqual(result.pcode, c2p.compileSource(source, "fibonacci.c").pcode)
+        self.assertEqual([stage for (stage, seconds) in result.timings if stage.startswith("file parsed")], ["file parsed (rd)"])
+        self.assertTrue(syntaxError.errors[0].startswith("snippet.c:2:13: syntax error: "))
+
+class ProfilerTests(unittest.TestCase):
+    def testProfile(self):
+        import c2p
+        import tempfile
+        from Profiler import Profiler
+
+        printNothing = c2p.PRINT_NOTHING
+        c2p.PRINT_NOTHING = True
+        c2p.PROFILER = Profiler()
+        try:
+            with tempfile.TemporaryDirectory() as outDir:
+                c2p.compileFiles(["programs/fibonacci.c", "unary-operators/1.c"], outDir)
+                with open(os.path.join(outDir, "programs", "fibonacci.p"), "r") as myfile:
+                    instructions = [line for line in myfile.read().split("\n") if line and not line.endswith(":")]
+            report = c2p.PROFILER.report()
+        finally:
+            c2p.PROFILER.stop()
+            c2p.PROFILER = None
+            c2p.PRINT_NOTHING = printNothing
+
+        self.assertEqual([fileProfile["succeeded"] for fileProfile in report["files"]], [True, False])
+
+        fileProfile = report["files"][0]
+        self.assertEqual([stage["stage"] for stage in fileProfile["stages"]][-1], "code generated")
+        for stage in fileProfile["stages"]:
+            self.assertTrue(stage["peakMemoryBytes"] >= stage["memoryBytes"] > 0)
+            self.assertTrue(stage["objects"] > 0)
+        self.assertEqual(sorted(fileProfile["counts"]), ["astNodes", "instructions", "parseTreeNodes", "symbols", "tokens"])
+        self.assertEqual(fileProfile["counts"]["instructions"], len(instructions))
+
+class PCodeEmitterTests(unittest.TestCase):
+    def emitProgram(self, emitter):
+        emitter.emit("ldc", "i", 0)
+        emitter.separator()
+        emitter.label("function_main")
+        emitter.emit("ldc", "c", "' '")
+        emitter.emit("out", "c")
+        emitter.emit("retp")
+        emitter.emit("hlt")
+
+    def testStringTarget(self):
+        import io
+        from PCodeEmitter import PCodeEmitter
+
+        for bufferSize in [1, 2, 16384]:
+            pCode = io.StringIO()
+            emitter = PCodeEmitter(pCode, bufferSize)
+            self.emitProgram(emitter)
+            emitter.close()
+            self.assertEqual(pCode.getvalue(), "ldc i 0\n\nfunction_main:\nldc c ' '\nout c\nretp\nhlt\n")
+            self.assertFalse(pCode.closed)
+
+    def testSocketTarget(self):
+        import socket
+        from PCodeEmitter import PCodeEmitter
+
+        reader, writer = socket.socketpair()
+        with reader, writer:
+            emitter = PCodeEmitter(writer)
+            self.emitProgram(emitter)
+            emitter.close()
+            writer.shutdown(socket.SHUT_WR)
+            self.assertEqual(reader.makefile("r").read(), "ldc i 0\n\nfunction_main:\nldc c ' '\nout c\nretp\nhlt\n")
+
+    def testBufferAndCounts(self):
+        import io
+        import PCodeEmitter
+
+        # labels and separators count for the buffer too
+        pCode = io.StringIO()
+        emitter = PCodeEmitter.PCodeEmitter(pCode, 2)
+        emitter.separator()
+        emitter.label("function_main")
+        self.assertEqual(pCode.getvalue(), "\nfunction_main:\n")
+
+        emitter = PCodeEmitter.PCodeEmitter(io.StringIO())
+        emitter.countInstructions = True
+        self.emitProgram(emitter)
+        self.assertEqual(emitter.instructionCount, 5)
+
+        # the rendered instructions that are kept are bounded
+        for i in range(PCodeEmitter.RENDER_CACHE_SIZE + 10):
+            emitter.emit("ldc", "i", i)
+        emitter.close()
+        self.assertTrue(len(emitter.rendered) <= PCodeEmitter.RENDER_CACHE_SIZE)
+        self.assertEqual(emitter.instructionCount, 5 + PCodeEmitter.RENDER_CACHE_SIZE + 10)
+
+class ImportTimeTests(unittest.TestCase):
+    def testNoUnneededImports(self):
+        import contextlib
+        import io
+        from benchmarks import importtime
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            failures = importtime.run(os.path.abspath("programs/areaCircle.c"), os.devnull)
+        self.assertEqual(failures, [])
+
+class LexingBenchmarkTests(unittest.TestCase):
+    def testGeneratedProgramCompiles(self):
+        import c2p
+        from benchmarks import lexing
+
+        source = lexing.ProgramGenerator(0).program(lexing.parseSize("2K"))
+        self.assertTrue(len(source) >= 2 * 1024)
+        self.assertEqual(source, lexing.ProgramGenerator(0).program(2 * 1024))
+        result = c2p.compileSource(source)
+        self.assertEqual(result.errors, [])
+        self.assertIsNotNone(result.pcode)
+
+    def testResultsAndBaseline(self):
+        import contextlib
+        import io
+        from benchmarks import lexing
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            baseline = lexing.run([1024, 4096], repeat=1)
+            results = lexing.run([1024], stream="compact", repeat=1, baseline=baseline)
+
+        self.assertEqual([result["size"] for result in baseline["results"]], ["1K", "4K"])
+        for result in baseline["results"] + results["results"]:
+            self.assertTrue(result["bytes"] >= 1024 and result["tokens"] > 100 and result["peakMemory"] > 0)
+            self.assertAlmostEqual(result["tokensPerSecond"] * result["seconds"], result["tokens"])
+        self.assertEqual(results["results"][0]["tokens"], baseline["results"][0]["tokens"])
+        self.assertEqual([comparison["size"] for comparison in results["comparison"]], ["1K"])
+
+class PredictionAllocationTests(unittest.TestCase):
+    def testNoInstanceDicts(self):
+        from antlr4.atn.ATNConfig import ATNConfig
+        from antlr4.atn.ATNConfigSet import ATNConfigSet
+        from antlr4.atn.SemanticContext import SemanticContext
+        from antlr4.dfa.DFAState import DFAState
+        from antlr4.PredictionContext import PredictionContext
+
+        state = CParser.atn.states[0]
+        config = ATNConfig(state, 1, PredictionContext.EMPTY)
+        for value in [config, ATNConfigSet(), DFAState(), PredictionContext.EMPTY, SemanticContext.NONE] + state.transitions:
+            self.assertFalse(hasattr(value, "__dict__"), type(value).__name__)
+
+    def testConfigLookup(self):
+        from antlr4.atn.ATNConfig import ATNConfig
+        from antlr4.atn.ATNConfigSet import ATNConfigSet
+        from antlr4.PredictionContext import PredictionContext, SingletonPredictionContext
+
+        class CollidingConfig(ATNConfig):
+            __slots__ = ()
+            def __hash__(self):
+                return 0
+
+        state = CParser.atn.states[0]
+        context = SingletonPredictionContext.create(PredictionContext.EMPTY, 1)
+        for configClass in [ATNConfig, CollidingConfig]:
+            configs = ATNConfigSet()
+            first = configClass(state, 1, context)
+            configs.add(first)
+            configs.add(configClass(state, 2, context))
+            configs.add(configClass(state, 1, SingletonPredictionContext.create(PredictionContext.EMPTY, 1)))
+
+            self.assertEqual([config.alt for config in configs], [1, 2])
+            self.assertEqual(hash(first), 0 if configClass is CollidingConfig else hash((state.stateNumber, 1, context, first.semanticContext)))
+            self.assertTrue(configClass(state, 2, context) in configs)
+            self.assertFalse(configClass(state, 3, context) in configs)
+
+    def testClosureBusyCleared(self):
+        from antlr4.atn.PredictionMode import PredictionMode
+
+        # the set closure reuses doesn't keep the configurations of the last prediction alive
+        for predictionMode in [PredictionMode.SLL, PredictionMode.LL]:
+            parser = CParser(CommonTokenStream(CLexer(FileStream("programs/matrixMultiplication.c"))))
+            parser._interp.predictionMode = predictionMode
+            parser.program()
+            self.assertEqual(parser._interp.closureBusy, set())
+
+    def testBenchmark(self):
+        import contextlib
+        import io
+        from benchmarks import prediction
+
+        dfas = CParser.decisionsToDFA
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = prediction.run(1024, ["SLL"])
+
+        # the DFAs of CParser are put back after every cold parse
+        self.assertIs(CParser.decisionsToDFA, dfas)
+        result = results["results"][0]
+        self.assertEqual(result["syntaxErrors"], 0)
+        self.assertTrue(result["objects"]["ATNConfig"] > 0 and result["dfaStates"] > 0 and result["dfaBlocks"] > 0)
+        # one set is reused by every closure, and without colliding hash codes no lookup list is needed
+        self.assertEqual(result["containers"], {"closureSets": 1, "configLookupLists": 0})
+        self.assertEqual(prediction.compare(results, results), [("SLL", {"seconds": 1, "peakMemory": 1, "dfaMemory": 1, "dfaBlocks": 1, "objects": 1, "containers": 1})])
+
+class FastLexerTests(unittest.TestCase):
+    def tokens(self, lexerClass, stream):
+        from antlr4.error.ErrorListener import ErrorListener
+
+        class CollectingListener(ErrorListener):
+            def __init__(self):
+                self.errors = []
+
+            def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+                self.errors.append((line, column, msg))
+
+        lexer = lexerClass(stream)
+        listener = CollectingListener()
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(listener)
+        tokenStream = CommonTokenStream(lexer)
+        tokenStream.fill()
+
+        return [(t.type, t.text, t.line, t.column, t.start, t.stop, t.channel) for t in tokenStream.tokens], listener.errors
+
+    def testSameTokensAsCLexer(self):
+        import glob
+        from FastLexer import FastCLexer
+
+        filenames = sorted(glob.glob("*/*.c"))
+        self.assertTrue(len(filenames) > 200)
+        for filename in filenames:
+            self.assertEqual(self.tokens(FastCLexer, FileStream(filename)), self.tokens(CLexer, FileStream(filename)), filename)
+            self.assertEqual(self.tokens(FastCLexer, MappedFileStream(filename)), self.tokens(CLexer, FileStream(filename)), filename)
+
+    def testSameErrorsAsCLexer(self):
+        from FastLexer import FastCLexer
+
+        sources = ["#x = 1;", "#includ", "a | b", "\"abc\nint x;", "\"ab\\", "'ab' x", "'\\''", "'\n'", "/* a", "1.5e+ 1. .5", "@ ~ ^", "char* s = \"\u00e9\";",
+                   "int a\\b = 1;", "a\\\\ \\b _\\", "x\\\ny", "int 1a\\ = 2;", "\\\\", "a\\'b' c\\\"d\""]
+        for source in sources:
+            self.assertEqual(self.tokens(FastCLexer, InputStream(source)), self.tokens(CLexer, InputStream(source)), source)
+
+class LexerDFATableTests(unittest.TestCase):
+    tokens = FastLexerTests.tokens
+
+    class ObjectDFAInputStream(InputStream):
+        # overrides LA, so the lexer only follows the edges of the DFAState objects
+        def LA(self, offset):
+            return super().LA(offset)
+
+    def testSameTokensAsObjectDFA(self):
+        import glob
+
+        sources = [open(filename).read() for filename in sorted(glob.glob("*/*.c"))]
+        sources += ["#x = 1;", "a | b", "\"abc\nint x;", "'ab' x", "/* a", "1.5e+ 1. .5", "@ ~ ^", "char* s = \"\u00e9\";\nint \u00e9;", ""]
+        for source in sources:
+            self.assertEqual(self.tokens(CLexer, InputStream(source)), self.tokens(CLexer, self.ObjectDFAInputStream(source)), source)
+
+    def testTableMatchesDFA(self):
+        from antlr4.dfa.LexerDFATable import UNKNOWN, ERROR
+
+        self.tokens(CLexer, InputStream("int main() { return 1 + 'a'; } /* x */"))
+        dfa = CLexer.decisionsToDFA[0]
+        self.assertIsNotNone(dfa.lexerTable)
+        for state in dfa.states:
+            self.assertIs(dfa.lexerTable.states[state.stateNumber], state)
+            self.assertEqual(bool(dfa.lexerTable.accepts[state.stateNumber]), state.isAcceptState)
+            edges = state.edges or [None] * len(dfa.lexerTable.targets[state.stateNumber])
+            targets = [UNKNOWN if target is None else ERROR if target is LexerATNSimulator.ERROR else target.stateNumber for target in edges]
+            self.assertEqual(list(dfa.lexerTable.targets[state.stateNumber]), targets)
+
+class ParallelLexerTests(unittest.TestCase):
+    tokens = FastLexerTests.tokens
+
+    def testSameTokensAsCLexer(self):
+        import glob
+        import tempfile
+        import ParallelLexer
+        from FastLexer import FastCLexer
+
+        # all test programs, with some token recognition errors in between
+        text = ""
+        for filename in sorted(glob.glob("*/*.c")):
+            with open(filename) as file:
+                text += file.read() + "\n@ x | y; #incl\n"
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "all.c")
+            with open(filename, "w") as file:
+                file.write(text)
+
+            minChunkSize = ParallelLexer.MIN_CHUNK_SIZE
+            ParallelLexer.MIN_CHUNK_SIZE = len(text) // 8
+            try:
+                for lexerClass in [CLexer, FastCLexer]:
+                    lexer = ParallelLexer.ParallelCLexer(MappedFileStream(filename), 4, lexerClass)
+                    self.assertEqual(self.tokens(lambda input : lexer, None), self.tokens(CLexer, FileStream(filename)))
+            finally:
+                ParallelLexer.MIN_CHUNK_SIZE = minChunkSize
+
+    def testSplitPoints(self):
+        from ParallelLexer import splitPoints
+
+        text = "int a;\n/* b\nc\n*/ char d = '\n';\nint e; // f\n\"g\\n\";\n"
+        for count in range(2, len(text)):
+            points = splitPoints(text, count)
+            self.assertEqual(points, sorted(set(points)))
+            for point in points:
+                self.assertIn(point, [7, 31, 43])
+            self.assertEqual(splitPoints(text.encode("ascii"), count), points)
+
+    def testChunksThatDoNotFit(self):
+        from ParallelLexer import ParallelCLexer, lexRange
+
+        # the second chunk starts in a comment, the third one in a character literal
+        text = "int a = 1;\n/*\nint b = 2; @\n*/ int c = '\n'; #x\nint d;"
+        points = [text.index("int b"), text.index("'; #x") + 2, len(text) + 1]
+        lines = [1, 3, 5]
+
+        chunks = []
+        for start, end, line in zip([0] + points, points, lines):
+            lexer = CLexer(InputStream(text))
+            lexer.removeErrorListeners()
+            chunks.append(lexRange(lexer, start, end, line))
+        self.assertNotEqual(chunks[0].next, chunks[1].firstToken())
+
+        lexer = ParallelCLexer(InputStream(text))
+        lexer.lexAll = lambda : lexer.stitch(chunks)
+        self.assertEqual(self.tokens(lambda input : lexer, None), self.tokens(CLexer, InputStream(text)))
+
+class IncrementalLexerTests(unittest.TestCase):
+    def lexedFields(self, lexed):
+        tokens = [(t.type, t.start, t.stop, t.line, t.column, t.text) for t in lexed.tokens]
+        return tokens, list(lexed.lookaheads), list(lexed.furthest), lexed.errors
+
+    def testSameAsLexingAgain(self):
+        import random
+        from IncrementalLexer import lexText, relex
+
+        random.seed(15)
+        insertions = ["x", " ", "\n", "\"", "'", "/*", "*/", "//", "1.", "5", "e+", "#", "#include", "|", "\\", "int ", ";", ""]
+        for filename in ["programs/matrixInverse.c", "binary-operators/36.c", "variable-declarations/30.c", "misc/expressions.c"]:
+            with open(filename, "r") as myfile:
+                lexed = lexText(myfile.read())
+            for edit in range(25):
+                offset = random.randint(0, len(lexed.text))
+                deleted = min(random.choice([0, 0, 1, 2, 5]), len(lexed.text) - offset)
+                lexed = relex(lexed, offset, deleted, random.choice(insertions))
+                self.assertEqual(self.lexedFields(lexed), self.lexedFields(lexText(lexed.text)), filename)
+
+    def testOnlyLexesTheEdit(self):
+        from IncrementalLexer import lexText, relex
+
+        with open("programs/matrixInverse.c", "r") as myfile:
+            lexed = lexText(myfile.read())
+        offset = lexed.text.index("int main") + len("int ma")
+        edited = relex(lexed, offset, 0, "xx")
+
+        self.assertEqual(edited.lexedTokens, 1)
+        self.assertEqual(len(edited.tokens), len(lexed.tokens))
+        self.assertEqual(edited.tokens[-1].start, lexed.tokens[-1].start + 2)
+
+        parser = CParser(edited.tokenStream())
+        self.assertTrue("maxxin" in parser.program().toStringTree(recog=parser))
+        self.assertEqual(parser._syntaxErrors, 0)
+
+    def testReusesTheCodePoints(self):
+        from IncrementalLexer import lexText, relex
+
+        with open("programs/matrixInverse.c", "r") as myfile:
+            lexed = lexText(myfile.read())
+        codePoints = lexed.input.data
+        edited = relex(lexed, 10, 3, "\n\n")
+        self.assertIs(edited.input.data, codePoints)
+        self.assertIs(edited.lexer, lexed.lexer)
+        self.assertEqual(codePoints, [ord(c) for c in edited.text])
+
+        # a second edit of the same text can not take the code points over anymore
+        other = relex(lexed, 20, 0, "/* */")
+        self.assertIsNot(other.input.data, codePoints)
+        self.assertIsNot(other.lexer, lexed.lexer)
+        self.assertEqual(self.lexedFields(other), self.lexedFields(lexText(other.text)))
+        self.assertEqual(self.lexedFields(edited), self.lexedFields(lexText(edited.text)))
+
+class TestIntervalSet(unittest.TestCase):
+
+    def testEmpty(self):
+        s = IntervalSet()
+        self.assertIsNone(s.intervals)
+        self.assertFalse(30 in s)
+
+    def testOne(self):
+        s = IntervalSet()
+        s.addOne(30)
+        self.assertTrue(30 in s)
+        self.assertFalse(29 in s)
+        self.assertFalse(31 in s)
+
+    def testTwo(self):
+        s = IntervalSet()
+        s.addOne(30)
+        s.addOne(40)
+        self.assertTrue(30 in s)
+        self.assertTrue(40 in s)
+        self.assertFalse(35 in s)
+
+    def testRange(self):
+        s = IntervalSet()
+        s.addRange(range(30,41))
+        self.assertTrue(30 in s)
+        self.assertTrue(40 in s)
+        self.assertTrue(35 in s)
+
+    def testDistinct1(self):
+        s = IntervalSet()
+        s.addRange(range(30,32))
+        s.addRange(range(40,42))
+        self.assertEquals(2,len(s.intervals))
+        self.assertTrue(30 in s)
+        self.assertTrue(40 in s)
+        self.assertFalse(35 in s)
+
+    def testDistinct2(self):
+        s = IntervalSet()
+        s.addRange(range(40,42))
+        s.addRange(range(30,32))
+        self.assertEquals(2,len(s.intervals))
+        self.assertTrue(30 in s)
+        self.assertTrue(40 in s)
+        self.assertFalse(35 in s)
+
+    def testContiguous1(self):
+        s = IntervalSet()
+        s.addRange(range(30,36))
+        s.addRange(range(36,41))
+        self.assertEquals(1,len(s.intervals))
+        self.assertTrue(30 in s)
+        self.assertTrue(40 in s)
+        self.assertTrue(35 in s)
+
+    def testContiguous2(self):
+        s = IntervalSet()
+        s.addRange(range(36,41))
+        s.addRange(range(30,36))
+        self.assertEquals(1,len(s.intervals))
+        self.assertTrue(30 in s)
+        self.assertTrue(40 in s)
+
+    def testOverlapping1(self):
+        s = IntervalSet()
+        s.addRange(range(30,40))
+        s.addRange(range(35,45))
+        self.assertEquals(1,len(s.intervals))
+        self.assertTrue(30 in s)
+        self.assertTrue(44 in s)
+
+    def testOverlapping2(self):
+        s = IntervalSet()
+        s.addRange(range(35,45))
+        s.addRange(range(30,40))
+        self.assertEquals(1,len(s.intervals))
+        self.assertTrue(30 in s)
+        self.assertTrue(44 in s)
+
+    def testOverlapping3(self):
+        s = IntervalSet()
+        s.addRange(range(30,32))
+        s.addRange(range(40,42))
+        s.addRange(range(50,52))
+        s.addRange(range(20,61))
+        self.assertEquals(1,len(s.intervals))
+        self.assertTrue(20 in s)
+        self.assertTrue(60 in s)
+
+    def testComplement(self):
+        s = IntervalSet()
+        s.addRange(range(10,21))
+        c = s.complement(1,100)
+        self.assertTrue(1 in c)
+        self.assertTrue(100 in c)
+        self.assertTrue(10 not in c)
+        self.assertTrue(20 not in c)
+
+class TestRecognizer(unittest.TestCase):
+
+    def testVersion(self):
+        major, minor = Recognizer().extractVersion("1.2")
+        self.assertEqual("1", major)
+        self.assertEqual("2", minor)
+        major, minor = Recognizer().extractVersion("1.2.3")
+        self.assertEqual("1", major)
+        self.assertEqual("2", minor)
+        major, minor = Recognizer().extractVersion("1.2-snapshot")
+        self.assertEqual("1", major)
+        self.assertEqual("2", minor)
+
+class TestInputStream(unittest.TestCase):
+    
+    def testStream(self):
+        stream = InputStream("abcde")
+        self.assertEqual(0, stream.index)
+        self.assertEqual(5, stream.size)
+        self.assertEqual(ord("a"), stream.LA(1))
+        stream.consume()
+        self.assertEqual(1, stream.index)
+        stream.seek(5)
+        self.assertEqual(Token.EOF, stream.LA(1))
+        self.assertEqual("bcd", stream.getText(1, 3))
+        stream.reset()
+        self.assertEqual(0, stream.index)
+
+class TestFileStream(unittest.TestCase):
+
+    def testStream(self):
+        stream = FileStream(__file__)
+        self.assertTrue(stream.size>0)
+
+class TestMappedFileStream(unittest.TestCase):
+
+    def tokens(self, stream):
+        tokenStream = CommonTokenStream(CLexer(stream))
+        tokenStream.fill()
+        return [(t.type, t.text, t.line, t.column, t.start, t.stop) for t in tokenStream.tokens]
+
+    def testSameTokensAsFileStream(self):
+        for filename in ["programs/fibonacci.c", "programs/matrixMultiplication.c", "misc/expressions.c"]:
+            stream = MappedFileStream(filename)
+            self.assertEqual(self.tokens(stream), self.tokens(FileStream(filename)))
+            self.assertEqual(str(stream), str(FileStream(filename)))
+            stream.close()
+
+    def testEncodings(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.c")
+            with open(filename, "w", encoding="utf-8") as myfile:
+                myfile.write('char* s = "\u00e9\u20ac";\n')
+
+            stream = MappedFileStream(filename, "utf-8")
+            self.assertEqual(stream.LA(12), 0xe9)
+            self.assertEqual(stream.getText(11, 12), "\u00e9\u20ac")
+            self.assertEqual(self.tokens(stream), self.tokens(FileStream(filename, "utf-8")))
+
+            stream = MappedFileStream(filename, "latin-1")
+            self.assertEqual(stream.getText(11, 12), "\u00c3\u00a9")
+            stream.close()
+
+            self.assertRaises(UnicodeDecodeError, MappedFileStream, filename)
+
+            open(filename, "w").close()
+            self.assertEqual(MappedFileStream(filename).LA(1), Token.EOF)
+
+class TestCompactTokenStream(unittest.TestCase):
+
+    def streams(self, filename):
+        from FastLexer import FastCLexer
+
+        yield CommonTokenStream(CLexer(FileStream(filename)))
+        yield CompactTokenStream(CLexer(FileStream(filename)))
+        yield CompactTokenStream(FastCLexer(MappedFileStream(filename)))
+
+    def testSameParseTree(self):
+        for filename in ["programs/matrixInverse.c", "misc/expressions.c", "function-calls/1.c"]:
+            trees = []
+            for stream in self.streams(filename):
+                parser = CParser(stream)
+                parser.removeErrorListeners()
+                trees.append(parser.program().toStringTree(recog=parser))
+            self.assertEqual(trees[1], trees[0])
+            self.assertEqual(trees[2], trees[0])
+
+    def testTokenStream(self):
+        results = []
+        for stream in self.streams("programs/fibonacci.c"):
+            lookahead = [stream.LA(1), stream.LT(1).text, stream.LT(3).text, stream.LT(-1)]
+            stream.consume()
+            stream.consume()
+            lookahead += [stream.LA(1), stream.LA(2), stream.LT(-1).text, stream.LT(-2).line, stream.LT(1).column]
+            stream.fill()
+            lookahead += [len(stream.tokens), str(stream.get(10)), stream.getText((3, 12)), stream.getText((stream.get(2), stream.get(5)))]
+            lookahead += [(t.type, t.channel, t.start, t.stop, t.line, t.column, t.tokenIndex) for t in stream.tokens]
+            results.append(lookahead)
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+
+        stream = CompactTokenStream(CLexer(InputStream("int x;")))
+        stream.fill()
+        self.assertIs(stream.LT(1), stream.get(0))
+        self.assertEqual(stream.tokens[-1].text, "<EOF>")
+
+    def testOnChannelOnly(self):
+        from antlr4.ListTokenSource import ListTokenSource
+
+        def tokenSource():
+            # "a /* b */ c\n// d\ne" with the comments on the hidden channel
+            tokens = []
+            for (text, channel, line, column) in [("a", 0, 1, 0), ("/* b */", 1, 1, 2), ("c", 0, 1, 10), ("// d", 1, 2, 0), ("e", 0, 3, 0)]:
+                token = CommonToken(CommonToken.EMPTY_SOURCE, CLexer.IDENTIFIER, channel)
+                token.text, token.line, token.column = text, line, column
+                tokens.append(token)
+            token = CommonToken(CommonToken.EMPTY_SOURCE, Token.EOF)
+            token.line, token.column = 3, 1
+            tokens.append(token)
+            return ListTokenSource(tokens)
+
+        def lookahead(stream):
+            result = [(stream.LT(k).text, stream.LT(k).line, stream.LT(k).column) for k in range(1, 6)]
+            stream.consume()
+            stream.consume()
+            result += [stream.LA(1), stream.LT(-1).text, stream.LT(-2).text, stream.LT(-3)]
+            return result
+
+        compact = CompactTokenStream(tokenSource(), onChannelOnly=True)
+        self.assertEqual(lookahead(compact), lookahead(CommonTokenStream(tokenSource())))
+        self.assertEqual([token.text for token in compact.tokens], ["a", "c", "e", None])
+
+class TestChunkedInputStream(unittest.TestCase):
+
+    def tokens(self, stream):
+        lexer = CLexer(stream)
+        lexer.removeErrorListeners()
+        lexer._factory = TextCopyingTokenFactory.DEFAULT
+        tokenStream = CommonTokenStream(lexer)
+        tokenStream.fill()
+        return [(t.type, t.text, t.line, t.column, t.start, t.stop) for t in tokenStream.tokens]
+
+    def testSameTokensAsFileStream(self):
+        import io
+
+        for filename in ["programs/matrixInverse.c", "binary-operators/36.c", "variable-declarations/30.c"]:
+            with open(filename, "rb") as myfile:
+                source = myfile.read()
+            for chunkSize in [1, 7, 65536]:
+                self.assertEqual(self.tokens(ChunkedInputStream(io.BytesIO(source), chunkSize)), self.tokens(FileStream(filename)))
+            self.assertEqual(self.tokens(ChunkedInputStream(io.StringIO(source.decode("ascii")), 16)), self.tokens(FileStream(filename)))
+
+    def testWindow(self):
+        import io
+
+        with open("programs/matrixInverse.c", "r") as myfile:
+            source = myfile.read() * 20
+        textFile = io.StringIO()
+        stream = ChunkedInputStream(io.StringIO(source), 64, textFile=textFile)
+        lexer = CLexer(stream)
+        lexer._factory = TextCopyingTokenFactory.DEFAULT
+
+        longest = 0
+        while lexer.nextToken().type != Token.EOF:
+            longest = max(longest, len(stream.window))
+        self.assertTrue(longest < 256)
+        self.assertEqual(stream.size, len(source))
+        self.assertEqual(textFile.getvalue(), source)
+        self.assertRaises(IndexError, stream.seek, 0)
+
+    def testBoundedMemory(self):
+        import io
+        import tempfile
+        import tracemalloc
+
+        with open("programs/matrixInverse.c", "r") as myfile:
+            program = myfile.read()
+        source = (program * 100).encode("ascii")
+        # the DFA of the lexer is built up first, so it doesn't count
+        self.tokens(ChunkedInputStream(io.StringIO(program)))
+
+        # neither the stream nor the temporary file with its text keep the text in memory
+        with tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n") as textFile:
+            lexer = CLexer(ChunkedInputStream(io.BytesIO(source), 1024, textFile=textFile))
+            lexer._factory = TextCopyingTokenFactory.DEFAULT
+            tracemalloc.start()
+            try:
+                while lexer.nextToken().type != Token.EOF:
+                    pass
+                peakMemory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertTrue(peakMemory < len(source) / 3)
+
+            # the lines of the messages are read back from the file, also when an earlier line is needed again
+            errorHandler = ErrorHandler("<stdin>", sourceFile=textFile)
+            lines = program.split("\n")
+            lineCount = len(lines) - 1
+            for lineNumber in [1, 5, lineCount * 99 + 7, 3, lineCount * 100]:
+                self.assertEqual(errorHandler.getLine(lineNumber), lines[(lineNumber - 1) % lineCount])
+            self.assertEqual(errorHandler.getLine(lineCount * 100 + 1), "")
+
 def testAll():
     unittest.main()
 
@@ -937,7 +937,6 @@ l18_after_padding_loop:
 ldc a 1
 ind a
 l19_out_loop:
-
 dpl a
 ind c
 ldc c 27
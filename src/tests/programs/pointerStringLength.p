@@ -359,7 +359,6 @@ sto i
 ldc a 1
 ind a
 l1_out_loop:
-
 dpl a
 ind c
 ldc c 27